@@ -40,7 +40,7 @@ except Exception:
 # --- Optional Cache ---
 try:
     from flask_caching import Cache
-    cache = Cache(config={"CACHE_TYPE": "SimpleCache", "CACHE_DEFAULT_TIMEOUT": 600})
+    cache = Cache()  # CACHE_* settings come from config.py
 except Exception:
     cache = None
 
@@ -53,6 +53,8 @@ if BASE_DIR not in sys.path:
 def create_app() -> Flask:
     app = Flask(__name__)
     app.config.from_object(load_config())
+    from backend.services.json_stream import FastJSONProvider
+    app.json = FastJSONProvider(app)  # orjson when installed (backend/services/json_stream.py)
 
     # Logging
     logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s %(message)s")
@@ -98,10 +100,19 @@ def create_app() -> Flask:
         # Apply to the blueprint (optional blanket)
         limiter.limit(api_rate)(api)
 
+        # Background stale-while-revalidate refreshes are internal, not client traffic
+        from backend.api.common import REVALIDATE_ENV
+
+        @limiter.request_filter
+        def _internal_refresh():
+            return bool(request.environ.get(REVALIDATE_ENV))
+
         # Per-endpoint rules (only if endpoint exists)
         endpoint_limits = [
             ("api.health",        api_rate),
             ("api.compute",       compute_rate),
+            ("api.compute_batch", app.config.get("RATE_LIMIT_BATCH", "5 per minute")),
+            ("api.compute_stream", compute_rate),
             ("api.asc",           "200 per minute"),
             ("api.houses",        "120 per minute"),
             ("api.planets",       "120 per minute"),
@@ -1,35 +1,26 @@
 # astrology/arudha.py
 from __future__ import annotations
 from typing import Dict, List
-from .symbols import SIGN_LORDS
+from .chart import Chart, SIGN_LORD_IDX, as_chart
+
+_LORD_IDX = SIGN_LORD_IDX.tolist()
 
 def _sign_idx(lon: float) -> int:
     return int((lon % 360.0) // 30)
 
-def _house_signs_from_asc(asc_idx: int) -> List[int]:
-    return [(asc_idx + (h-1)) % 12 for h in range(1,13)]
-
-def _planet_house(planet_name: str, chalit: List[List[str]]) -> int | None:
-    for i, bucket in enumerate(chalit, start=1):
-        if planet_name in bucket:
-            return i
-    return None
-
-def compute_arudha(planets: Dict[str, dict], asc_idx: int, chalit: List[List[str]]) -> dict:
+def compute_arudha(planets: Dict[str, dict] | Chart, asc_idx: int, chalit: List[List[str]]) -> dict:
     """
     Arudha padas A1..A12.
     Rule: Count distance from house to house-lord's house; project same distance from lord's house.
     Exception: If result equals house or 7th from it → move 10th from the lord's house.
     Returns {"A1": idx, "A2": idx, ...}
+    planets may be the legacy dict or a Chart.
     """
-    house_signs = _house_signs_from_asc(asc_idx)
-    # build planet→house map
-    phouse = {pn: _planet_house(pn, chalit) for pn in planets.keys()}
+    chart = as_chart(planets, asc_idx, chalit)
+    phouse = chart.chalit_house.tolist()  # by body index; 0 = not placed
     out = {}
     for h in range(1,13):
-        sign_idx = house_signs[h-1]
-        lord = SIGN_LORDS[sign_idx]
-        lord_house = phouse.get(str(lord))  # lord names in your symbols map match planet keys
+        lord_house = phouse[_LORD_IDX[(asc_idx + h - 1) % 12]]
         if not lord_house:
             out[f"A{h}"] = None
             continue
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Dict, List, Tuple, Optional
+from typing import Any, Dict, List, Tuple, Optional
 from math import radians, degrees, sin, cos, atan2, asin, tan, pi
 import swisseph as swe
 from datetime import datetime, timedelta, timezone
@@ -20,6 +20,8 @@ PLANETS = [
     ("Rahu", swe.MEAN_NODE),
 ]
 
+LAYOUTS = ("records", "columnar")
+
 def _to_utc(dt_local: datetime, tz_hours: float) -> datetime:
     return (dt_local - timedelta(hours=tz_hours)).replace(tzinfo=timezone.utc)
 
@@ -56,14 +58,29 @@ def _ra_dec(body: int, jd_ut: float) -> Tuple[float, float]:
 
     raise RuntimeError("Swiss Ephemeris RA/Dec extraction failed in _ra_dec()")
 
-def _asc_dsc_curves(ra_h: float, dec_deg: float, gmst_h: float, step: float = 0.5) -> Tuple[List[Dict], List[Dict]]:
+def _asc_dsc_curves(ra_h: float, dec_deg: float, gmst_h: float, step: float = 0.5,
+                    columnar: bool = False) -> Tuple[Any, Any]:
     """
     Build ASC/DSC curves by sweeping latitude and solving horizon condition:
         cos(H0) = -tan(phi) * tan(delta)
     Then longitudes come from LST = RA ± H0  and  lon = 15°*(LST - GMST).
+    Each curve is a list of {"lat", "lon"} points, or with columnar=True one
+    {"lat": [...], "lon": [...]} (both curves share the latitudes).
     """
     import math
     dec = math.radians(dec_deg)
+    if columnar:
+        lats, asc_lon, dsc_lon = [], [], []
+        lat = -89.9
+        while lat <= 89.9 + 1e-9:
+            k = -math.tan(math.radians(lat)) * math.tan(dec)
+            if abs(k) <= 1.0:
+                H0_h = math.degrees(math.acos(k)) / 15.0
+                lats.append(round(lat, 3))
+                asc_lon.append(_wrap_deg(15.0 * (((ra_h - H0_h) % 24.0 - gmst_h) % 24.0)))
+                dsc_lon.append(_wrap_deg(15.0 * (((ra_h + H0_h) % 24.0 - gmst_h) % 24.0)))
+            lat += step
+        return {"lat": lats, "lon": asc_lon}, {"lat": lats, "lon": dsc_lon}
     asc, dsc = [], []
     lat = -89.9
     while lat <= 89.9 + 1e-9:
@@ -99,31 +116,54 @@ def _asc_desc_lat_for_lon(ra_h: float, dec_deg: float, gmst_h: float, lon_deg: f
     rising = Hr < 0.0  # negative hour angle ⇒ rising/eastern horizon
     return max(-89.9, min(89.9, lat)), rising
 
-def compute_astrocartography(dt_local: datetime, tz_hours: float) -> Dict:
-    dt_utc = _to_utc(dt_local, tz_hours)
-    jd_ut = swe.julday(
-        dt_utc.year, dt_utc.month, dt_utc.day,
-        dt_utc.hour + dt_utc.minute/60.0 + dt_utc.second/3600.0
-    )
-    gmst_h = _gmst_hours(jd_ut)
-
+def acg_sky(jd_ut: float) -> Dict:
+    """
+    Sky state behind the ACG lines at one instant: GMST and each body's
+    geocentric RA/Dec. Depends on nothing but the instant (no place, no ayanamsa).
+    """
     # Ensure geocentric calculations (avoid any earlier topocentric setting)
     try:
         swe.set_topo(0.0, 0.0, 0.0)
     except Exception:
         pass
+    return {
+        "gmst_hours": _gmst_hours(jd_ut),
+        "ra_dec": {name: _ra_dec(code, jd_ut) for name, code in PLANETS},
+    }
+
+def compute_astrocartography(dt_local: datetime, tz_hours: float, ctx=None, sky: Optional[Dict] = None,
+                             layout: str = "records") -> Dict:
+    """
+    ctx: optional ChartContext for the same moment; its Julian day is reused.
+    sky: optional acg_sky(...) for the same moment; skips the ephemeris entirely.
+    layout: "records" (ASC/DSC as lists of {"lat", "lon"}) or "columnar"
+            (ASC/DSC as {"lat": [...], "lon": [...]}; meta.layout says so).
+    """
+    if layout not in LAYOUTS:
+        raise ValueError(f"unknown ACG layout: {layout!r}")
+    dt_utc = _to_utc(dt_local, tz_hours)
+    if sky is None:
+        if ctx is not None:
+            jd_ut = ctx.jd
+        else:
+            jd_ut = swe.julday(
+                dt_utc.year, dt_utc.month, dt_utc.day,
+                dt_utc.hour + dt_utc.minute/60.0 + dt_utc.second/3600.0
+            )
+        sky = acg_sky(jd_ut)
+    gmst_h = sky["gmst_hours"]
 
     out: Dict[str, Dict] = {}
     lat_step = 0.5  # degrees in latitude for ASC/DSC sampling
 
-    for name, code in PLANETS:
-        ra_h, dec_deg = _ra_dec(code, jd_ut)
+    for name, _code in PLANETS:
+        ra_h, dec_deg = sky["ra_dec"][name]
 
         # MC longitude where LST == RA
         lon_mc = _wrap_deg((ra_h - gmst_h) * 15.0)
         lon_ic = _wrap_deg(lon_mc + 180.0)
 
-        asc_pts, dsc_pts = _asc_dsc_curves(ra_h, dec_deg, gmst_h, step=lat_step)
+        asc_pts, dsc_pts = _asc_dsc_curves(ra_h, dec_deg, gmst_h, step=lat_step, columnar=layout == "columnar")
 
         out[name] = {
             "MC": {"lon": lon_mc},
@@ -157,8 +197,11 @@ def compute_astrocartography(dt_local: datetime, tz_hours: float) -> Dict:
     advice["Caution"].append(f"Mars MC near {_fmt_lon(out['Mars']['MC']['lon'])} (hot/competitive)")
     advice["Caution"].append("Saturn DSC curve (delays, isolation)")
 
+    meta = {"utc": dt_utc.isoformat(), "gmst_hours": gmst_h, "sample_step": lat_step}
+    if layout == "columnar":
+        meta["layout"] = layout
     return {
-        "meta": {"utc": dt_utc.isoformat(), "gmst_hours": gmst_h, "sample_step": lat_step},
+        "meta": meta,
         "lines": out,
         "advice": advice,
     }
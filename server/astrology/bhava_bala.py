@@ -1,25 +1,33 @@
 # astrology/bhava_bala.py
 from __future__ import annotations
 from typing import Dict, List, Any, Optional, Tuple
+import numpy as np
+
+from .chart import Chart, as_chart, body_mask
 
 # --- Legacy behavior (kept intact) -----------------------------------------
 
 BENEFICS = {"Jupiter","Venus","Mercury","Moon"}
 MALEFICS = {"Saturn","Mars","Sun","Rahu","Ketu"}
+_BENEFIC = body_mask(BENEFICS)
+_MALEFIC = body_mask(MALEFICS)
 
-def compute_bhava_bala(planets: Dict[str, dict], chalit: List[List[str]]) -> dict:
+def compute_bhava_bala(planets: Dict[str, dict] | Chart, chalit: List[List[str]]) -> dict:
     """
     Simple house strength proxy:
       - benefic_count, malefic_count, net = benefic - malefic per house (1..12)
     Returns:
       {"bhava_bala": [{"house":1,"benefics":b,"malefics":m,"net":b-m}, ...]}
+    planets may be the legacy dict or a Chart.
     """
-    houses = []
-    for i in range(12):
-        bucket = chalit[i] if i < len(chalit) else []
-        b = sum(1 for p in bucket if p in BENEFICS)
-        m = sum(1 for p in bucket if p in MALEFICS)
-        houses.append({"house": i+1, "benefics": b, "malefics": m, "net": b - m})
+    chart = as_chart(planets, chalit=chalit)
+    # chalit_house is 0 for unplaced bodies, so bin 0 is dropped
+    ben = np.bincount(chart.chalit_house[_BENEFIC], minlength=13)[1:].tolist()
+    mal = np.bincount(chart.chalit_house[_MALEFIC], minlength=13)[1:].tolist()
+    houses = [
+        {"house": i+1, "benefics": b, "malefics": m, "net": b - m}
+        for i, (b, m) in enumerate(zip(ben, mal))
+    ]
     return {"bhava_bala": houses}
 
 # --- Added: Bhava Bala normalization -> Virupa/Rupa helpers -----------------
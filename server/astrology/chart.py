@@ -0,0 +1,154 @@
+# astrology/chart.py
+"""
+Array-backed chart.
+
+Chart keeps one slot per body in BODIES (fixed indices) and parallel NumPy
+arrays for longitude, speed, retrograde flag, sign, nakshatra, pada and the
+Rāśi/Chalit house of each body. Derived lookups that modules used to rebuild
+from the legacy dicts (sign maps, house scans, aspect checks) become array
+operations over the same few vectors.
+
+The legacy shapes stay the public ones: Chart.from_legacy(planets, asc_idx,
+chalit) reads `{"Sun": {"lon": ..., "retro": ...}, ...}` plus the 12 Chalit
+buckets, and to_legacy() writes the planets dict back unchanged. Modules take
+either form through as_chart(...).
+"""
+
+from __future__ import annotations
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+from .symbols import SIGN_LORDS
+
+BODIES = (
+    "Sun", "Moon", "Mars", "Mercury", "Jupiter", "Venus", "Saturn",
+    "Uranus", "Neptune", "Pluto", "Rahu", "Ketu",
+)
+BODY_INDEX: Dict[str, int] = {name: i for i, name in enumerate(BODIES)}
+N_BODIES = len(BODIES)
+
+NAK_SPAN = 360.0 / 27
+PADA_SPAN = 360.0 / 108
+
+# body index of each sign's lord (0 = Aries)
+SIGN_LORD_IDX = np.array([BODY_INDEX[name] for name in SIGN_LORDS], dtype=np.intp)
+
+
+def body_mask(names: Iterable[str]) -> np.ndarray:
+    """Boolean vector over BODIES, True for the given names."""
+    mask = np.zeros(N_BODIES, dtype=bool)
+    mask[[BODY_INDEX[n] for n in names if n in BODY_INDEX]] = True
+    return mask
+
+
+def aspect_table(special: Dict[str, Iterable[int]], full: Iterable[int] = (6,)) -> np.ndarray:
+    """(body, forward sign distance 0..11) -> aspects? e.g. special={"Mars": (3, 7)}."""
+    table = np.zeros((N_BODIES, 12), dtype=bool)
+    table[:, list(full)] = True
+    for name, deltas in special.items():
+        table[BODY_INDEX[name], list(deltas)] = True
+    return table
+
+
+# Graha dṛṣṭi by sign: all aspect the 7th; Mars 4/8, Jupiter 5/9, Saturn 3/10
+DRISHTI = aspect_table({"Mars": (3, 7), "Jupiter": (4, 8), "Saturn": (2, 9)})
+
+
+class Chart:
+    __slots__ = (
+        "present", "lon", "speed", "retro",
+        "sign", "nak", "pada", "asc_idx", "rashi_house", "chalit_house",
+    )
+
+    def __init__(
+        self,
+        lon: np.ndarray,
+        speed: np.ndarray,
+        retro: np.ndarray,
+        present: np.ndarray,
+        asc_idx: int = 0,
+        chalit_house: Optional[np.ndarray] = None,
+    ):
+        self.present = present
+        self.lon = lon
+        self.speed = speed
+        self.retro = retro
+        lon360 = np.mod(lon, 360.0)
+        self.sign = (lon360 // 30.0).astype(np.intp)
+        self.nak = (lon360 // NAK_SPAN).astype(np.intp)
+        self.pada = (np.mod(lon, NAK_SPAN) // PADA_SPAN).astype(np.intp) + 1
+        self.asc_idx = int(asc_idx)
+        self.rashi_house = (self.sign - self.asc_idx) % 12 + 1
+        # 0 = not placed (absent, or missing from the Chalit buckets like Ketu)
+        if chalit_house is None:
+            chalit_house = np.zeros(N_BODIES, dtype=np.intp)
+        self.chalit_house = np.where(present, chalit_house, 0)
+
+    @classmethod
+    def from_legacy(
+        cls,
+        planets: Dict[str, dict],
+        asc_idx: int = 0,
+        chalit: Optional[List[List[str]]] = None,
+    ) -> "Chart":
+        """Read the legacy planets dict (and Chalit buckets); unknown bodies are ignored."""
+        lon = np.zeros(N_BODIES)
+        speed = np.zeros(N_BODIES)
+        retro = np.zeros(N_BODIES, dtype=bool)
+        present = np.zeros(N_BODIES, dtype=bool)
+        for name, data in planets.items():
+            i = BODY_INDEX.get(name)
+            if i is None or not data or data.get("lon") is None:
+                continue
+            lon[i] = data["lon"]
+            speed[i] = data.get("speed") or 0.0
+            retro[i] = bool(data.get("retro"))
+            present[i] = True
+
+        chalit_house = np.zeros(N_BODIES, dtype=np.intp)
+        for h, bucket in enumerate(chalit or [], start=1):
+            for name in bucket:
+                i = BODY_INDEX.get(name)
+                if i is not None and not chalit_house[i]:
+                    chalit_house[i] = h
+        return cls(lon, speed, retro, present, asc_idx, chalit_house)
+
+    def to_legacy(self) -> Dict[str, dict]:
+        """Planets dict in the shape sidereal_planets() returns."""
+        lon, retro = self.lon.tolist(), self.retro.tolist()
+        return {BODIES[i]: {"lon": lon[i], "retro": retro[i]} for i in self.indices()}
+
+    def with_asc(self, asc_idx: int) -> "Chart":
+        return Chart(self.lon, self.speed, self.retro, self.present, asc_idx, self.chalit_house)
+
+    def indices(self) -> List[int]:
+        return np.flatnonzero(self.present).tolist()
+
+    @property
+    def names(self) -> List[str]:
+        return [BODIES[i] for i in self.indices()]
+
+    def sign_delta(self) -> np.ndarray:
+        """(n, n) forward sign distance: [a, b] = sign(b) - sign(a) mod 12."""
+        return (self.sign[None, :] - self.sign[:, None]) % 12
+
+    def aspects(self, table: np.ndarray = DRISHTI) -> np.ndarray:
+        """(n, n) bool: [q, p] = q aspects p by sign; absent bodies and self excluded."""
+        hit = table[np.arange(N_BODIES)[:, None], self.sign_delta()]
+        hit &= self.present[:, None] & self.present[None, :]
+        np.fill_diagonal(hit, False)
+        return hit
+
+
+def as_chart(
+    planets,
+    asc_idx: Optional[int] = None,
+    chalit: Optional[List[List[str]]] = None,
+) -> Chart:
+    """Chart from either a Chart or the legacy planets dict (+ Chalit buckets)."""
+    if isinstance(planets, Chart):
+        if asc_idx is not None and asc_idx != planets.asc_idx:
+            return planets.with_asc(asc_idx)
+        return planets
+    return Chart.from_legacy(planets, asc_idx or 0, chalit)
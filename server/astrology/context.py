@@ -0,0 +1,142 @@
+# astrology/context.py
+"""
+Request-scoped chart context.
+
+A ChartContext holds everything that several astrology modules derive from
+the same birth moment: Julian day, ayanamsa, sidereal planets, cusps,
+ascendant, Rāśi/Chalit buckets, per-planet nakshatra data and the same
+positions as an array-backed Chart.
+
+Build it once per request with ChartContext.build(...) (or build_many(...)
+for several ayanamsas off one tropical pass) and pass it to the modules
+through their optional `ctx=` parameter. Modules fall back to their
+own computation when ctx is None, so existing call sites keep working.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from .swe_utils import to_julian_day, sign_index, mean_ayanamsa
+from .planets import compute_planets, compute_tropical, sidereal_planets
+from .houses import compute_cusps, compute_cusps_tropical, sidereal_asc
+from .charts import rashi_from_longitudes, chalit_from_longitudes
+from .nakshatra import nakshatra_for_lon
+from .chart import Chart
+
+
+@dataclass
+class ChartContext:
+    dt_local: datetime
+    tz_hours: float
+    lat: float
+    lon: float
+    ayanamsa: str
+    hsys: str
+    jd: float
+    ayanamsa_deg: float
+    planets: Dict[str, dict]
+    cusps: List[float]
+    asc_sidereal: float
+    asc_idx: int
+    rashi_houses: List[List[str]]
+    chalit_houses: List[List[str]]
+    nakshatras: Dict[str, dict]
+    # array-backed view of planets/houses for the strength and yoga modules
+    chart: Optional[Chart] = field(default=None, compare=False, repr=False)
+
+    @classmethod
+    def build(
+        cls,
+        dt_local: datetime,
+        tz_hours: float,
+        lat: float,
+        lon: float,
+        ayanamsa: str = "lahiri",
+        hsys: str = "P",
+    ) -> "ChartContext":
+        """Run the ephemeris once (one Julian day, one planets pass, one houses pass)."""
+        jd = to_julian_day(dt_local, tz_hours)
+        planets = compute_planets(dt_local, tz_hours, lat, lon, ayanamsa=ayanamsa, jd=jd)
+        cusps, asc_sidereal = compute_cusps(dt_local, tz_hours, lat, lon, hsys=hsys, jd=jd, ayanamsa=ayanamsa)
+        return cls.from_positions(
+            dt_local, tz_hours, lat, lon, ayanamsa, hsys,
+            jd=jd, planets=planets, cusps=cusps, asc_sidereal=asc_sidereal,
+        )
+
+    @classmethod
+    def build_many(
+        cls,
+        dt_local: datetime,
+        tz_hours: float,
+        lat: float,
+        lon: float,
+        ayanamsas: Iterable[str],
+        hsys: str = "P",
+        tropical_memo: Optional[Dict[float, dict]] = None,
+    ) -> Dict[str, "ChartContext"]:
+        """
+        One tropical planets/houses pass, one context per ayanamsa (derived by offset).
+        tropical_memo ({jd: tropical planets}) lets several charts born at the same
+        instant, e.g. the items of one batch, share the planets pass.
+        """
+        jd = to_julian_day(dt_local, tz_hours)
+        if tropical_memo is None:
+            tropical = compute_tropical(jd)
+        else:
+            tropical = tropical_memo.get(jd)
+            if tropical is None:
+                tropical = tropical_memo.setdefault(jd, compute_tropical(jd))
+        cusps, asc_tropical = compute_cusps_tropical(jd, lat, lon, hsys)
+        return {
+            a: cls.from_positions(
+                dt_local, tz_hours, lat, lon, a, hsys,
+                jd=jd, planets=sidereal_planets(tropical, jd, a), cusps=cusps,
+                asc_sidereal=sidereal_asc(asc_tropical, jd, a),
+            )
+            for a in dict.fromkeys(ayanamsas)
+        }
+
+    @classmethod
+    def from_positions(
+        cls,
+        dt_local: datetime,
+        tz_hours: float,
+        lat: float,
+        lon: float,
+        ayanamsa: str,
+        hsys: str,
+        *,
+        jd: float,
+        planets: Dict[str, dict],
+        cusps: List[float],
+        asc_sidereal: float,
+    ) -> "ChartContext":
+        """Assemble a context from positions that were already computed elsewhere."""
+        asc_idx = sign_index(asc_sidereal)
+        chalit_houses = chalit_from_longitudes(planets, cusps)
+
+        nakshatras = {}
+        for name, data in planets.items():
+            idx, nname, lord, pada = nakshatra_for_lon(data["lon"])
+            nakshatras[name] = {"idx": idx, "name": nname, "lord": lord, "pada": pada}
+
+        return cls(
+            dt_local=dt_local,
+            tz_hours=tz_hours,
+            lat=lat,
+            lon=lon,
+            ayanamsa=ayanamsa,
+            hsys=hsys,
+            jd=jd,
+            ayanamsa_deg=mean_ayanamsa(jd, ayanamsa),
+            planets=planets,
+            cusps=cusps,
+            asc_sidereal=asc_sidereal,
+            asc_idx=asc_idx,
+            rashi_houses=rashi_from_longitudes(planets, asc_idx),
+            chalit_houses=chalit_houses,
+            nakshatras=nakshatras,
+            chart=Chart.from_legacy(planets, asc_idx, chalit_houses),
+        )
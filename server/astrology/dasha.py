@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta, timezone
 from typing import List, Dict, Optional, Tuple
+from infra.caching import memoize
 from .nakshatra import get_nakshatra_name, get_pada
 
 # --- Vimśottarī -----------------------------------------------------------
@@ -137,6 +138,31 @@ def _to_utc(dt_local: datetime, tz_hours: float) -> datetime:
     return dt_utc.astimezone(timezone.utc)
 
 
+# Output layouts of the compute_* functions:
+#   "records"   timelines as lists of {"lord", "start", "end"} dicts, ISO-8601 UTC strings
+#   "columnar"  timelines as {"lord": [...], "start": [...], "end": [...]} (plus "yogini" / "rasi"),
+#               every boundary (active periods included) in integer epoch seconds
+LAYOUTS = ("records", "columnar")
+
+
+def _stamp(d: datetime, layout: str):
+    """A period boundary: ISO-8601 UTC string (records) or epoch seconds (columnar)."""
+    if layout == "columnar":
+        return round(d.timestamp())
+    return d.astimezone(timezone.utc).isoformat()
+
+
+def _periods(lst: List[Dict], keys: Tuple[str, ...], layout: str):
+    """A timeline in `layout`: keys (e.g. ("lord",)) plus start/end of each period."""
+    if layout == "columnar":
+        out = {k: [x[k] for x in lst] for k in keys}
+        out["start"] = [round(x["start"].timestamp()) for x in lst]
+        out["end"] = [round(x["end"].timestamp()) for x in lst]
+        return out
+    return [{**{k: x[k] for k in keys}, "start": _stamp(x["start"], layout), "end": _stamp(x["end"], layout)}
+            for x in lst]
+
+
 def _frac_in_nak(lon: float) -> float:
     """Return fraction (0..1) progressed within current nakshatra (sidereal long)."""
     off = lon % NAK_SIZE
@@ -156,6 +182,7 @@ def _span(start: datetime, years: float) -> Tuple[datetime, datetime]:
     end = start + timedelta(days=dur_days)
     return start, end
 
+@memoize(maxsize=1024)
 def _build_md_list(birth_utc: datetime, moon_lon: float) -> List[Dict]:
     """Build full Vimśottarī MD timeline from birth."""
     sidx = _vims_start_index(moon_lon)
@@ -225,6 +252,7 @@ def _frac_in_pada(moon_lon: float) -> float:
 def _roll2(names: list, years: list, start: int) -> tuple[list, list]:
     return names[start:] + names[:start], years[start:] + years[:start]
 
+@memoize(maxsize=1024)
 def _build_yogini_md_list(birth_utc: datetime, moon_lon: float) -> List[Dict]:
     """
     Build Yoginī MD timeline starting at Yoginī determined by Moon's pada,
@@ -276,6 +304,7 @@ def _asht_start_index(moon_lon: float) -> int | None:
         return None
     return ASHT_LORDS.index(lord)
 
+@memoize(maxsize=1024)
 def _build_asht_md_list(birth_utc: datetime, moon_lon: float) -> List[Dict]:
     """Build Aṣṭottarī MD list starting from Janma-nakshatra lord; first MD truncated by nak fraction."""
     sidx = _asht_start_index(moon_lon)
@@ -367,7 +396,8 @@ def compute_vimsottari(
     birth_dt_local: datetime,
     tz_hours: float,
     moon_lon: float,
-    now_dt: Optional[datetime] = None
+    now_dt: Optional[datetime] = None,
+    layout: str = "records",
 ) -> Dict:
     """
     Returns:
@@ -384,7 +414,8 @@ def compute_vimsottari(
          "PD_current": [ ...list under active AD... ]
       }
     }
-    All datetimes are UTC ISO strings for safe templating.
+    All datetimes are UTC ISO strings for safe templating; layout="columnar"
+    gives each timeline as arrays and every datetime as epoch seconds (LAYOUTS).
     """
     birth_utc = _to_utc(birth_dt_local, tz_hours)
     if now_dt:
@@ -406,11 +437,11 @@ def compute_vimsottari(
     pd_list = _subperiods(ad_active, VIMS_LORDS, VIMS_YEARS)
     pd_active = next((pd for pd in pd_list if _in_span(now, pd["start"], pd["end"])), pd_list[0])
 
-    def _iso(d: datetime) -> str:
-        return d.astimezone(timezone.utc).isoformat()
+    def _iso(d: datetime):
+        return _stamp(d, layout)
 
-    def _isoize(lst: List[Dict]) -> List[Dict]:
-        return [{"lord": x["lord"], "start": _iso(x["start"]), "end": _iso(x["end"])} for x in lst]
+    def _isoize(lst: List[Dict]):
+        return _periods(lst, ("lord",), layout)
 
     return {
         "system": "Vimśottarī",
@@ -430,7 +461,8 @@ def compute_yogini(
     birth_dt_local: datetime,
     tz_hours: float,
     moon_lon: float,
-    now_dt: Optional[datetime] = None
+    now_dt: Optional[datetime] = None,
+    layout: str = "records",
 ) -> Dict:
     """
     Yoginī (36-year) dashā:
@@ -501,11 +533,11 @@ def compute_yogini(
         pd_list.append({"yogini": nm, "lord": ld, "start": s, "end": e})
         cur = e
 
-    def _iso(d: datetime) -> str:
-        return d.astimezone(timezone.utc).isoformat()
+    def _iso(d: datetime):
+        return _stamp(d, layout)
 
-    def _isoize(lst: List[Dict]) -> List[Dict]:
-        return [{"yogini": x["yogini"], "lord": x["lord"], "start": _iso(x["start"]), "end": _iso(x["end"])} for x in lst]
+    def _isoize(lst: List[Dict]):
+        return _periods(lst, ("yogini", "lord"), layout)
 
     return {
         "system": "Yoginī",
@@ -527,7 +559,8 @@ def compute_ashtottari(
     birth_dt_local: datetime,
     tz_hours: float,
     moon_lon: float,
-    now_dt: Optional[datetime] = None
+    now_dt: Optional[datetime] = None,
+    layout: str = "records",
 ) -> Dict:
     """
     Aṣṭottarī (108-year) dashā:
@@ -553,9 +586,9 @@ def compute_ashtottari(
     pd_list = _subperiods(ad_active, ASHT_LORDS, ASHT_YEARS)
     pd_active = next((pd for pd in pd_list if _in_span(now, pd["start"], pd["end"])), pd_list[0])
 
-    _iso = lambda d: d.astimezone(timezone.utc).isoformat()
-    def _isoize(lst: List[Dict]) -> List[Dict]:
-        return [{"lord": x["lord"], "start": _iso(x["start"]), "end": _iso(x["end"])} for x in lst]
+    _iso = lambda d: _stamp(d, layout)
+    def _isoize(lst: List[Dict]):
+        return _periods(lst, ("lord",), layout)
 
     return {
         "system": "Aṣṭottarī",
@@ -578,7 +611,8 @@ def compute_kalachakra(
     birth_dt_local: datetime,
     tz_hours: float,
     moon_lon: float,
-    now_dt: Optional[datetime] = None
+    now_dt: Optional[datetime] = None,
+    layout: str = "records",
 ) -> Dict:
     """
     Full Kalacakra Dasha (Saravali method):
@@ -652,7 +686,7 @@ def compute_kalachakra(
     md_active = next((md for md in md_list if _in_span(now, md["start"], md["end"])), md_list[0])
 
     # Antardasha within active MD (8 parts; order based on group’s Jeeva/Deha rule) :contentReference[oaicite:5]{index=5}
-    def _iso(d: datetime) -> str: return d.astimezone(timezone.utc).isoformat()
+    def _iso(d: datetime): return _stamp(d, layout)
     md_days = (md_active["end"] - md_active["start"]).total_seconds() / 86400.0
     md_years = md_days / DAYS_PER_YEAR
 
@@ -684,7 +718,7 @@ def compute_kalachakra(
     pd_active = next((pd for pd in pd_list if _in_span(now, pd["start"], pd["end"])), pd_list[0])
 
     def _isoize(lst):
-        return [{"rasi": x["rasi"], "lord": x["lord"], "start": _iso(x["start"]), "end": _iso(x["end"])} for x in lst]
+        return _periods(lst, ("rasi", "lord"), layout)
 
     return {
         "system": "Kalacakra",
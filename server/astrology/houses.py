@@ -1,18 +1,34 @@
 import swisseph as swe
-from .swe_utils import to_julian_day, norm360
+from infra.caching import memoize
+from .swe_utils import to_julian_day, norm360, mean_ayanamsa, prepare_thread, get_config
 
 # House systems: 'P' Placidus, 'W' Whole Sign etc.
 
-def compute_cusps(dt_local, tz_offset, lat, lon, hsys='P'):
-    jd = to_julian_day(dt_local, tz_offset)
+def compute_cusps_tropical(jd, lat, lon, hsys='P'):
+    """Tropical cusps and ascendant; one pass serves any number of ayanamsas."""
+    prepare_thread()
     # tropical cusps are typical for Bhava Chalit alignment with popular sites
     cusps, ascmc = swe.houses_ex(jd, lat, lon, hsys.encode('ascii'))
-    cusps = [norm360(c) for c in cusps]
-    asc_tropical = ascmc[0]
+    return [norm360(c) for c in cusps], ascmc[0]
+
+
+def compute_cusps(dt_local, tz_offset, lat, lon, hsys='P', jd=None, ayanamsa=None):
+    # ayanamsa: None uses the configured default (swe_utils.init)
+    if jd is None:
+        jd = to_julian_day(dt_local, tz_offset)
+    return _compute_cusps(jd, lat, lon, hsys, (ayanamsa or get_config()["ayanamsa"]).lower())
+
+
+# keyed by the Julian day and the resolved ayanamsa, so a later init() cannot serve stale cusps
+@memoize(maxsize=1024)
+def _compute_cusps(jd, lat, lon, hsys, ayanamsa):
+    cusps, asc_tropical = compute_cusps_tropical(jd, lat, lon, hsys)
     # Convert Asc to sidereal for Rashi chart
-    ayan = swe.get_ayanamsa(jd)
-    asc_sidereal = norm360(asc_tropical - ayan)
-    return cusps, asc_sidereal
+    return cusps, sidereal_asc(asc_tropical, jd, ayanamsa)
+
+
+def sidereal_asc(asc_tropical, jd, ayanamsa=None):
+    return norm360(asc_tropical - mean_ayanamsa(jd, ayanamsa))
 
 
 def which_house_from_cusps(lon_tropical: float, cusps: list[float]) -> int:
@@ -1,6 +1,7 @@
 # astrology/kp.py
 from __future__ import annotations
 from typing import Dict, List, Tuple
+from infra.caching import memoize
 from .symbols import SIGN_LORDS
 from .nakshatra import NAKSHATRA_LORDS, nakshatra_for_lon
 from .swe_utils import norm360
@@ -10,6 +11,7 @@ VIM_SEQ = ["Ketu","Venus","Sun","Moon","Mars","Rahu","Jupiter","Saturn","Mercury
 VIM_YEARS = {"Ketu":7,"Venus":20,"Sun":6,"Moon":10,"Mars":7,"Rahu":18,"Jupiter":16,"Saturn":19,"Mercury":17}
 NAK_LEN_DEG = 360.0/27.0
 
+@memoize(maxsize=4096, quantize=9)
 def _sublord_in_nak(lon_deg: float) -> str:
     """
     Compute KP sub-lord inside a nakshatra:
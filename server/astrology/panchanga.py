@@ -25,7 +25,7 @@ KARANA_NAMES = [
 
 WEEKDAYS = ["Sunday","Monday","Tuesday","Wednesday","Thursday","Friday","Saturday"]
 
-def compute_panchanga(dt_local: datetime, tz_hours: float, lat: float, lon: float) -> dict:
+def compute_panchanga(dt_local: datetime, tz_hours: float, lat: float, lon: float, ctx=None) -> dict:
     """
     Fast, sidereal panchanga summary:
       - tithi (index/name/progress)
@@ -34,9 +34,10 @@ def compute_panchanga(dt_local: datetime, tz_hours: float, lat: float, lon: floa
       - karana (index/name)
       - weekday (local)
     Simplifications: traditional sunrise-based day boundaries are not used here; we compute at given dt_local.
+    ctx: optional ChartContext for the same moment; reuses its planets and Moon nakshatra.
     """
     # planets in sidereal (your swe_utils.init() should already be called by API)
-    p = compute_planets(dt_local, tz_hours, lat, lon)
+    p = ctx.planets if ctx is not None else compute_planets(dt_local, tz_hours, lat, lon)
 
     sun = p["Sun"]["lon"]
     moon = p["Moon"]["lon"]
@@ -57,7 +58,11 @@ def compute_panchanga(dt_local: datetime, tz_hours: float, lat: float, lon: floa
     karana = KARANA_NAMES[karana_idx]
 
     # Nakshatra
-    nidx, nname, lord, pada = nakshatra_for_lon(moon)  
+    if ctx is not None and "Moon" in ctx.nakshatras:
+        nk = ctx.nakshatras["Moon"]
+        nidx, nname, lord, pada = nk["idx"], nk["name"], nk["lord"], nk["pada"]
+    else:
+        nidx, nname, lord, pada = nakshatra_for_lon(moon)
 
     # Weekday in local time
     local_day = (dt_local - timedelta(hours=0)).weekday()  # dt_local is already local wall time
@@ -1,5 +1,6 @@
+import numpy as np
 import swisseph as swe
-from .swe_utils import to_julian_day, set_sidereal, norm360
+from .swe_utils import to_julian_day, norm360, ayanamsa_ut, ayanamsa_rate, prepare_thread
 
 PLANET_CODES = {
     "Sun": swe.SUN,
@@ -17,19 +18,30 @@ PLANET_CODES = {
     "Rahu": swe.MEAN_NODE,
 }
 
-FLAGS = swe.FLG_SWIEPH | swe.FLG_SIDEREAL | swe.FLG_SPEED  # SPEED => xx has 6 values
-
-def compute_planets(dt_local, tz_offset, lat, lon, ayanamsa="lahiri"):
-    jd = to_julian_day(dt_local, tz_offset)
-    set_sidereal(ayanamsa)
+# Tropical; sidereal = tropical - ayanamsa_ut(jd, name), so no global sid mode is involved
+FLAGS = swe.FLG_SWIEPH | swe.FLG_SPEED  # SPEED => xx has 6 values
 
+def compute_tropical(jd):
+    """Tropical (lon, speed) per PLANET_CODES body; one pass serves any number of ayanamsas."""
+    prepare_thread()
     out = {}
-
     for name, code in PLANET_CODES.items():
         # calc_ut returns (xx, retflag); xx = (lon, lat, dist[, lon_speed, lat_speed, dist_speed])
         xx, retflag = swe.calc_ut(jd, code, FLAGS)
-        lon_deg = norm360(xx[0])
-        lon_speed = xx[3] if len(xx) >= 4 else 0.0
+        out[name] = (xx[0], xx[3] if len(xx) >= 4 else 0.0)
+    return out
+
+
+def sidereal_planets(tropical, jd, ayanamsa="lahiri"):
+    """Legacy planets dict ({name: {lon, retro}}, Ketu derived) for one ayanamsa."""
+    ayan = ayanamsa_ut(jd, ayanamsa)
+    rate = ayanamsa_rate()
+
+    out = {}
+
+    for name, (lon_trop, speed_trop) in tropical.items():
+        lon_deg = norm360(lon_trop - ayan)
+        lon_speed = speed_trop - rate
         out[name] = {
             "lon": lon_deg,
             "retro": lon_speed < 0.0,
@@ -43,3 +55,48 @@ def compute_planets(dt_local, tz_offset, lat, lon, ayanamsa="lahiri"):
         }
 
     return out
+
+
+def compute_planets(dt_local, tz_offset, lat, lon, ayanamsa="lahiri", jd=None):
+    # jd: pass a precomputed Julian day (e.g. ChartContext.jd) to skip the conversion
+    if jd is None:
+        jd = to_julian_day(dt_local, tz_offset)
+    return sidereal_planets(compute_tropical(jd), jd, ayanamsa)
+
+
+def compute_planets_multi(dt_local, tz_offset, lat, lon, ayanamsas, jd=None):
+    """{ayanamsa: planets} from a single tropical pass."""
+    if jd is None:
+        jd = to_julian_day(dt_local, tz_offset)
+    tropical = compute_tropical(jd)
+    return {a: sidereal_planets(tropical, jd, a) for a in ayanamsas}
+
+
+def compute_planets_batch(jd_array, bodies=None, flags=FLAGS, ayanamsa="lahiri"):
+    """
+    Evaluate many Julian days (UT) in one pass, for time scans.
+
+    bodies: names from PLANET_CODES plus "Ketu" (default: all of them).
+    Returns sidereal (lon, speed), float arrays of shape (n_times, n_bodies).
+    Lock-free like compute_planets: tropical positions minus the ayanamsa.
+    """
+    jds = np.asarray(jd_array, dtype=float).ravel().tolist()
+    names = list(bodies) if bodies is not None else [*PLANET_CODES, "Ketu"]
+    lon = np.zeros((len(jds), len(names)))
+    speed = np.zeros((len(jds), len(names)))
+
+    codes = list(dict.fromkeys(PLANET_CODES["Rahu" if n == "Ketu" else n] for n in names))
+    calc = swe.calc_ut
+    ayan = np.array([ayanamsa_ut(jd, ayanamsa) for jd in jds], dtype=float)  # also readies this thread
+    # time-major order: Swiss Ephemeris reuses its per-date state across bodies
+    xx = np.array([[calc(jd, code, flags)[0] for code in codes] for jd in jds], dtype=float)
+    xx = xx.reshape(len(jds), len(codes), -1)
+
+    for j, name in enumerate(names):
+        c = codes.index(PLANET_CODES["Rahu" if name == "Ketu" else name])
+        lon[:, j] = xx[:, c, 0] - ayan + (180.0 if name == "Ketu" else 0.0)
+        if xx.shape[2] >= 4:
+            speed[:, j] = xx[:, c, 3] - ayanamsa_rate()
+
+    np.mod(lon, 360.0, out=lon)
+    return lon, speed
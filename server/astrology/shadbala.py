@@ -1,7 +1,9 @@
 from __future__ import annotations
 from typing import Dict, List, Tuple, Optional, Any
-from .swe_utils import sign_index
-from .symbols import SIGN_NAMES
+import numpy as np
+
+from .symbols import SIGN_NAMES, SIGN_LORDS
+from .chart import Chart, BODY_INDEX, as_chart, body_mask
 
 # ---- constants ------------------------------------------------------------
 PLANETS = ["Sun","Moon","Mars","Mercury","Jupiter","Venus","Saturn","Rahu","Ketu"]
@@ -40,6 +42,10 @@ NIGHT_PLANETS = {"Moon","Venus","Mars"}
 
 BENEFICS = {"Jupiter","Venus","Mercury","Moon"}
 MALEFICS = {"Saturn","Mars","Rahu","Ketu","Sun"}
+# drik bala vote per aspecting body: benefics +1, everything else -1
+_DRIK_WEIGHT = np.where(body_mask(BENEFICS), 1, -1)
+
+STHANA_BY_LEVEL = {"exalt":1.00, "own":0.75, "friend":0.60, "neutral":0.50, "enemy":0.40, "debil":0.25}
 
 # Weights (sum ≈ 1.0); tunable
 W = {"naisargika":0.20, "sthana":0.25, "dig":0.15, "kala":0.15, "cheshta":0.15, "drik":0.10}
@@ -64,30 +70,6 @@ DEFAULT_NAISARGIKA_MAX_VIRUPA: Dict[str, int] = {
 # DEFAULT_NAISARGIKA_MAX_VIRUPA.update({"Rahu": 0, "Ketu": 0})
 
 # ---- helpers --------------------------------------------------------------
-def _sign_name(lon: float) -> str:
-    return SIGN_NAMES[sign_index(lon)]
-
-def _house_of(name: str, chalit_houses: List[List[str]]) -> Optional[int]:
-    for i, plist in enumerate(chalit_houses, start=1):
-        if name in plist:
-            return i
-    return None
-
-def _sign_diff(a: int, b: int) -> int:
-    return (b - a) % 12
-
-def _q_aspects_p(q_name: str, q_sign: int, p_sign: int) -> bool:
-    d = _sign_diff(q_sign, p_sign)
-    if d == 6:  # 7th
-        return True
-    if q_name == "Mars" and d in (3,7):      # 4,8
-        return True
-    if q_name == "Jupiter" and d in (4,8):   # 5,9
-        return True
-    if q_name == "Saturn" and d in (2,9):    # 3,10
-        return True
-    return False
-
 def _friend_level(planet: str, sign_name: str) -> str:
     lord = _lord_of_sign(sign_name)
     if lord == planet: return "own"
@@ -97,23 +79,17 @@ def _friend_level(planet: str, sign_name: str) -> str:
     if lord in ENEMIES.get(planet,set()): return "enemy"
     return "neutral"
 
+_LORD_BY_SIGN_NAME = dict(zip(SIGN_NAMES, SIGN_LORDS))
+
 def _lord_of_sign(sign_name: str) -> str:
-    idx = SIGN_NAMES.index(sign_name)
-    SIGN_LORDS = {
-        0: "Mars", 1: "Venus", 2: "Mercury", 3: "Moon", 4: "Sun", 5: "Mercury",
-        6: "Venus", 7: "Mars", 8: "Jupiter", 9: "Saturn", 10:"Saturn", 11:"Jupiter"
-    }
-    return SIGN_LORDS[idx]
+    return _LORD_BY_SIGN_NAME[sign_name]
 
 # ---- components -----------------------------------------------------------
 def _naisargika(planet: str) -> float:
     return max(0.0, min(1.0, NAISARGIKA_SS.get(planet, 20)/60.0))
 
 def _sthana(planet: str, sign_name: str) -> float:
-    lvl = _friend_level(planet, sign_name)
-    return {
-        "exalt":1.00, "own":0.75, "friend":0.60, "neutral":0.50, "enemy":0.40, "debil":0.25
-    }.get(lvl, 0.50)
+    return STHANA_BY_LEVEL.get(_friend_level(planet, sign_name), 0.50)
 
 def _digbala(planet: str, house_num: Optional[int]) -> float:
     if not house_num: return 0.5
@@ -137,19 +113,10 @@ def _cheshta(planet: str, retro: Optional[bool]) -> float:
     if planet in ("Sun","Moon"): return 0.5
     return 1.0 if retro else 0.55
 
-def _drikbala(planet: str, planets: Dict[str, Dict]) -> float:
-    """Sign-based: benefic aspects add, malefic subtract; map −5..+5 → 0..1."""
-    si = {p: sign_index(d["lon"]) for p, d in planets.items() if "lon" in d}
-    if planet not in si: return 0.5
-    ps = si[planet]
-    score = 0
-    for q, qs in si.items():
-        if q == planet: continue
-        if _q_aspects_p(q, qs, ps):
-            score += 1 if q in BENEFICS else -1
-    # map to 0..1
-    score = max(-5, min(5, score))
-    return (score + 5)/10.0
+def _drikbala(chart: Chart) -> List[float]:
+    """Sign-based, per body: benefic aspects add, malefic subtract; map −5..+5 → 0..1."""
+    score = np.clip(_DRIK_WEIGHT @ chart.aspects(), -5, 5)
+    return ((score + 5) / 10.0).tolist()
 
 def _virupa_to_rupa(virupa: float) -> float:
     """Convert Virupa to Rupa (1 Rupa = 60 Virupas)."""
@@ -236,12 +203,13 @@ def strength_tier_from_rupa(rupa: float) -> str:
 
 # ---- main ----------------------------------------------------------------
 def _compute_shadbala_normalized(
-    planets: Dict[str, Dict],
+    planets: Dict[str, Dict] | Chart,
     asc_idx: int,
     chalit_houses: List[List[str]],
     *, local_hour: Optional[int] = None
 ) -> Dict[str, Dict]:
     """
+    planets may be the legacy dict or a Chart (then chalit_houses is not read).
     Returns:
       {
         "total": {"Sun":0.78, ...},               # 0..1
@@ -251,18 +219,23 @@ def _compute_shadbala_normalized(
     total: Dict[str, float] = {}
     comps: Dict[str, Dict[str, float]] = {}
 
+    chart = as_chart(planets, asc_idx, chalit_houses)
+    present, signs = chart.present.tolist(), chart.sign.tolist()
+    houses, retro = chart.chalit_house.tolist(), chart.retro.tolist()
+    drik = _drikbala(chart)
+
     for p in PLANETS:
-        d = planets.get(p)
-        if not d or "lon" not in d: 
+        i = BODY_INDEX[p]
+        if not present[i]:
             continue
-        sign = _sign_name(d["lon"])
-        hnum = _house_of(p, chalit_houses)
+        sign = SIGN_NAMES[signs[i]]
+        hnum = houses[i] or None
         c_na = _naisargika(p)
         c_st = _sthana(p, sign)
         c_di = _digbala(p, hnum)
         c_ka = _kalabala(p, local_hour)
-        c_ch = _cheshta(p, d.get("retro"))
-        c_dr = _drikbala(p, planets)
+        c_ch = _cheshta(p, retro[i])
+        c_dr = drik[i]
 
         comps[p] = {"naisargika":c_na, "sthana":c_st, "dig":c_di, "kala":c_ka, "cheshta":c_ch, "drik":c_dr}
         val = sum(comps[p][k]*W[k] for k in W.keys())
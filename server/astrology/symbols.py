@@ -10,4 +10,9 @@ SIGN_SYMBOLS = {
 PLANET_SYMBOLS = {
     'Sun': '☉','Moon': '☽','Mars': '♂','Mercury': '☿','Jupiter': '♃','Venus': '♀','Saturn': '♄',
     'Uranus': '⛢','Neptune': '♆','Pluto': '♇','Rahu': '☊','Ketu': '☋'
-}
\ No newline at end of file
+}
+
+# Lord of each sign (0 = Aries)
+SIGN_LORDS = [
+    'Mars','Venus','Mercury','Moon','Sun','Mercury','Venus','Mars','Jupiter','Saturn','Saturn','Jupiter'
+]
@@ -2,10 +2,12 @@ from __future__ import annotations
 from datetime import datetime, timedelta, timezone
 from typing import Dict, List, Optional, Tuple
 
-from .planets import compute_planets
+import numpy as np
+
+from .planets import compute_planets, compute_planets_batch
 from .houses import compute_cusps
 from .charts import rashi_from_longitudes, chalit_from_longitudes
-from .swe_utils import sign_index
+from .swe_utils import sign_index, to_julian_day
 from .symbols import SIGN_NAMES
 
 SIGN_LORDS = {
@@ -13,54 +15,34 @@ SIGN_LORDS = {
     6: "Venus", 7: "Mars", 8: "Jupiter", 9: "Saturn", 10: "Saturn", 11: "Jupiter"
 }
 
-def _norm180(x: float) -> float:
-    """Normalize angle to (-180, 180]."""
-    x = (x + 180.0) % 360.0 - 180.0
-    if x <= -180.0:
-        x += 360.0
-    return x
+def _closest_sun(target: float, start_utc: datetime, step: timedelta, n: int) -> datetime:
+    """
+    Sample the sidereal Sun at start + k*step (k < n) in one ephemeris batch
+    and return the sample time minimizing |diff| to target (first one on ties).
+    """
+    jd0 = to_julian_day(start_utc, 0.0)
+    jds = jd0 + np.arange(n) * (step / timedelta(days=1))
+    sun_lon, _ = compute_planets_batch(jds, ("Sun",), ayanamsa='lahiri')
+    diff = np.abs((target - sun_lon[:, 0] + 180.0) % 360.0 - 180.0)
+    return start_utc + int(np.argmin(diff)) * step
 
 def _best_by_grid(target: float, dt_guess_utc: datetime, tz_hours: float, lat: float, lon: float) -> datetime:
     """
     Coarse grid search around guess ±36h with 2h steps to find time minimizing |diff|.
     """
-    best_t = None
-    best_abs = 1e9
     step = timedelta(hours=2)
     start = dt_guess_utc - timedelta(hours=36)
-    end   = dt_guess_utc + timedelta(hours=36)
-    t = start
-    while t <= end:
-        t_local = t + timedelta(hours=tz_hours)
-        sun_lon = compute_planets(t_local, tz_hours, lat, lon, ayanamsa='lahiri')["Sun"]["lon"]
-        diff = abs(_norm180(target - sun_lon))
-        if diff < best_abs:
-            best_abs = diff
-            best_t = t
-        t += step
-    return best_t
+    return _closest_sun(target, start, step, 37)
 
 def _refine_time(target: float, t0_utc: datetime, tz_hours: float, lat: float, lon: float) -> datetime:
     """
     Refine around t0 with shrinking steps (20m, 5m, 1m).
     """
     center = t0_utc
+    win = timedelta(hours=2)
     for minutes in (20, 5, 1):
-        win = timedelta(hours=2)
         step = timedelta(minutes=minutes)
-        start = center - win
-        end   = center + win
-        best = center
-        best_abs = 1e9
-        t = start
-        while t <= end:
-            sun_lon = compute_planets(t + timedelta(hours=tz_hours), tz_hours, lat, lon, ayanamsa='lahiri')["Sun"]["lon"]
-            diff = abs(_norm180(target - sun_lon))
-            if diff < best_abs:
-                best_abs = diff
-                best = t
-            t += step
-        center = best
+        center = _closest_sun(target, center - win, step, 2 * (win // step) + 1)
     return center
 
 def compute_varshaphala(
@@ -68,7 +50,8 @@ def compute_varshaphala(
     tz_hours: float,
     lat: float,
     lon: float,
-    year: int
+    year: int,
+    ctx=None,
 ) -> Dict:
     """
     Compute sidereal (Lahiri) Solar Return for `year` and Varṣaphala info:
@@ -76,15 +59,22 @@ def compute_varshaphala(
     - Return chart planets, cusps, ascendant
     - Muntha sign/sign-lord and their placement in the return chart
     - Datasets for existing Rāśi/Chalit renderers
+
+    ctx: optional natal ChartContext; reuses its planets and ascendant instead
+    of recomputing them (only when it was built with the Lahiri ayanamsa).
     """
     print(year)
-    # Natal Sun longitude (sidereal)
-    natal_planets = compute_planets(birth_dt_local, tz_hours, lat, lon, ayanamsa='lahiri')
-    natal_sun_lon = natal_planets["Sun"]["lon"]
-
-    # Natal Asc (for Muntha)
-    _, natal_asc_sid = compute_cusps(birth_dt_local, tz_hours, lat, lon, hsys='P')
-    natal_asc_idx = sign_index(natal_asc_sid)
+    if ctx is not None and ctx.ayanamsa == "lahiri":
+        natal_sun_lon = ctx.planets["Sun"]["lon"]
+        natal_asc_idx = ctx.asc_idx
+    else:
+        # Natal Sun longitude (sidereal)
+        natal_planets = compute_planets(birth_dt_local, tz_hours, lat, lon, ayanamsa='lahiri')
+        natal_sun_lon = natal_planets["Sun"]["lon"]
+
+        # Natal Asc (for Muntha)
+        _, natal_asc_sid = compute_cusps(birth_dt_local, tz_hours, lat, lon, hsys='P', ayanamsa='lahiri')
+        natal_asc_idx = sign_index(natal_asc_sid)
 
     # Guess around same calendar month/day/time in target year (local), convert to UTC
     guess_local = birth_dt_local.replace(year=year)
@@ -97,7 +87,7 @@ def compute_varshaphala(
 
     # Return chart planets/cusps
     ret_planets = compute_planets(exact_local, tz_hours, lat, lon, ayanamsa='lahiri')
-    cusps, asc_sid = compute_cusps(exact_local, tz_hours, lat, lon, hsys='P')
+    cusps, asc_sid = compute_cusps(exact_local, tz_hours, lat, lon, hsys='P', ayanamsa='lahiri')
     asc_idx = sign_index(asc_sid)
 
     # House datasets for your chart renderers
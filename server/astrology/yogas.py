@@ -1,6 +1,6 @@
 from typing import Dict, List, Tuple, Optional, Set
-from .swe_utils import sign_index
 from .symbols import SIGN_NAMES
+from .chart import Chart, BODIES, BODY_INDEX, as_chart
 
 # Keep these maps in sync with predictions.py
 SIGN_LORDS = {
@@ -18,12 +18,13 @@ DEBIL = {
 BENEFICS = {"Jupiter","Venus","Mercury","Moon"}
 CLASSICALS = ["Sun","Moon","Mars","Mercury","Jupiter","Venus","Saturn"]
 
-def _planet_sign_idx(planets: Dict[str, Dict]) -> Dict[str, int]:
-    return {p: sign_index(d["lon"]) for p, d in planets.items() if "lon" in d}
+def _planet_sign_idx(chart: Chart) -> Dict[str, int]:
+    signs = chart.sign.tolist()
+    return {BODIES[i]: signs[i] for i in chart.indices()}
 
-def _planet_house_rashi(planets: Dict[str, Dict], asc_idx: int) -> Dict[str, int]:
-    si = _planet_sign_idx(planets)
-    return {p: ((s - asc_idx) % 12) + 1 for p, s in si.items()}
+def _planet_house_rashi(chart: Chart) -> Dict[str, int]:
+    houses = chart.rashi_house.tolist()
+    return {BODIES[i]: houses[i] for i in chart.indices()}
 
 def _house_sign_idx(asc_idx: int, house: int) -> int:
     return (asc_idx + (house - 1)) % 12
@@ -38,23 +39,10 @@ def _same_sign(s1: int, s2: int) -> bool:
 def _sign_diff(s1: int, s2: int) -> int:
     return (s2 - s1) % 12  # 0..11 forward distance
 
-def _mutual_aspect_by_sign(p1: str, s1: int, p2: str, s2: int) -> bool:
-    """Graha dṛṣṭi by sign: all planets aspect 7th; Mars (4,8), Jupiter (5,9), Saturn (3,10)."""
-    d = _sign_diff(s1, s2)
-    d2 = _sign_diff(s2, s1)
-
-    if d == 6 or d2 == 6:
-        return True
-    special = {
-        "Mars": {3, 7},       # 4th, 8th
-        "Jupiter": {4, 8},    # 5th, 9th
-        "Saturn": {2, 9},     # 3rd, 10th
-    }
-    if p1 in special and d in special[p1]:
-        return True
-    if p2 in special and d2 in special[p2]:
-        return True
-    return False
+def _mutual_aspect(aspects: List[List[bool]], p1: str, p2: str) -> bool:
+    """Graha dṛṣṭi by sign either way (aspects = Chart.aspects().tolist())."""
+    i, j = BODY_INDEX[p1], BODY_INDEX[p2]
+    return aspects[i][j] or aspects[j][i]
 
 def _is_kendra(h: int) -> bool:
     return h in (1,4,7,10)
@@ -84,10 +72,11 @@ def _parivartana(si: Dict[str, int]) -> List[Tuple[str, str]]:
     return out
 
 def detect_yogas(
-    planets: Dict[str, Dict],
+    planets: Dict[str, Dict] | Chart,
     asc_idx: int
 ) -> Dict[str, List[str]]:
     """
+    planets may be the legacy dict or a Chart.
     Returns:
       {
         "highlights": [str, ...],             # one-liners
@@ -97,8 +86,10 @@ def detect_yogas(
     hi: List[str] = []
     cat: Dict[str, List[str]] = {"Wealth": [], "Career": [], "Relationships": [], "Foundations": [], "Learning/Spiritual": []}
 
-    si = _planet_sign_idx(planets)
-    hi_r = _planet_house_rashi(planets, asc_idx)
+    chart = as_chart(planets, asc_idx)
+    si = _planet_sign_idx(chart)
+    hi_r = _planet_house_rashi(chart)
+    aspects = chart.aspects().tolist()
     lords = _house_lords(asc_idx)
 
     # --- 1) Rāja Yogas: Kendra × Trikona lords in yuti/aspect
@@ -111,7 +102,7 @@ def detect_yogas(
             if lk not in si or lt not in si:
                 continue
             sk, st = si[lk], si[lt]
-            if _same_sign(sk, st) or _mutual_aspect_by_sign(lk, sk, lt, st):
+            if _same_sign(sk, st) or _mutual_aspect(aspects, lk, lt):
                 key = tuple(sorted((lk, lt)))
                 if key in seen:
                     continue
@@ -129,7 +120,7 @@ def detect_yogas(
         for plord in partners:
             if plord not in si: continue
             sp = si[plord]
-            if _same_sign(sw, sp) or _mutual_aspect_by_sign(wlord, sw, plord, sp):
+            if _same_sign(sw, sp) or _mutual_aspect(aspects, wlord, plord):
                 key = tuple(sorted((wlord, plord)))
                 if key in seen: continue
                 seen.add(key)
@@ -145,7 +136,7 @@ def detect_yogas(
     # --- 3) Chandra–Maṅgala: Moon ↔ Mars yuti or mutual aspect
     if "Moon" in si and "Mars" in si:
         sm, sM = si["Moon"], si["Mars"]
-        if _same_sign(sm, sM) or _mutual_aspect_by_sign("Moon", sm, "Mars", sM):
+        if _same_sign(sm, sM) or _mutual_aspect(aspects, "Moon", "Mars"):
             msg = "Chandra–Maṅgala Yoga: Moon with Mars—enterprise and cashflow potential (manage volatility)."
             hi.append(msg); cat["Wealth"].append(msg); cat["Career"].append(msg)
 
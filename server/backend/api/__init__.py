@@ -2,3 +2,5 @@ from flask import Blueprint
 api = Blueprint("api", __name__, url_prefix="/api/v1")
 from . import v1  # noqa: E402,F401
 from . import parts  # register lightweight endpoints
+from .common import swr_after_request  # noqa: E402
+api.after_request(swr_after_request)  # Age/Warning + background refresh for stale cache hits
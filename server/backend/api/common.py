@@ -1,32 +1,115 @@
 # backend/api/common.py
 from __future__ import annotations
+import threading
+from datetime import datetime, timedelta
 from hashlib import sha256
-from typing import Tuple, Optional, Any, Dict
-from flask import request
+from typing import Tuple, Optional, Any, Dict, Iterable, List
+from flask import g, has_request_context, request
 from flask import current_app as app
 
 # ---------- Normalization / ID ----------
 
+LATLON_DECIMALS = 4  # default quantization: 1e-4 degree, about 11 m
+
+def _latlon_decimals() -> int:
+    try:
+        return int(app.config.get("CHART_LATLON_DECIMALS", LATLON_DECIMALS))
+    except RuntimeError:  # outside an app context
+        return LATLON_DECIMALS
+
+def canonical_tz(tz: str | None) -> str:
+    """"+5:30", "+05:30", "5.5", "0530" -> "+05:30"; ValueError on garbage."""
+    s = (tz or "").strip() or "+00:00"
+    sign = -1 if s.startswith("-") else 1
+    s = s.lstrip("+-")
+    if ":" in s or ("." not in s and len(s) > 2):
+        hh, mm = s.split(":", 1) if ":" in s else (s[:-2], s[-2:])
+        if not 0 <= int(mm) < 60:
+            raise ValueError(f"tz minutes out of range: {tz}")
+        minutes = int(hh) * 60 + int(mm)
+    else:
+        minutes = round(float(s) * 60)
+    if minutes > 14 * 60:
+        raise ValueError(f"tz out of range: {tz}")
+    return f"{'-' if sign < 0 and minutes else '+'}{minutes // 60:02d}:{minutes % 60:02d}"
+
+def canonical_tob(tob: str) -> str:
+    """"7:30", "17:30", "17:30:00" -> "HH:MM" ("HH:MM:SS" only when seconds are set)."""
+    parts = [int(p) for p in str(tob).strip().split(":")]
+    if not 2 <= len(parts) <= 3:
+        raise ValueError(f"tob must be HH:MM or HH:MM:SS: {tob}")
+    hh, mm, ss = (parts + [0])[:3]
+    if not (0 <= hh < 24 and 0 <= mm < 60 and 0 <= ss < 60):
+        raise ValueError(f"tob out of range: {tob}")
+    return f"{hh:02d}:{mm:02d}" + (f":{ss:02d}" if ss else "")
+
 def normalize_inputs(
     dob: str, tob: str, tz: str, lat: float, lon: float,
     ayanamsa: str = "lahiri", hsys: str = "P"
 ) -> Tuple[str, str, str, float, float, str, str]:
     """
-    Return canonicalized inputs: tz trimmed, ayanamsa lowercased, lat/lon as float.
+    Return canonicalized inputs: ISO dob, "HH:MM[:SS]" tob, "+HH:MM" tz,
+    lat/lon quantized to CHART_LATLON_DECIMALS, ayanamsa lowercased, hsys
+    uppercased. Engines compute from these values, so equivalent spellings
+    give identical results. ValueError on malformed input.
     """
-    tz = (tz or "+00:00").strip()
-    return dob, tob, tz, float(lat), float(lon), ayanamsa.lower(), hsys
+    d = _latlon_decimals()
+    dob = datetime.fromisoformat(str(dob).strip()).date().isoformat()
+    return (
+        dob, canonical_tob(tob), canonical_tz(tz),
+        round(float(lat), d) + 0.0, round(float(lon), d) + 0.0,
+        (ayanamsa or "lahiri").lower(), (hsys or "P").upper(),
+    )
 
-def chart_id_for(
+def utc_instant(dob: str, tob: str, tz: str) -> str:
+    """Birth moment as a UTC instant to the second: "1984-09-24T12:00:00Z"."""
+    tob, tz = canonical_tob(tob), canonical_tz(tz)
+    sign = -1 if tz.startswith("-") else 1
+    offset = timedelta(hours=int(tz[1:3]), minutes=int(tz[4:6])) * sign
+    utc = datetime.fromisoformat(f"{str(dob).strip()}T{tob}") - offset
+    return f"{utc:%Y-%m-%dT%H:%M:%S}Z"
+
+def chart_fingerprint(
     dob: str, tob: str, tz: str, lat: float, lon: float,
     ayan: str = "lahiri", hs: str = "P"
 ) -> str:
     """
-    Stable, deterministic ID for a chart input tuple.
+    Canonical chart identity: "<UTC instant to the second>|<tz>|<lat>|<lon>|<ayanamsa>|<hsys>".
+
+    The local offset stays in it because several sections are local-time
+    features (weekday, hour-based strengths, dasha dates).
     """
     dob, tob, tz, lat, lon, ayan, hs = normalize_inputs(dob, tob, tz, lat, lon, ayan, hs)
-    key = f"{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
-    return sha256(key.encode()).hexdigest()
+    d = _latlon_decimals()
+    return f"{utc_instant(dob, tob, tz)}|{tz}|{lat:.{d}f}|{lon:.{d}f}|{ayan}|{hs}"
+
+def chart_id_for(
+    dob: str, tob: str, tz: str, lat: float, lon: float,
+    ayan: str = "lahiri", hs: str = "P"
+) -> str:
+    """
+    Stable, deterministic ID for a chart input tuple (hash of its fingerprint).
+    Every cache key for a chart derives from it.
+    """
+    return sha256(chart_fingerprint(dob, tob, tz, lat, lon, ayan, hs).encode()).hexdigest()
+
+def parse_ayanamsas(raw: str | Iterable[str] | None) -> List[str]:
+    """
+    Parse an `ayanamsas` selection ("lahiri,raman" or a list) into known,
+    lowercased, de-duplicated names. Raises ValueError on unknown names.
+    """
+    from astrology.swe_utils import AYANAMSA_MAP
+    items = raw.split(",") if isinstance(raw, str) else list(raw or [])
+    out: List[str] = []
+    for item in items:
+        a = str(item).strip().lower()
+        if not a:
+            continue
+        if a not in AYANAMSA_MAP:
+            raise ValueError(f"unknown ayanamsa: {a} (supported: {', '.join(AYANAMSA_MAP)})")
+        if a not in out:
+            out.append(a)
+    return out
 
 # ---------- Swiss Ephemeris bootstrap ----------
 
@@ -47,7 +130,8 @@ def get_cache():
     """
     Return a Flask-Caching Cache instance if available.
     Supports either a direct Cache object at app.extensions['cache'] or
-    a dict of caches under that key.
+    a dict of caches under that key. With the default config this is the
+    TieredCache (in-process LRU + shared SQLite file, see config.py).
     """
     ext = app.extensions.get("cache")
     if hasattr(ext, "get") and hasattr(ext, "set"):
@@ -59,23 +143,213 @@ def get_cache():
     return None
 
 def cache_get(key: str):
+    """
+    Fresh cached value, or None. Inside a request, an expired entry still within
+    its namespace's max staleness is served too (stale-while-revalidate): the
+    response then carries Age/Warning and the request is replayed once in the
+    background to refresh the cache (see swr_after_request).
+    """
     c = get_cache()
     if not c:
         return None
     try:
-        return c.get(key)
+        if not (has_request_context() and hasattr(c, "get_stale")):
+            return c.get(key)
+        hit = c.get_stale(key)
+        if hit is None:
+            return None
+        value, age, stale = hit
+        if stale:
+            if request.environ.get(REVALIDATE_ENV):
+                return None  # this is the refresh: recompute
+            g.swr_age = max(age, getattr(g, "swr_age", 0.0))
+        return value
     except Exception:
         return None
 
-def cache_set(key: str, value: Any, timeout: int = 600) -> None:
+def cache_set(key: str, value: Any, timeout: int = 600, cost: float | None = None) -> None:
+    """cost: seconds it took to build `value`, for caches that evict by cost (TieredCache)."""
+    c = get_cache()
+    if not c:
+        return
+    try:
+        if cost is not None and hasattr(c, "ns_stats"):
+            c.set(key, value, timeout=timeout, cost=cost)
+        else:
+            c.set(key, value, timeout=timeout)
+    except Exception:
+        pass
+
+def cache_delete(key: str) -> None:
     c = get_cache()
     if not c:
         return
     try:
-        c.set(key, value, timeout=timeout)
+        c.delete(key)
     except Exception:
         pass
 
+def cache_get_or_set(key: str, compute, timeout: int = 600):
+    """
+    Cached value for key, else compute() and store it. With a cache that has
+    get_or_compute (TieredCache), concurrent misses compute only once.
+    """
+    c = get_cache()
+    if c is not None and hasattr(c, "get_or_compute"):
+        return c.get_or_compute(key, compute, timeout=timeout)
+    value = cache_get(key)
+    if value is None:
+        value = compute()
+        if value is not None:
+            cache_set(key, value, timeout=timeout)
+    return value
+
+# ---------- Single-flight coalescing ----------
+
+# per-worker counters: ns -> {"hits": n, "computed": n, "coalesced": n}
+COALESCE_STATS: Dict[str, Dict[str, int]] = {}
+
+def coalesce(ns: str, key: str, compute, timeout: int = 30, keep=None) -> Tuple[Any, str]:
+    """
+    Single-flight: the first request for `key` runs compute(); identical
+    requests that arrive while it runs (in this worker or, through the shared
+    cache, in another) wait and share its result, which stays cached for
+    `timeout` seconds unless keep(result) is false (e.g. it holds timeout
+    fallbacks): then the waiters share it but later requests compute again.
+    Returns (value, outcome), outcome being "hit", "computed" or "coalesced"
+    (waited on another caller's computation); counted per `ns` in COALESCE_STATS.
+    """
+    stats = COALESCE_STATS.setdefault(ns, {"hits": 0, "computed": 0, "coalesced": 0})
+    value = cache_get(key)
+    if value is not None:
+        stats["hits"] += 1
+        return value, "hit"
+
+    ran = []
+
+    def _compute():
+        ran.append(True)
+        return compute()
+
+    value = cache_get_or_set(key, _compute, timeout=timeout)
+    if ran and keep is not None and value is not None and not keep(value):
+        cache_delete(key)
+    outcome = "computed" if ran else "coalesced"
+    stats[outcome] += 1
+    return value, outcome
+
+_write_behind = None
+
+def write_behind(entries: Dict[str, Any], timeout: int = 600):
+    """
+    Store many entries from a background thread (one at a time, in order) so
+    the request does not wait on serialization. Returns the Future, or None
+    when there is no cache or nothing to write.
+    """
+    global _write_behind
+    c = get_cache()
+    if not c or not entries:
+        return None
+    if _write_behind is None:
+        from concurrent.futures import ThreadPoolExecutor
+        _write_behind = ThreadPoolExecutor(max_workers=1, thread_name_prefix="cache-write-behind")
+
+    def _write():
+        for key, value in entries.items():
+            try:
+                c.set(key, value, timeout=timeout)
+            except Exception:
+                pass
+
+    return _write_behind.submit(_write)
+
+def write_behind_flush() -> None:
+    """Wait for the writes queued so far (tests, shutdown)."""
+    if _write_behind is not None:
+        _write_behind.submit(lambda: None).result()
+
+# ---------- Stale-while-revalidate ----------
+
+REVALIDATE_ENV = "sage.revalidate"  # WSGI environ flag of internal refresh requests (clients cannot set it)
+SWR_STATS = {"stale_served": 0, "refreshed": 0, "refresh_failed": 0, "refresh_skipped": 0}
+_revalidator = None
+_revalidating: set = set()
+_revalidating_lock = threading.Lock()
+
+def swr_after_request(resp):
+    """Blueprint hook: mark a response built from stale cache entries and refresh them once."""
+    age = g.pop("swr_age", None)
+    if age is None or resp.status_code != 200:
+        return resp
+    resp.headers["Age"] = str(int(age))
+    resp.headers["Warning"] = '110 - "Response is Stale"'
+    SWR_STATS["stale_served"] += 1
+    _schedule_revalidation()
+    return resp
+
+def swr_after_stream() -> Optional[float]:
+    """
+    swr_after_request for a body streamed after the hook has run (call it from the
+    generator, under stream_with_context): count a stale hit made while streaming
+    and refresh it once. Returns its age in seconds, or None when nothing was stale.
+    """
+    age = g.pop("swr_age", None)
+    if age is None:
+        return None
+    SWR_STATS["stale_served"] += 1
+    _schedule_revalidation()
+    return age
+
+def _schedule_revalidation() -> None:
+    """Replay this request in the background (one refresh per request signature across workers)."""
+    global _revalidator
+    body = request.get_data(cache=True)
+    sig = sha256(b"|".join([request.method.encode(), request.full_path.encode(), body])).hexdigest()[:32]
+    with _revalidating_lock:
+        queued = sig in _revalidating
+        _revalidating.add(sig)
+        if not queued and _revalidator is None:
+            from concurrent.futures import ThreadPoolExecutor
+            _revalidator = ThreadPoolExecutor(
+                max_workers=int(app.config.get("CACHE_REVALIDATE_WORKERS", 1)), thread_name_prefix="cache-revalidate"
+            )
+    if queued:
+        SWR_STATS["refresh_skipped"] += 1
+        return
+    flask_app = app._get_current_object()
+    replay = dict(
+        path=request.path, method=request.method, query_string=request.query_string.decode("latin-1"),
+        data=body, content_type=request.content_type,
+        environ_overrides={REVALIDATE_ENV: True, "REMOTE_ADDR": request.remote_addr or "127.0.0.1"},
+    )
+
+    def _refresh():
+        c = owner = None
+        try:
+            with flask_app.app_context():
+                c = get_cache()
+                owner = c.claim(f"swr|{sig}") if c is not None and hasattr(c, "claim") else "local"
+            if owner is None:  # another worker is refreshing it
+                SWR_STATS["refresh_skipped"] += 1
+                return
+            status = flask_app.test_client().open(**replay, buffered=True).status_code  # streamed bodies run too
+            SWR_STATS["refreshed" if status == 200 else "refresh_failed"] += 1
+        except Exception:
+            SWR_STATS["refresh_failed"] += 1
+            flask_app.logger.exception("stale-while-revalidate refresh failed")
+        finally:
+            if owner not in (None, "local"):
+                c.release(f"swr|{sig}", owner)
+            with _revalidating_lock:
+                _revalidating.discard(sig)
+
+    _revalidator.submit(_refresh)
+
+def revalidate_flush() -> None:
+    """Wait for the refreshes queued so far (tests, shutdown)."""
+    if _revalidator is not None:
+        _revalidator.submit(lambda: None).result()
+
 # ---------- chart_id ↔ inputs mapping ----------
 
 def _cache_key_inputs(cid: str) -> str:
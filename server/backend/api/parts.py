@@ -32,7 +32,14 @@ Exposes (selected):
 All endpoints support either:
   ?chart_id=...    (resolved from cache seeded via /api/v1/chart/id)
 OR raw query:
-  ?dob=YYYY-MM-DD&tob=HH:MM&tz=±HH:MM&lat=..&lon=..[&ayanamsa=lahiri&hsys=P]
+  ?dob=YYYY-MM-DD&tob=HH:MM[:SS]&tz=±HH:MM&lat=..&lon=..[&ayanamsa=lahiri&hsys=P]
+
+Raw inputs are canonicalized first (common.normalize_inputs), so equivalent
+spellings ("+5:30"/"+05:30", "17:30"/"17:30:00") share one chart_id and cache.
+
+/asc, /planets, /charts/rashi, /charts/chalit and /vargas also accept
+?ayanamsas=lahiri,krishnamurti,raman and then add `by_ayanamsa` (one entry
+per name), derived from the same tropical pass.
 """
 
 from __future__ import annotations
@@ -45,10 +52,14 @@ from . import api
 from .common import (
     parse_query_or_id,
     chart_id_for,
+    utc_instant,
     init_swe,
     cache_get,
     cache_set,
+    cache_get_or_set,
+    coalesce,
     set_chart_inputs,
+    parse_ayanamsas,
 )
 
 from astrology.swe_utils import sign_index
@@ -61,6 +72,8 @@ from datetime import datetime
 
 from . import api
 from backend.services.acg_cities import compute_acg_cities
+from backend.services.chart_graph import ChartGraph, ChartInputs, DASHA_SYSTEMS
+from backend.services.engine_versions import engine_version
 from astrology.predictions import generate_predictions
 
 
@@ -110,6 +123,113 @@ def _tz_hours(s: str) -> float:
 def _json_error(msg: str, *, code: int = 400, type_: str = "bad_request"):
     return jsonify({"error": {"type": type_, "message": msg}}), code
 
+def _graph(dob, tob, tz, lat, lon, ayan, hs) -> ChartGraph:
+    """Chart dependency graph for these inputs; nodes are shared across endpoints via the cache."""
+    return ChartGraph(
+        ChartInputs(dob, tob, tz, lat, lon, ayan, hs),
+        chart_id_for(dob, tob, tz, lat, lon, ayan, hs),
+        base_key=chart_id_for(dob, tob, tz, lat, lon, "tropical", hs),
+        sky_key=utc_instant(dob, tob, tz),
+        cache_get=cache_get,
+        cache_set=cache_set,
+        cache_compute=cache_get_or_set,
+    )
+
+def _graphs(dob, tob, tz, lat, lon, ayan, hs, extra: List[str]) -> Dict[str, ChartGraph]:
+    """Graph for `ayan` plus a variant per extra ayanamsa, all sharing one tropical pass."""
+    g = _graph(dob, tob, tz, lat, lon, ayan, hs)
+    out = {ayan: g}
+    for a in extra:
+        if a not in out:
+            out[a] = g.variant(a, chart_id_for(dob, tob, tz, lat, lon, a, hs))
+    return out
+
+def _key(ns: str, dob, tob, tz, lat, lon, ayan, hs, *extra) -> str:
+    """
+    Cache key "ns|<chart_id>[|extra...]|v=<engine version>"; chart_id is the hash
+    of the canonical fingerprint, the version that of the engines behind `ns`.
+    """
+    return "|".join([ns, chart_id_for(dob, tob, tz, lat, lon, ayan, hs), *map(str, extra), f"v={engine_version(ns)}"])
+
+def _ayan_suffix(extra: List[str]) -> str:
+    return f"|ayanamsas={','.join(extra)}" if extra else ""
+
+def _min_planets(planets):
+    return {
+        k: {"lon": v.get("lon"), "speed": v.get("speed"), "retrograde": v.get("retrograde")}
+        for k, v in planets.items()
+    }
+
+# /compute sections whose optional endpoint returns them unchanged under the same name
+_FANOUT_OPTIONAL = ("panchanga", "ashtakavarga", "avasthas", "aspects", "arudha", "kp", "yogas", "upagrahas")
+
+def fanout_entries(
+    dob, tob, tz, lat, lon, ayan, hs, ctx, sections: Dict[str, Any],
+    *, vargas: List[str], varsha_year: int, layout: str = "records",
+) -> Dict[str, Any]:
+    """
+    Cache entries the parts endpoints (and their graph nodes) would write for
+    this chart, built from what /compute already has: its ChartContext and the
+    section values in `sections`. Nothing is computed here. Inputs must be
+    normalized (normalize_inputs), the same values the endpoints compute from.
+    `layout` is the /compute format the dasha section was computed in.
+    """
+    cid = chart_id_for(dob, tob, tz, lat, lon, ayan, hs)
+    g = _graph(dob, tob, tz, lat, lon, ayan, hs)
+
+    def key(ns, *extra):
+        return "|".join([ns, cid, *map(str, extra), f"v={engine_version(ns)}"])
+
+    nodes = {
+        "jd": ctx.jd,
+        "planets": ctx.planets,
+        "houses": (ctx.cusps, ctx.asc_sidereal),
+        "cusps": ctx.cusps,
+        "asc_lon": ctx.asc_sidereal,
+        "asc_idx": ctx.asc_idx,
+        "rashi": ctx.rashi_houses,
+        "chalit": ctx.chalit_houses,
+        "nakshatras": ctx.nakshatras,
+        "chart": ctx.chart,
+        "context": ctx,
+    }
+    out: Dict[str, Any] = {g.cache_key(n): v for n, v in nodes.items() if v is not None}
+    out.update({
+        key("asc"): {"asc": {"lon": ctx.asc_sidereal, "idx": ctx.asc_idx}, "chart_id": cid},
+        key("houses"): {"cusps": ctx.cusps, "asc_sidereal": ctx.asc_sidereal, "chart_id": cid},
+        key("planets"): {"planets": _min_planets(ctx.planets), "chart_id": cid},
+        key("rashi"): {"rashi": ctx.rashi_houses, "asc_idx": ctx.asc_idx, "chart_id": cid},
+        key("chalit"): {"chalit": ctx.chalit_houses, "chart_id": cid},
+    })
+
+    if "table" in sections:
+        out[key("ptable")] = {"table": sections["table"], "chart_id": cid}
+    if "shadbala" in sections:
+        out[key("shadbala")] = {"shadbala": sections["shadbala"], "chart_id": cid}
+    if "dasha" in sections and not any("_error" in (v or {}) for v in sections["dasha"].values()):
+        columnar = layout == "columnar"
+        out[key("dasha", "columnar") if columnar else key("dasha")] = {"dasha": sections["dasha"], "chart_id": cid}
+        node = "dasha_columnar" if columnar else "dasha"
+        out.update({g.cache_key(f"{node}[{s}]"): v for s, v in sections["dasha"].items()})
+    if "charts" in sections:
+        from astrology.vargas import VARGA_NAME
+        maps = sections["charts"]["vargas"]
+        out.update({g.cache_key(f"vargas[{dx}]"): m for dx, m in maps.items() if m is not None})
+        out[key("vargas", ",".join(vargas))] = {
+            "vargas": {dx: maps.get(dx) for dx in vargas if dx in VARGA_NAME}, "chart_id": cid,
+        }
+    if sections.get("varsha") is not None and "varsha_predictions" in sections:
+        out[key("varsha", varsha_year)] = {
+            "varsha": sections["varsha"],
+            "varsha_predictions": sections["varsha_predictions"],
+            "chart_id": cid,
+        }
+    # "acg" is not repeated here: /compute caches it under the sky node key that /acg reads
+    for name in _FANOUT_OPTIONAL:
+        if name in sections:
+            out[key(name)] = {name: sections[name], "chart_id": cid}
+    return out
+
 # ---------- endpoints ----------
 
 @api.get("/chart/id")
@@ -136,25 +256,28 @@ def chart_id():
 def asc():
     try:
         dob, tob, tz, lat, lon, ayan, hs, _cid = parse_query_or_id()
+        extra = parse_ayanamsas(request.args.get("ayanamsas"))
     except ValueError as e:
         return _json_error(str(e), code=400)
 
     init_swe()
-    key = f"asc|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("asc", dob, tob, tz, lat, lon, ayan, hs) + _ayan_suffix(extra)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
 
     try:
-        from astrology.houses import compute_cusps
-    except Exception:
+        graphs = _graphs(dob, tob, tz, lat, lon, ayan, hs, extra)
+        asc_lon = graphs[ayan]["asc_lon"]
+        by_ayan = {a: graphs[a]["asc_lon"] for a in extra}
+    except ImportError:
         return _json_error("astrology package not importable", code=501, type_="missing_dependency")
 
-    tz_h = _tz_hours(tz)
-    _, asc_lon = compute_cusps(datetime.fromisoformat(f"{dob}T{tob}:00"), tz_h, lat, lon, hsys=hs)
     payload = {
         "asc": {"lon": asc_lon, "idx": sign_index(asc_lon)},
         "chart_id": chart_id_for(dob, tob, tz, lat, lon, ayan, hs),
     }
+    if extra:
+        payload["by_ayanamsa"] = {a: {"asc": {"lon": v, "idx": sign_index(v)}} for a, v in by_ayan.items()}
     cache_set(key, payload)
     return jsonify(payload)
 
@@ -167,17 +290,15 @@ def houses():
         return _json_error(str(e), code=400)
 
     init_swe()
-    key = f"houses|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("houses", dob, tob, tz, lat, lon, ayan, hs)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
 
     try:
-        from astrology.houses import compute_cusps
-    except Exception:
+        cusps, asc_lon = _graph(dob, tob, tz, lat, lon, ayan, hs)["houses"]
+    except ImportError:
         return _json_error("astrology package not importable", code=501, type_="missing_dependency")
 
-    tz_h = _tz_hours(tz)
-    cusps, asc_lon = compute_cusps(datetime.fromisoformat(f"{dob}T{tob}:00"), tz_h, lat, lon, hsys=hs)
     payload = {
         "cusps": cusps,
         "asc_sidereal": asc_lon,
@@ -191,26 +312,27 @@ def houses():
 def planets():
     try:
         dob, tob, tz, lat, lon, ayan, hs, _cid = parse_query_or_id()
+        extra = parse_ayanamsas(request.args.get("ayanamsas"))
     except ValueError as e:
         return _json_error(str(e), code=400)
 
     init_swe()
-    key = f"planets|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("planets", dob, tob, tz, lat, lon, ayan, hs) + _ayan_suffix(extra)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
 
     try:
-        from astrology.planets import compute_planets
-    except Exception:
+        graphs = _graphs(dob, tob, tz, lat, lon, ayan, hs, extra)
+        data = graphs[ayan]["planets"]
+        by_ayan = {a: graphs[a].resolve("planets", "nakshatras") for a in extra}
+    except ImportError:
         return _json_error("astrology package not importable", code=501, type_="missing_dependency")
 
-    tz_h = _tz_hours(tz)
-    data = compute_planets(datetime.fromisoformat(f"{dob}T{tob}:00"), tz_h, lat, lon, ayanamsa=ayan)
-    planets_min = {
-        k: {"lon": v.get("lon"), "speed": v.get("speed"), "retrograde": v.get("retrograde")}
-        for k, v in data.items()
-    }
-    payload = {"planets": planets_min, "chart_id": chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
+    payload = {"planets": _min_planets(data), "chart_id": chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
+    if extra:
+        payload["by_ayanamsa"] = {
+            a: {"planets": _min_planets(n["planets"]), "nakshatras": n["nakshatras"]} for a, n in by_ayan.items()
+        }
     cache_set(key, payload)
     return jsonify(payload)
 
@@ -219,31 +341,29 @@ def planets():
 def charts_rashi():
     try:
         dob, tob, tz, lat, lon, ayan, hs, _cid = parse_query_or_id()
+        extra = parse_ayanamsas(request.args.get("ayanamsas"))
     except ValueError as e:
         return _json_error(str(e), code=400)
 
     init_swe()
-    key = f"rashi|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("rashi", dob, tob, tz, lat, lon, ayan, hs) + _ayan_suffix(extra)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
 
     try:
-        from astrology.planets import compute_planets
-        from astrology.houses import compute_cusps
-        from astrology.charts import rashi_from_longitudes
-    except Exception:
+        graphs = _graphs(dob, tob, tz, lat, lon, ayan, hs, extra)
+        n = graphs[ayan].resolve("rashi", "asc_idx")
+        by_ayan = {a: graphs[a].resolve("rashi", "asc_idx") for a in extra}
+    except ImportError:
         return _json_error("astrology package not importable", code=501, type_="missing_dependency")
 
-    tz_h = _tz_hours(tz)
-    dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-    p = compute_planets(dt, tz_h, lat, lon, ayanamsa=ayan)
-    _, asc_lon = compute_cusps(dt, tz_h, lat, lon, hsys=hs)
-    rashi = rashi_from_longitudes(p, sign_index(asc_lon))
     payload = {
-        "rashi": rashi,
-        "asc_idx": sign_index(asc_lon),
+        "rashi": n["rashi"],
+        "asc_idx": n["asc_idx"],
         "chart_id": chart_id_for(dob, tob, tz, lat, lon, ayan, hs),
     }
+    if extra:
+        payload["by_ayanamsa"] = by_ayan
     cache_set(key, payload)
     return jsonify(payload)
 
@@ -252,27 +372,25 @@ def charts_rashi():
 def charts_chalit():
     try:
         dob, tob, tz, lat, lon, ayan, hs, _cid = parse_query_or_id()
+        extra = parse_ayanamsas(request.args.get("ayanamsas"))
     except ValueError as e:
         return _json_error(str(e), code=400)
 
     init_swe()
-    key = f"chalit|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("chalit", dob, tob, tz, lat, lon, ayan, hs) + _ayan_suffix(extra)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
 
     try:
-        from astrology.planets import compute_planets
-        from astrology.houses import compute_cusps
-        from astrology.charts import chalit_from_longitudes
-    except Exception:
+        graphs = _graphs(dob, tob, tz, lat, lon, ayan, hs, extra)
+        chalit = graphs[ayan]["chalit"]
+        by_ayan = {a: {"chalit": graphs[a]["chalit"]} for a in extra}
+    except ImportError:
         return _json_error("astrology package not importable", code=501, type_="missing_dependency")
 
-    tz_h = _tz_hours(tz)
-    dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-    p = compute_planets(dt, tz_h, lat, lon, ayanamsa=ayan)
-    cusps, _ = compute_cusps(dt, tz_h, lat, lon, hsys=hs)
-    chalit = chalit_from_longitudes(p, cusps)
     payload = {"chalit": chalit, "chart_id": chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
+    if extra:
+        payload["by_ayanamsa"] = by_ayan
     cache_set(key, payload)
     return jsonify(payload)
 
@@ -282,6 +400,7 @@ def vargas():
     """Vargas maps (Dx → {asc_idx, houses}); ?vargas=D9,D10 (default)."""
     try:
         dob, tob, tz, lat, lon, ayan, hs, _cid = parse_query_or_id()
+        extra = parse_ayanamsas(request.args.get("ayanamsas"))
     except ValueError as e:
         return _json_error(str(e), code=400)
 
@@ -289,21 +408,24 @@ def vargas():
     wanted_list = [s.strip().upper() for s in wanted.split(",") if s.strip()]
 
     init_swe()
-    key = f"vargas|{wanted}|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("vargas", dob, tob, tz, lat, lon, ayan, hs, ",".join(wanted_list)) + _ayan_suffix(extra)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
 
     try:
-        from astrology.planets import compute_planets
-        from astrology.vargas import compute_vargas
-    except Exception:
+        from astrology.vargas import VARGA_NAME
+        graphs = _graphs(dob, tob, tz, lat, lon, ayan, hs, extra)
+        # one node per Dx, so D9 computed for "D9,D10" is reused by "D9,D60"
+        def _maps(g):
+            return {dx: g[f"vargas[{dx}]"] for dx in wanted_list if dx in VARGA_NAME}
+        varga_maps = _maps(graphs[ayan])
+        by_ayan = {a: {"vargas": _maps(graphs[a])} for a in extra}
+    except ImportError:
         return _json_error("astrology package not importable", code=501, type_="missing_dependency")
 
-    tz_h = _tz_hours(tz)
-    dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-    p = compute_planets(dt, tz_h, lat, lon, ayanamsa=ayan)
-    varga_maps = compute_vargas(p, wanted_list)  # -> {Dx:{asc_idx,houses}}
     payload = {"vargas": varga_maps, "chart_id": chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
+    if extra:
+        payload["by_ayanamsa"] = by_ayan
     cache_set(key, payload)
     return jsonify(payload)
 
@@ -317,22 +439,17 @@ def table_planets():
         return _json_error(str(e), code=400)
 
     init_swe()
-    key = f"ptable|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("ptable", dob, tob, tz, lat, lon, ayan, hs)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
 
     try:
-        from astrology.planets import compute_planets
-        from astrology.houses import compute_cusps
         from astrology.formatting import build_planet_table
-    except Exception:
+        n = _graph(dob, tob, tz, lat, lon, ayan, hs).resolve("planets", "asc_idx")
+    except ImportError:
         return _json_error("astrology package not importable", code=501, type_="missing_dependency")
 
-    tz_h = _tz_hours(tz)
-    dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-    p = compute_planets(dt, tz_h, lat, lon, ayanamsa=ayan)
-    _, asc_lon = compute_cusps(dt, tz_h, lat, lon, hsys=hs)
-    table = build_planet_table(p, sign_index(asc_lon))
+    table = build_planet_table(n["planets"], n["asc_idx"])
     payload = {"table": table, "chart_id": chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
     cache_set(key, payload)
     return jsonify(payload)
@@ -347,23 +464,19 @@ def shadbala():
         return _json_error(str(e), code=400)
 
     init_swe()
-    key = f"shadbala|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("shadbala", dob, tob, tz, lat, lon, ayan, hs)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
 
     try:
-        from astrology.planets import compute_planets
-        from astrology.houses import compute_cusps
         from astrology.shadbala import compute_shadbala
-    except Exception:
+        g = _graph(dob, tob, tz, lat, lon, ayan, hs)
+        n = g.resolve("chart", "asc_idx", "chalit")
+    except ImportError:
         return _json_error("astrology package not importable", code=501, type_="missing_dependency")
 
-    tz_h = _tz_hours(tz)
-    dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-    p = compute_planets(dt, tz_h, lat, lon, ayanamsa=ayan)
-    _, asc_lon = compute_cusps(dt, tz_h, lat, lon, hsys=hs)
-    asc_idx = sign_index(asc_lon)
-    sb = compute_shadbala(p, asc_idx, None, local_hour=dt.hour)
+    # same inputs as /compute (chalit houses drive dig bala)
+    sb = compute_shadbala(n["chart"], n["asc_idx"], n["chalit"], local_hour=g.inputs.dt_local.hour)
     payload = {"shadbala": sb, "chart_id": chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
     cache_set(key, payload)
     return jsonify(payload)
@@ -371,38 +484,34 @@ def shadbala():
 
 @api.get("/dasha")
 def dasha():
-    """Dasha systems (Vimshottari, Yogini, Ashtottari, Kalachakra)."""
+    """Dasha systems (Vimshottari, Yogini, Ashtottari, Kalachakra); ?format=columnar for array timelines."""
     try:
         dob, tob, tz, lat, lon, ayan, hs, _cid = parse_query_or_id()
     except ValueError as e:
         return _json_error(str(e), code=400)
 
+    layout = request.args.get("format", "records")
+    if layout not in ("records", "columnar"):
+        return _json_error("format must be records or columnar", code=400)
+
     init_swe()
-    key = f"dasha|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    columnar = layout == "columnar"
+    key = _key("dasha", dob, tob, tz, lat, lon, ayan, hs, *(("columnar",) if columnar else ()))
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
 
     try:
-        from astrology.planets import compute_planets
-        from astrology.dasha import (
-            compute_vimsottari, compute_yogini, compute_ashtottari, compute_kalachakra
-        )
-    except Exception:
+        g = _graph(dob, tob, tz, lat, lon, ayan, hs)
+        moon_lon = g["planets"].get("Moon", {}).get("lon")
+        if moon_lon is None:
+            return _json_error("Moon longitude unavailable for dasha", code=422, type_="unprocessable")
+        node = "dasha_columnar" if columnar else "dasha"
+        dasha_map = {system: g[f"{node}[{system}]"] for system in DASHA_SYSTEMS}
+    except ImportError:
         return _json_error("astrology package not importable", code=501, type_="missing_dependency")
 
-    tz_h = _tz_hours(tz)
-    dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-    moon_lon = compute_planets(dt, tz_h, lat, lon, ayanamsa=ayan).get("Moon", {}).get("lon")
-    if moon_lon is None:
-        return _json_error("Moon longitude unavailable for dasha", code=422, type_="unprocessable")
-
     payload = {
-        "dasha": {
-            "Vimshottari": compute_vimsottari(dt, tz_h, moon_lon),
-            "Yogini":      compute_yogini(dt, tz_h, moon_lon),
-            "Ashtottari":  compute_ashtottari(dt, tz_h, moon_lon),
-            "Kalachakra":  compute_kalachakra(dt, tz_h, moon_lon),
-        },
+        "dasha": dasha_map,
         "chart_id": chart_id_for(dob, tob, tz, lat, lon, ayan, hs),
     }
     cache_set(key, payload)
@@ -423,7 +532,7 @@ def varsha():
     varsha_year = request.args.get("varsha_year", type=int)
     varsha_year = varsha_year if varsha_year is not None else (local_now.year + 1)
 
-    key = f"varsha|{varsha_year}|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("varsha", dob, tob, tz, lat, lon, ayan, hs, varsha_year)
     print(key)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
@@ -433,7 +542,7 @@ def varsha():
     except Exception:
         return _json_error("astrology package not importable", code=501, type_="missing_dependency")
 
-    dt = datetime.fromisoformat(f"{dob}T{tob}:00")
+    dt = datetime.fromisoformat(f"{dob}T{tob}")
     try:
         v = compute_varshaphala(dt, tz_h, lat, lon, year=int(varsha_year))
     except Exception as e:
@@ -459,28 +568,22 @@ def varsha():
 
 @api.get("/acg")
 def acg():
-    """Astrocartography lines + advice."""
+    """Astrocartography lines + advice (?format=columnar: ASC/DSC curves as lat/lon arrays)."""
     try:
         dob, tob, tz, lat, lon, ayan, hs, _cid = parse_query_or_id()
     except ValueError as e:
         return _json_error(str(e), code=400)
+    layout = request.args.get("format", "records")
+    if layout not in ("records", "columnar"):
+        return _json_error("format must be records or columnar", code=400)
 
     init_swe()
-    key = f"acg|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
-    if (hit := cache_get(key)) is not None:
-        return jsonify(hit)
-
     try:
-        from astrology.astrocartography import compute_astrocartography
-    except Exception:
+        # the lines depend on the instant only: cached once per UTC instant, for every place
+        acg_obj = _graph(dob, tob, tz, lat, lon, ayan, hs)["acg" if layout == "records" else "acg_columnar"]
+    except ImportError:
         return _json_error("astrology package not importable", code=501, type_="missing_dependency")
-
-    tz_h = _tz_hours(tz)
-    dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-    acg_obj = compute_astrocartography(dt, tz_h)
-    payload = {"acg": acg_obj, "chart_id": chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
-    cache_set(key, payload)
-    return jsonify(payload)
+    return jsonify({"acg": acg_obj, "chart_id": chart_id_for(dob, tob, tz, lat, lon, ayan, hs)})
 
 
 @api.get("/symbols")
@@ -502,7 +605,7 @@ def panchanga():
     except ValueError as e:
         return _json_error(str(e), code=400)
     init_swe()
-    key = f"panchanga|{cid}" if cid else f"panchanga|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("panchanga", dob, tob, tz, lat, lon, ayan, hs)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
     fn = _imp_first([
@@ -513,7 +616,7 @@ def panchanga():
     if not fn:
         return _json_error("panchanga not available", code=501, type_="missing_dependency")
     tz_h = _tz_hours(tz)
-    dt = datetime.fromisoformat(f"{dob}T{tob}:00")
+    dt = datetime.fromisoformat(f"{dob}T{tob}")
     data = fn(dt, tz_h, lat, lon)
     payload = {"panchanga": data, "chart_id": cid or chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
     cache_set(key, payload)
@@ -527,20 +630,15 @@ def ashtakavarga():
     except ValueError as e:
         return _json_error(str(e), code=400)
     init_swe()
-    key = f"ashtakavarga|{cid}" if cid else f"ashtakavarga|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("ashtakavarga", dob, tob, tz, lat, lon, ayan, hs)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
     try:
-        from astrology.planets import compute_planets
-        from astrology.houses import compute_cusps
         from astrology.ashtakavarga import compute_ashtakavarga
-    except Exception:
+        n = _graph(dob, tob, tz, lat, lon, ayan, hs).resolve("planets", "asc_idx")
+    except ImportError:
         return _json_error("ashtakavarga not available", code=501, type_="missing_dependency")
-    tz_h = _tz_hours(tz); dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-    planets = compute_planets(dt, tz_h, lat, lon, ayanamsa=ayan)
-    _, asc_lon = compute_cusps(dt, tz_h, lat, lon, hsys=hs)
-    asc_idx = sign_index(asc_lon)
-    data = compute_ashtakavarga(planets, asc_idx)
+    data = compute_ashtakavarga(n["planets"], n["asc_idx"])
     payload = {"ashtakavarga": data, "chart_id": cid or chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
     cache_set(key, payload)
     return jsonify(payload)
@@ -553,23 +651,15 @@ def yogas():
     except ValueError as e:
         return _json_error(str(e), code=400)
     init_swe()
-    key = f"yogas|{cid}" if cid else f"yogas|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("yogas", dob, tob, tz, lat, lon, ayan, hs)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
     try:
-        from astrology.planets import compute_planets
-        from astrology.houses import compute_cusps
-        from astrology.charts import chalit_from_longitudes
         from astrology.yogas import compute_yogas
-    except Exception:
+        n = _graph(dob, tob, tz, lat, lon, ayan, hs).resolve("planets", "asc_idx", "chalit")
+    except ImportError:
         return _json_error("yogas not available", code=501, type_="missing_dependency")
-    tz_h = _tz_hours(tz); dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-    p = compute_planets(dt, tz_h, lat, lon, ayanamsa=ayan)
-    cusps, _ = compute_cusps(dt, tz_h, lat, lon, hsys=hs)
-    chalit = chalit_from_longitudes(p, cusps)
-    # asc index from ascendant lon
-    asc_idx = sign_index(cusps[0]) if isinstance(cusps,(list,tuple)) and len(cusps)>0 else 0
-    data = compute_yogas(p, asc_idx, chalit)
+    data = compute_yogas(n["planets"], n["asc_idx"], n["chalit"])
     payload = {"yogas": data, "chart_id": cid or chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
     cache_set(key, payload)
     return jsonify(payload)
@@ -582,22 +672,15 @@ def avasthas():
     except ValueError as e:
         return _json_error(str(e), code=400)
     init_swe()
-    key = f"avasthas|{cid}" if cid else f"avasthas|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("avasthas", dob, tob, tz, lat, lon, ayan, hs)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
     try:
-        from astrology.planets import compute_planets
-        from astrology.houses import compute_cusps
-        from astrology.charts import chalit_from_longitudes
         from astrology.avasthas import compute_avasthas
-    except Exception:
+        n = _graph(dob, tob, tz, lat, lon, ayan, hs).resolve("planets", "asc_idx", "chalit")
+    except ImportError:
         return _json_error("avasthas not available", code=501, type_="missing_dependency")
-    tz_h = _tz_hours(tz); dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-    p = compute_planets(dt, tz_h, lat, lon, ayanamsa=ayan)
-    cusps, _ = compute_cusps(dt, tz_h, lat, lon, hsys=hs)
-    chalit = chalit_from_longitudes(p, cusps)
-    asc_idx = sign_index(cusps[0]) if isinstance(cusps,(list,tuple)) and len(cusps)>0 else 0
-    data = compute_avasthas(p, asc_idx, chalit)
+    data = compute_avasthas(n["planets"], n["asc_idx"], n["chalit"])
     payload = {"avasthas": data, "chart_id": cid or chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
     cache_set(key, payload)
     return jsonify(payload)
@@ -610,22 +693,15 @@ def aspects():
     except ValueError as e:
         return _json_error(str(e), code=400)
     init_swe()
-    key = f"aspects|{cid}" if cid else f"aspects|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("aspects", dob, tob, tz, lat, lon, ayan, hs)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
     try:
-        from astrology.planets import compute_planets
-        from astrology.houses import compute_cusps
-        from astrology.charts import chalit_from_longitudes
         from astrology.aspects import compute_aspects
-    except Exception:
+        n = _graph(dob, tob, tz, lat, lon, ayan, hs).resolve("chart", "asc_idx", "chalit")
+    except ImportError:
         return _json_error("aspects not available", code=501, type_="missing_dependency")
-    tz_h = _tz_hours(tz); dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-    p = compute_planets(dt, tz_h, lat, lon, ayanamsa=ayan)
-    cusps, _ = compute_cusps(dt, tz_h, lat, lon, hsys=hs)
-    chalit = chalit_from_longitudes(p, cusps)
-    asc_idx = sign_index(cusps[0]) if isinstance(cusps,(list,tuple)) and len(cusps)>0 else 0
-    data = compute_aspects(p, asc_idx, chalit)
+    data = compute_aspects(n["chart"], n["asc_idx"], n["chalit"])
     payload = {"aspects": data, "chart_id": cid or chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
     cache_set(key, payload)
     return jsonify(payload)
@@ -638,7 +714,7 @@ def upagrahas():
     except ValueError as e:
         return _json_error(str(e), code=400)
     init_swe()
-    key = f"upagrahas|{cid}" if cid else f"upagrahas|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("upagrahas", dob, tob, tz, lat, lon, ayan, hs)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
     fn = _imp_first([
@@ -647,7 +723,7 @@ def upagrahas():
     ])
     if not fn:
         return _json_error("upagrahas not available", code=501, type_="missing_dependency")
-    tz_h = _tz_hours(tz); dt = datetime.fromisoformat(f"{dob}T{tob}:00")
+    tz_h = _tz_hours(tz); dt = datetime.fromisoformat(f"{dob}T{tob}")
     data = fn(dt, tz_h, lat, lon)
     payload = {"upagrahas": data, "chart_id": cid or chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
     cache_set(key, payload)
@@ -661,21 +737,15 @@ def bhava_bala():
     except ValueError as e:
         return _json_error(str(e), code=400)
     init_swe()
-    key = f"bhavabala|{cid}" if cid else f"bhavabala|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("bhavabala", dob, tob, tz, lat, lon, ayan, hs)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
     try:
-        from astrology.planets import compute_planets
-        from astrology.houses import compute_cusps
-        from astrology.charts import chalit_from_longitudes
         from astrology.bhava_bala import compute_bhava_bala
-    except Exception:
+        n = _graph(dob, tob, tz, lat, lon, ayan, hs).resolve("chart", "chalit")
+    except ImportError:
         return _json_error("bhava_bala not available", code=501, type_="missing_dependency")
-    tz_h = _tz_hours(tz); dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-    p = compute_planets(dt, tz_h, lat, lon, ayanamsa=ayan)
-    cusps, _ = compute_cusps(dt, tz_h, lat, lon, hsys=hs)
-    chalit = chalit_from_longitudes(p, cusps)
-    data = compute_bhava_bala(p, chalit)
+    data = compute_bhava_bala(n["chart"], n["chalit"])
     payload = {"bhava_bala": data, "chart_id": cid or chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
     cache_set(key, payload)
     return jsonify(payload)
@@ -688,22 +758,15 @@ def arudha():
     except ValueError as e:
         return _json_error(str(e), code=400)
     init_swe()
-    key = f"arudha|{cid}" if cid else f"arudha|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("arudha", dob, tob, tz, lat, lon, ayan, hs)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
     try:
-        from astrology.planets import compute_planets
-        from astrology.houses import compute_cusps
-        from astrology.charts import chalit_from_longitudes
         from astrology.arudha import compute_arudha
-    except Exception:
+        n = _graph(dob, tob, tz, lat, lon, ayan, hs).resolve("chart", "asc_idx", "chalit")
+    except ImportError:
         return _json_error("arudha not available", code=501, type_="missing_dependency")
-    tz_h = _tz_hours(tz); dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-    p = compute_planets(dt, tz_h, lat, lon, ayanamsa=ayan)
-    cusps, _ = compute_cusps(dt, tz_h, lat, lon, hsys=hs)
-    chalit = chalit_from_longitudes(p, cusps)
-    asc_idx = sign_index(cusps[0]) if isinstance(cusps,(list,tuple)) and len(cusps)>0 else 0
-    data = compute_arudha(p, asc_idx, chalit)
+    data = compute_arudha(n["chart"], n["asc_idx"], n["chalit"])
     payload = {"arudha": data, "chart_id": cid or chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
     cache_set(key, payload)
     return jsonify(payload)
@@ -716,19 +779,15 @@ def kp():
     except ValueError as e:
         return _json_error(str(e), code=400)
     init_swe()
-    key = f"kp|{cid}" if cid else f"kp|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("kp", dob, tob, tz, lat, lon, ayan, hs)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
     try:
-        from astrology.planets import compute_planets
-        from astrology.houses import compute_cusps
         from astrology.kp import compute_kp_significators
-    except Exception:
+        n = _graph(dob, tob, tz, lat, lon, ayan, hs).resolve("planets", "cusps")
+    except ImportError:
         return _json_error("kp not available", code=501, type_="missing_dependency")
-    tz_h = _tz_hours(tz); dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-    p = compute_planets(dt, tz_h, lat, lon, ayanamsa=ayan)
-    cusps, _ = compute_cusps(dt, tz_h, lat, lon, hsys=hs)
-    data = compute_kp_significators(p, cusps)
+    data = compute_kp_significators(n["planets"], n["cusps"])
     payload = {"kp": data, "chart_id": cid or chart_id_for(dob, tob, tz, lat, lon, ayan, hs)}
     cache_set(key, payload)
     return jsonify(payload)
@@ -752,28 +811,21 @@ def grahas():
         return _json_error(str(e), code=400)
 
     init_swe()
-    key = f"grahas|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("grahas", dob, tob, tz, lat, lon, ayan, hs)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
 
     try:
-        from astrology.planets import compute_planets
-        from astrology.houses import compute_cusps
-        from astrology.charts import chalit_from_longitudes
-    except Exception:
+        n = _graph(dob, tob, tz, lat, lon, ayan, hs).resolve("planets", "asc_idx", "chalit")
+    except ImportError:
         return _json_error("astrology package not importable", code=501, type_="missing_dependency")
 
-    tz_h = _tz_hours(tz)
-    dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-
-    planets = compute_planets(dt, tz_h, lat, lon, ayanamsa=ayan)
-    cusps, asc_lon = compute_cusps(dt, tz_h, lat, lon, hsys=hs)
-    asc_idx = sign_index(asc_lon)
+    planets, asc_idx = n["planets"], n["asc_idx"]
 
     # chalit → to derive house number per planet
     house_by_planet = {}
     try:
-        chalit = chalit_from_longitudes(planets, cusps)  # 12 buckets of planet names
+        chalit = n["chalit"]  # 12 buckets of planet names
         for i, bucket in enumerate(chalit, start=1):
             for name in bucket:
                 house_by_planet[name] = i
@@ -901,7 +953,7 @@ def varsha_details():
     varsha_year = request.args.get("varsha_year", type=int)
     varsha_year = varsha_year if varsha_year is not None else (local_now.year + 1)
 
-    key = f"varsha_details|{varsha_year}|{dob}|{tob}|{tz}|{lat:.6f}|{lon:.6f}|{ayan}|{hs}"
+    key = _key("varsha_details", dob, tob, tz, lat, lon, ayan, hs, varsha_year)
     if (hit := cache_get(key)) is not None:
         return jsonify(hit)
 
@@ -910,7 +962,7 @@ def varsha_details():
     except Exception:
         return _json_error("astrology varshaphala not available", code=501, type_="missing_dependency")
 
-    dt = datetime.fromisoformat(f"{dob}T{tob}:00")
+    dt = datetime.fromisoformat(f"{dob}T{tob}")
     v = None
     try:
         v = compute_varshaphala(dt, tz_h, lat, lon, varsha_year=int(varsha_year))
@@ -1018,25 +1070,24 @@ def acg_cities():
         top_k, max_km, want_reloc = 3, 400.0, False
 
     init_swe()
-    cache_key = f"acg_cities|{dob}|{tob}|{tz}|{ayan}|{hs}|{top_k}|{max_km}|{int(want_reloc)}"
-    cached = cache_get(cache_key)
-    if cached is not None:
-        return jsonify(cached)
-
-    dt = datetime.fromisoformat(f"{dob}T{tob}:00")
-    tz_h = _tz_hours(tz)
-
-    cities = compute_acg_cities(
-        dt, tz_h,
-        top_k=top_k,
-        max_km=max_km,
-        relocation=want_reloc,
-    )
+    # ACG lines depend on the instant only, not on the birth place or ayanamsa
+    cache_key = (f"acg_cities|{utc_instant(dob, tob, tz)}|{top_k}|{max_km}|{int(want_reloc)}"
+                 f"|v={engine_version('acg_cities')}")
+
+    def _compute():
+        g = _graph(dob, tob, tz, lat, lon, ayan, hs)
+        return compute_acg_cities(
+            g.inputs.dt_local, g.inputs.tz_hours,
+            top_k=top_k,
+            max_km=max_km,
+            relocation=want_reloc,
+            acg=g["acg"],  # shared with /acg and /compute for the same instant
+        )
 
-    payload = {
-        "cities": cities,
-        "chart_id": cid or chart_id_for(dob, tob, tz, lat, lon, ayan, hs),
-    }
-    cache_set(cache_key, payload, timeout=600)
-    return jsonify(payload)
+    # identical concurrent requests (a shared link) share one computation
+    cities, outcome = coalesce("acg_cities", cache_key, _compute, timeout=600)
+    resp = jsonify({"cities": cities, "chart_id": cid or chart_id_for(dob, tob, tz, lat, lon, ayan, hs)})
+    if outcome == "coalesced":
+        resp.headers["X-Coalesced"] = "1"
+    return resp
 
@@ -2,8 +2,10 @@
 backend/api/v1.py — Versioned API endpoints
 
 Exposes:
-- GET  /api/v1/health     : quick service ping
-- POST /api/v1/compute    : returns a comprehensive astrology payload (JSON)
+- GET  /api/v1/health       : quick service ping
+- GET  /api/v1/cache/stats  : per-worker cache, coalescing and memoization counters
+- POST /api/v1/compute      : returns a comprehensive astrology payload (JSON)
+- POST /api/v1/compute/batch: many /compute requests in, one NDJSON line per chart out
 
 Design notes:
 - Input validation with Pydantic → consistent 400s for bad input.
@@ -13,7 +15,11 @@ Design notes:
 """
 
 from __future__ import annotations
-from typing import Any, Dict, List
+import json
+import os
+import threading
+from hashlib import sha256
+from typing import Any, Dict, Iterator, List, Literal, Tuple
 from datetime import datetime, timedelta
 
 from flask import request, jsonify
@@ -33,6 +39,10 @@ class ComputeRequest(BaseModel):
     lon: float
     varsha_year: int | None = None
     vargas: List[str] | None = None
+    ayanamsas: List[str] | None = None  # extra sidereal variants, e.g. ["krishnamurti", "raman"]
+    include: List[str] | None = None    # sections to return (default: all)
+    exclude: List[str] | None = None    # sections to leave out
+    format: Literal["records", "columnar"] = "records"  # columnar: ACG curves and dasha timelines as arrays
 
     @field_validator("lat")
     @classmethod
@@ -48,6 +58,40 @@ class ComputeRequest(BaseModel):
             raise ValueError("lon out of range [-180, 180]")
         return v
 
+    @field_validator("dob")
+    @classmethod
+    def _dob(cls, v: str) -> str:
+        datetime.fromisoformat(v)
+        return v
+
+    @field_validator("tob")
+    @classmethod
+    def _tob(cls, v: str) -> str:
+        from .common import canonical_tob
+        canonical_tob(v)  # HH:MM or HH:MM:SS
+        return v
+
+    @field_validator("tz")
+    @classmethod
+    def _tz(cls, v: str) -> str:
+        from .common import canonical_tz
+        canonical_tz(v)  # "+05:30", "+5:30", "5.5", ...
+        return v
+
+    @field_validator("ayanamsas", mode="before")
+    @classmethod
+    def _ayanamsas(cls, v):
+        # accept "lahiri,raman" as well as a list
+        from .common import parse_ayanamsas
+        return parse_ayanamsas(v) if v is not None else None
+
+    @field_validator("include", "exclude", mode="before")
+    @classmethod
+    def _sections(cls, v):
+        # accept "table,charts" as well as a list
+        from backend.services.sections import parse_section_names
+        return parse_section_names(v) if v is not None else None
+
 
 # --------- Utilities ---------
 def _bad_request(msg: str, *, field: str | None = None, extra: dict | None = None):
@@ -90,6 +134,24 @@ def health():
     return jsonify({"ok": True, "service": "sage-astro-api", "version": "1.0.0"})
 
 
+@api.get("/cache/stats")
+def cache_stats():
+    """This worker's cache, coalescing, stale-while-revalidate and memoization counters, and the engine versions."""
+    from infra.caching import memo_stats
+    from backend.services.engine_versions import engine_versions
+    from .common import COALESCE_STATS, SWR_STATS, get_cache
+    c = get_cache()
+    return jsonify({
+        "pid": os.getpid(),
+        "cache": dict(getattr(c, "stats", {}) or {}),
+        "namespaces": c.ns_stats() if hasattr(c, "ns_stats") else {},
+        "coalesce": COALESCE_STATS,
+        "stale_while_revalidate": SWR_STATS,
+        "memo": memo_stats(),
+        "engines": engine_versions(),
+    })
+
+
 @api.post("/compute")
 def compute():
     """
@@ -104,22 +166,61 @@ def compute():
       "lat": 26.7606,
       "lon": 83.3732,
       "vargas": ["D9", "D10"],
-      "varsha_year": 2027
+      "varsha_year": 2027,
+      "ayanamsas": ["krishnamurti", "raman"],
+      "include": ["table", "charts", "dasha"]
     }
+
+    `format` (body or ?format=): "columnar" has the engines emit the ACG
+    ASC/DSC curves as {"lat": [...], "lon": [...]} and the dasha timelines as
+    arrays with epoch-second boundaries; "records" (default) is the dict form.
+
+    With `ayanamsas`, the response adds `by_ayanamsa`: asc, planets,
+    nakshatras and rashi/chalit/varga charts per ayanamsa, all derived from
+    the same tropical pass.
+
+    `include` / `exclude` narrow the sections returned (see SECTION_COST in
+    backend/services/sections.py). Sections are thunks: one that is not
+    returned, and not read by a returned one, is never computed.
     """
     # ---- Validate input with Pydantic ----
     try:
-        req = ComputeRequest.model_validate(request.get_json(force=True))
+        body = request.get_json(force=True)
+        if "format" in request.args and isinstance(body, dict):
+            body = {**body, "format": request.args["format"]}
+        req = ComputeRequest.model_validate(body)
     except ValidationError as e:
-        return jsonify({
-            "error": {"type": "validation", "status": 400, "message": "Bad input", "detail": e.errors()}
-        }), 400
+        return jsonify({"error": _validation_error(e)}), 400
 
     app.logger.info(
         "compute start reqid=%s lat=%.6f lon=%.6f dob=%s tob=%s tz=%s",
         getattr(g, "reqid", "-"), req.lat, req.lon, req.dob, req.tob, req.tz
     )
 
+    failure = _init_engines()
+    if failure is not None:
+        return failure
+
+    payload, cache_status, outcome = _compute_one(req)
+
+    app.logger.info("compute done reqid=%s outcome=%s", getattr(g, "reqid", "-"), outcome)
+    # large payloads (ACG lines, full dasha timelines) are streamed rather than built as one string
+    from backend.services.json_stream import json_response
+    resp = json_response(payload, stream_min_bytes=int(app.config.get("COMPUTE_STREAM_MIN_BYTES", 256 * 1024)))
+    # per-section cache outcome, e.g. "table=hit, varsha=miss" (for TTL tuning)
+    if cache_status:
+        resp.headers["X-Compute-Cache"] = ", ".join(f"{n}={v}" for n, v in cache_status.items())
+    if outcome == "coalesced":
+        resp.headers["X-Coalesced"] = "1"
+    return resp
+
+
+def _validation_error(e: ValidationError) -> Dict[str, Any]:
+    return {"type": "validation", "status": 400, "message": "Bad input", "detail": e.errors(include_context=False)}
+
+
+def _init_engines():
+    """None once Swiss Ephemeris is initialized and the core engines import, else a 501 response."""
     # ---- Swiss Ephemeris init from config ----
     try:
         from astrology import swe_utils as su
@@ -135,13 +236,10 @@ def compute():
 
     # ---- Core engine imports (strict, will 501 if missing) ----
     try:
-        from astrology.planets import compute_planets
-        from astrology.houses import compute_cusps
-        from astrology.charts import rashi_from_longitudes, chalit_from_longitudes
+        from astrology.context import ChartContext
         from astrology.vargas import compute_vargas
         from astrology.symbols import SIGN_NAMES, SIGN_SYMBOLS
         from astrology.formatting import build_planet_table
-        from astrology.swe_utils import sign_index
         from astrology.dasha import (
             compute_vimsottari, compute_yogini, compute_ashtottari, compute_kalachakra
         )
@@ -158,63 +256,339 @@ def compute():
                 "detail": str(e),
             }
         }), 501
+    return None
 
-    # ---- Core compute ----
-    tz_hours = _parse_tz_to_hours(req.tz)
-    dt_local = datetime.fromisoformat(f"{req.dob}T{req.tob}:00")
 
-    planets = compute_planets(dt_local, tz_hours, req.lat, req.lon, ayanamsa=app.config.get("SIDEREAL_AYANAMSA","lahiri"))
-    cusps, asc_sidereal = compute_cusps(dt_local, tz_hours, req.lat, req.lon, hsys="P")
+def _compute_one(
+    req: ComputeRequest, shared: Dict[float, dict] | None = None
+) -> Tuple[Dict[str, Any], Dict[str, str], str]:
+    """
+    (payload, per-section cache status, outcome) for one request; engines must be
+    initialized. `shared` is the tropical_memo of the charts computed together.
+    """
+    # ---- Core compute, coalesced: identical concurrent requests share one computation ----
+    from .common import chart_id_for, coalesce
+    cid = chart_id_for(req.dob, req.tob, req.tz, req.lat, req.lon,
+                       app.config.get("SIDEREAL_AYANAMSA", "lahiri"), "P")
+    fingerprint = sha256(json.dumps(req.model_dump(), sort_keys=True).encode()).hexdigest()[:16]
+    flight_ttl = int(app.config.get("COMPUTE_COALESCE_TTL", 30))
+    if flight_ttl > 0:
+        # a payload with timeout fallbacks is shared with the waiters but not kept for later requests
+        (payload, cache_status, fallbacks), outcome = coalesce(
+            "compute", f"flight|compute|{cid}|{fingerprint}", lambda: _build_payload(req, shared), timeout=flight_ttl,
+            keep=lambda built: not built[2],
+        )
+    else:
+        (payload, cache_status, fallbacks), outcome = _build_payload(req, shared), "computed"
+    if outcome != "computed" and cache_status:
+        # nothing was computed for this request: every section came from the shared result
+        cache_status = {n: "omitted" if v == "omitted" else "hit" for n, v in cache_status.items()}
+    return payload, cache_status, outcome
 
-    asc_idx = sign_index(asc_sidereal)
-    rashi_houses  = rashi_from_longitudes(planets, asc_idx)
-    chalit_houses = chalit_from_longitudes(planets, cusps)
-    varga_maps = compute_vargas(planets, _normalize_vargas(req.vargas))
+# --------- Progressive ---------
+def _sse(event: str, data: Dict[str, Any], event_id: int, flask_app) -> str:
+    return f"event: {event}\nid: {event_id}\ndata: {flask_app.json.dumps(data)}\n\n"
 
-    # Tables & strengths
-    table = build_planet_table(planets, asc_idx)
-    shadbala = compute_shadbala(planets, asc_idx, chalit_houses, local_hour=dt_local.hour)
 
-    # Dashas (requires Moon longitude)
-    moon_lon = planets.get("Moon", {}).get("lon")
-    dasha = None
-    dasha = None
-    if moon_lon is not None:
-        try:
-            vim = compute_vimsottari(dt_local, tz_hours, moon_lon)
-        except Exception as e:
-            vim = {"_error": str(e)}
+@api.get("/compute/stream")
+def compute_stream():
+    """
+    /compute as Server-Sent Events, one event per section as soon as it is ready.
+
+    Query string: the /compute fields (dob, tob, tz, lat, lon, name,
+    varsha_year, ayanamsas, include, exclude; vargas comma-separated or
+    repeated). Events, in order:
+
+      event: base     {"name", "input", "asc", "rashis", "sign_symbols"}
+      event: section  {"name": "table", "value": ...}   one per returned section
+      event: done     {"chart_id": "...", "cache": {"table": "hit", ...}, "fallbacks": ["dasha", ...]}
+                      (+ "stale": true, "age": seconds when a section was served stale)
+
+    Cheap sections come first; offloaded ones (dasha, varsha, acg and what
+    reads them) as the executor finishes them, so the first paint never waits
+    on the slowest section. by_ayanamsa, when asked for, is a section event.
+    A failure mid-stream ends it with `event: error`. Sections are cached and
+    fanned out like /compute; the stream is not coalesced.
+    """
+    from flask import Response, stream_with_context
+    from .common import swr_after_stream
+
+    args: Dict[str, Any] = request.args.to_dict()
+    if "vargas" in request.args:
+        args["vargas"] = [v.strip() for raw in request.args.getlist("vargas") for v in raw.split(",") if v.strip()]
+    try:
+        req = ComputeRequest.model_validate(args)
+    except ValidationError as e:
+        return jsonify({"error": _validation_error(e)}), 400
+
+    failure = _init_engines()
+    if failure is not None:
+        return failure
+
+    flask_app = app._get_current_object()
+    reqid = getattr(g, "reqid", "-")
+    app.logger.info("compute stream start reqid=%s lat=%.6f lon=%.6f dob=%s tob=%s tz=%s",
+                    reqid, req.lat, req.lon, req.dob, req.tob, req.tz)
+
+    def events():
+        n = 0
         try:
-            yog = compute_yogini(dt_local, tz_hours, moon_lon)
+            for name, value in _iter_sections(req):
+                n += 1
+                if name == "done":
+                    # headers went out before any section was read: a stale hit is flagged here
+                    age = swr_after_stream()
+                    if age is not None:
+                        value = {**value, "stale": True, "age": int(age)}
+                if name in ("base", "done"):
+                    yield _sse(name, value, n, flask_app)
+                else:
+                    yield _sse("section", {"name": name, "value": value}, n, flask_app)
+            app.logger.info("compute stream done reqid=%s events=%d", reqid, n)
         except Exception as e:
-            yog = {"_error": str(e)}
+            app.logger.exception("compute stream failed reqid=%s", reqid)
+            yield _sse("error", {"type": "compute_failed", "status": 500, "message": str(e)}, n + 1, flask_app)
+
+    resp = Response(stream_with_context(events()), mimetype="text/event-stream")
+    resp.headers["Cache-Control"] = "no-cache"
+    resp.headers["X-Accel-Buffering"] = "no"  # nginx: pass each event through as it is written
+    return resp
+
+
+# --------- Batch ---------
+_NDJSON_TYPES = ("application/x-ndjson", "application/ndjson", "application/jsonl")
+_batch_pools: Dict[int, Any] = {}  # worker count -> ThreadPoolExecutor
+_batch_pools_lock = threading.Lock()
+
+
+class _BadItem:
+    """A batch item that could not be read (malformed NDJSON line, not an object)."""
+    __slots__ = ("message",)
+
+    def __init__(self, message: str):
+        self.message = message
+
+
+def _batch_body(raw: bytes, ndjson: bool) -> Tuple[List[Any], Dict[str, Any]]:
+    """
+    (items, batch options) from NDJSON lines, a JSON list, or {"items": [...],
+    "include": ..., "exclude": ...}. ValueError for a body that is none of these;
+    an unreadable NDJSON line becomes a _BadItem, reported on its own line.
+    """
+    if ndjson:
+        items: List[Any] = []
+        for n, line in enumerate(raw.decode("utf-8").splitlines(), 1):
+            if line.strip():
+                try:
+                    items.append(json.loads(line))
+                except ValueError as e:
+                    items.append(_BadItem(f"line {n}: {e}"))
+        return items, {}
+    body = json.loads(raw or b"null")
+    if isinstance(body, list):
+        return body, {}
+    if isinstance(body, dict) and isinstance(body.get("items"), list):
+        return body["items"], {k: body[k] for k in ("include", "exclude", "format") if body.get(k) is not None}
+    raise ValueError('expected a JSON list of charts, {"items": [...]}, or NDJSON (application/x-ndjson)')
+
+
+def _batch_executor(workers: int):
+    """Process-wide pool for batch items, one per worker count (pools are persistent)."""
+    with _batch_pools_lock:
+        pool = _batch_pools.get(workers)
+        if pool is None:
+            from concurrent.futures import ThreadPoolExecutor
+            pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="compute-batch")
+            _batch_pools[workers] = pool
+        return pool
+
+
+def _batch_run(flask_app, index: int, req: ComputeRequest, shared: Dict[float, dict]) -> Dict[str, Any]:
+    # app context only: with no request context cache_get never serves stale entries, which
+    # matters because the lines are written after swr_after_request (no Age, no refresh)
+    with flask_app.app_context():
         try:
-            asht = compute_ashtottari(dt_local, tz_hours, moon_lon)
+            payload, _, outcome = _compute_one(req, shared)
         except Exception as e:
-            asht = {"_error": str(e)}
+            flask_app.logger.exception("compute batch item %d failed", index)
+            return {"index": index, "error": {"type": "compute_failed", "status": 500, "message": str(e)}}
+    return {"index": index, "chart_id": payload.get("chart_id"), "outcome": outcome, "result": payload}
+
+
+@api.post("/compute/batch")
+def compute_batch():
+    """
+    Compute many charts in one request, streamed back as NDJSON.
+
+    Body: NDJSON (Content-Type: application/x-ndjson), one /compute request
+    per line; or a JSON list of them; or {"items": [...], "include": [...],
+    "exclude": [...], "format": "columnar"}. include/exclude/format (body or
+    query string) apply to the items that do not set their own.
+
+    Response (application/x-ndjson), one line per item in completion order:
+      {"index": 3, "chart_id": "...", "outcome": "computed", "result": {...}}
+      {"index": 4, "error": {"type": "validation", ...}}
+    and a last line {"done": true, "items": n, "failed": k}. A failing item
+    never fails the batch.
+
+    At most COMPUTE_BATCH_WORKERS items compute at once (shared by all batches
+    in the worker). Items go through the same coalescing and section caches
+    as /compute, so duplicates inside a batch compute once; charts born at the
+    same instant share the tropical planets pass (per batch) and the ACG lines
+    (cached by instant). The
+    body may be up to COMPUTE_BATCH_MAX_BYTES (MAX_CONTENT_LENGTH is per chart)
+    and hold up to COMPUTE_BATCH_MAX_ITEMS items.
+    """
+    from flask import Response, stream_with_context
+    from concurrent.futures import FIRST_COMPLETED, wait
+    from backend.services.sections import parse_section_names
+
+    from werkzeug.exceptions import RequestEntityTooLarge
+
+    max_bytes = int(app.config.get("COMPUTE_BATCH_MAX_BYTES", 8 * 1024 * 1024))
+    max_items = int(app.config.get("COMPUTE_BATCH_MAX_ITEMS", 5000))
+    request.max_content_length = max_bytes
+    try:
+        items, options = _batch_body(request.get_data(cache=False), request.mimetype in _NDJSON_TYPES)
+        for opt in ("include", "exclude"):
+            raw = request.args.get(opt) or options.get(opt)
+            options[opt] = parse_section_names(raw) if raw else None
+        options["format"] = request.args.get("format") or options.get("format")
+    except RequestEntityTooLarge:
+        items, options = None, {}
+    except (ValueError, UnicodeDecodeError) as e:
+        return _bad_request(str(e))
+    if items is None or len(items) > max_items:
+        return jsonify({"error": {
+            "type": "payload_too_large",
+            "message": f"at most {max_items} items and {max_bytes} bytes per batch",
+        }}), 413
+
+    failure = _init_engines()
+    if failure is not None:
+        return failure
+
+    workers = int(app.config.get("COMPUTE_BATCH_WORKERS") or min(4, os.cpu_count() or 1))
+    pool = _batch_executor(workers)
+    flask_app = app._get_current_object()
+    reqid = getattr(g, "reqid", "-")
+    shared: Dict[float, dict] = {}  # jd -> tropical planets, for the charts of this batch
+    app.logger.info("compute batch start reqid=%s items=%d", reqid, len(items))
+
+    def _validated(index: int, raw: Any):
+        if isinstance(raw, _BadItem):
+            return {"index": index, "error": {"type": "bad_request", "status": 400, "message": raw.message}}
+        if not isinstance(raw, dict):
+            return {"index": index, "error": {
+                "type": "bad_request", "status": 400, "message": "item must be a JSON object",
+            }}
+        defaults = {k: v for k, v in options.items() if v is not None and raw.get(k) is None}
         try:
-            kcd = compute_kalachakra(dt_local, tz_hours, moon_lon)
-        except Exception as e:
-            # prevent 500s; surface the issue in a structured way
-            kcd = {"_error": f"kalachakra_failed: {e}"}
-
-        dasha = {
-            "Vimshottari": vim,
-            "Yogini": yog,
-            "Ashtottari": asht,
-            "Kalachakra": kcd,
-        }
+            return ComputeRequest.model_validate({**raw, **defaults})
+        except ValidationError as e:
+            return {"index": index, "error": _validation_error(e)}
+
+    def _line(obj: Dict[str, Any]) -> str:
+        return flask_app.json.dumps(obj) + "\n"
 
-    # if moon_lon is not None:
-    #     dasha = {
-    #         "Vimshottari": compute_vimsottari(dt_local, tz_hours, moon_lon),
-    #         "Yogini":      compute_yogini   (dt_local, tz_hours, moon_lon),
-    #         "Ashtottari":  compute_ashtottari(dt_local, tz_hours, moon_lon),
-    #         "Kalachakra":  compute_kalachakra(dt_local, tz_hours, moon_lon),
-    #     }
+    def generate():
+        pending = set()
+        todo = iter(enumerate(items))
+        failed = 0
+        try:
+            while True:
+                # keep a bounded window in flight; unreadable items are answered right away
+                while len(pending) < 2 * workers:
+                    nxt = next(todo, None)
+                    if nxt is None:
+                        break
+                    req = _validated(*nxt)
+                    if isinstance(req, dict):
+                        failed += 1
+                        yield _line(req)
+                    else:
+                        pending.add(pool.submit(_batch_run, flask_app, nxt[0], req, shared))
+                if not pending:
+                    break
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for fut in finished:
+                    out = fut.result()
+                    failed += "error" in out
+                    yield _line(out)
+            app.logger.info("compute batch done reqid=%s items=%d failed=%d", reqid, len(items), failed)
+            yield _line({"done": True, "items": len(items), "failed": failed})
+        finally:
+            for fut in pending:  # client went away: drop what has not started
+                fut.cancel()
+
+    return Response(stream_with_context(generate()), mimetype="application/x-ndjson")
+
+
+def _build_payload(
+    req: ComputeRequest, shared: Dict[float, dict] | None = None
+) -> Tuple[Dict[str, Any], Dict[str, str], List[str]]:
+    """
+    The /compute payload, the cache hit/miss of each section and the sections
+    served from a fallback (timed out or failed; imports checked by compute()).
+    """
+    from backend.services.sections import select_sections
+    parts: Dict[str, Any] = dict(_iter_sections(req, shared))
+    done = parts.pop("done")
+    payload = parts.pop("base")
+    for name in select_sections(req.include, req.exclude):  # payload order, whatever order they finished in
+        if name in parts:
+            payload[name] = parts.pop(name)
+    payload.update(parts)  # by_ayanamsa
+    payload["chart_id"] = done["chart_id"]
+    return payload, done["cache"], done["fallbacks"]
+
+
+def _iter_sections(
+    req: ComputeRequest, shared: Dict[float, dict] | None = None
+) -> Iterator[Tuple[str, Any]]:
+    """
+    The /compute payload piece by piece, as each piece is ready: ("base", the
+    always-returned fields), then (section, value) for the wanted sections,
+    cheap inline ones first and offloaded ones as the executor finishes them,
+    ("by_ayanamsa", ...) when asked for, and last ("done", {"chart_id", "cache",
+    "fallbacks"}), fallbacks being the sections that timed out or failed (not cached).
+    """
+    from astrology.context import ChartContext
+    from astrology.vargas import compute_vargas
+    from astrology.symbols import SIGN_NAMES, SIGN_SYMBOLS
+    from astrology.formatting import build_planet_table
+    from astrology.shadbala import compute_shadbala
+    from astrology.predictions import generate_predictions
+
+    # ---- Core compute (from canonical inputs: equivalent spellings give identical results) ----
+    from .common import normalize_inputs
+    ayanamsa = app.config.get("SIDEREAL_AYANAMSA", "lahiri")
+    dob, tob, tz, lat, lon, _, _ = normalize_inputs(req.dob, req.tob, req.tz, req.lat, req.lon, ayanamsa, "P")
+    tz_hours = _parse_tz_to_hours(tz)
+    dt_local = datetime.fromisoformat(f"{dob}T{tob}")
+
+    # One ephemeris pass per request; every module below reuses it via ctx.
+    # Extra ayanamsas are offsets of the same tropical pass.
+    ctxs = ChartContext.build_many(dt_local, tz_hours, lat, lon,
+                                   [ayanamsa, *(req.ayanamsas or [])], hsys="P", tropical_memo=shared)
+    ctx = ctxs[ayanamsa]
+    planets, cusps, chart = ctx.planets, ctx.cusps, ctx.chart
+    asc_sidereal, asc_idx = ctx.asc_sidereal, ctx.asc_idx
+    rashi_houses, chalit_houses = ctx.rashi_houses, ctx.chalit_houses
+    wanted_vargas = _normalize_vargas(req.vargas)
+
+    from backend.services.chart_graph import DASHA_SYSTEMS
+    from backend.services.sections import (
+        OMIT, Section, Thunks, Uncached, get_executor, run_section, section_key, select_sections,
+        dasha_section, varsha_section, acg_section, module_section, bhava_bala_section,
+    )
+    from backend.services.chart_graph import sky_node_key
+    from .common import cache_get, cache_set, chart_id_for, utc_instant
+    wanted = select_sections(req.include, req.exclude)
+    cid = chart_id_for(dob, tob, tz, lat, lon, ayanamsa, "P")
 
-    # Optional solar return (Varshaphala)
-    varsha, varsha_predictions = None, None
+    # Dashas (requires Moon longitude)
+    moon_lon = planets.get("Moon", {}).get("lon")
 
     # "Now" in the same local offset as the request
     local_now = datetime.utcnow() + timedelta(hours=tz_hours)
@@ -222,33 +596,86 @@ def compute():
     # If not provided, default to current local year + 1
     varsha_year = req.varsha_year if req.varsha_year is not None else (local_now.year + 1)
 
-    try:
-        varsha = compute_varshaphala(
-            dt_local, tz_hours, req.lat, req.lon, year=int(varsha_year)
-        )
-        if isinstance(varsha, dict):
-            varsha_predictions = generate_predictions(
-                varsha["planets"],
-                varsha["asc_idx"],
-                varsha["chalit_houses"],
-                vargas={},  # (Tajika doesn’t require vargas; keep empty or compute if you wish)
-                dasha_info=None,  # Typically Varṣaphala uses Tajika dashās; keep off here
-                strengths=None
-        )
-    except Exception as e:
-        app.logger.warning("varshaphala failed: %s", e)
-        
-    kundli_predictions = generate_predictions(planets, asc_idx, chalit_houses, varga_maps, dasha, shadbala)
+    # ---- Every section is a thunk; only the wanted ones (and their inputs) ever run ----
+    # Each is cached on its own: chart_id + just the options it reads.
+    ttl = int(app.config.get("COMPUTE_CACHE_TTL", 600))
+    sec = Thunks(cache_get, cache_set, ttl) if ttl > 0 else Thunks()
+    layout = req.format
+    options = {"vargas": ",".join(wanted_vargas), "varsha_year": int(varsha_year), "format": layout}
 
-    # Astrocartography
-    acg = None
-    try:
-        acg = compute_astrocartography(dt_local, tz_hours)
-    except Exception:
-        pass
+    def add(name, fn, deps=(), cost=None):
+        sec.add(name, fn, key=section_key(name, cid, options), deps=deps, cost=cost)
+
+    def from_batch(pick, *names):
+        out = pick(batch.results(*names))
+        return Uncached(out) if batch.failed & set(names) else out
+
+    def batch_cost(*names):
+        # executor time of the offloaded sections behind a thunk (for cost-aware eviction)
+        return lambda: sum(batch.elapsed.get(n, 0.0) for n in names)
+
+    dasha_names = [f"dasha.{system}" for system in DASHA_SYSTEMS]
+    sec.add("vargas", lambda: compute_vargas(planets, wanted_vargas))
+    # Tables & strengths
+    add("table", lambda: build_planet_table(planets, asc_idx))
+    add("charts", lambda: {"rashi": rashi_houses, "chalit": chalit_houses, "vargas": sec["vargas"]},
+        deps=("vargas",))
+    add("shadbala", lambda: compute_shadbala(chart, asc_idx, chalit_houses, local_hour=dt_local.hour))
+    add("dasha", lambda: None if moon_lon is None else from_batch(
+        lambda r: {system: r[f"dasha.{system}"] for system in DASHA_SYSTEMS}, *dasha_names
+    ), cost=batch_cost(*dasha_names))
+    add("kundli_predictions", lambda: generate_predictions(
+        planets, asc_idx, chalit_houses, sec["vargas"], sec["dasha"], sec["shadbala"]
+    ), deps=("vargas", "dasha", "shadbala"))
+    add("varsha", lambda: from_batch(lambda r: r["varsha"][0], "varsha"), cost=batch_cost("varsha"))
+    add("varsha_predictions", lambda: from_batch(lambda r: r["varsha"][1], "varsha"), deps=("varsha",),
+        cost=batch_cost("varsha"))
+    # ACG depends on the instant only: keyed like the /acg sky node, shared across places
+    sec.add("acg", lambda: from_batch(lambda r: r["acg"], "acg"),
+            key=sky_node_key("acg" if layout == "records" else "acg_columnar", utc_instant(dob, tob, tz)),
+            cost=batch_cost("acg"))
+    # Extended calculations (best-effort; left out when missing or failing)
+    for extended in (
+        Section("panchanga", module_section,
+                ("astrology.panchanga", "compute_panchanga", dt_local, tz_hours, lat, lon, ctx)),
+        Section("ashtakavarga", module_section,
+                ("astrology.ashtakavarga", "compute_ashtakavarga", planets, asc_idx)),
+        Section("yogas", module_section,
+                ("astrology.yogas", "compute_yogas", planets, asc_idx, chalit_houses)),
+        Section("avasthas", module_section,
+                ("astrology.avasthas", "compute_avasthas", planets, asc_idx, chalit_houses)),
+        Section("aspects", module_section,
+                ("astrology.aspects", "compute_aspects", chart, asc_idx, chalit_houses)),
+        Section("transits", module_section,
+                ("astrology.transits", "compute_transits", dt_local, tz_hours, lat, lon, planets)),
+        Section("arudha", module_section,
+                ("astrology.arudha", "compute_arudha", chart, asc_idx, chalit_houses)),
+        Section("upagrahas", module_section,
+                ("astrology.upagrahas", "compute_upagrahas", dt_local, tz_hours, lat, lon)),
+        Section("bhava_bala", bhava_bala_section, (chart, chalit_houses)),
+        Section("kp", module_section, ("astrology.kp", "compute_kp_significators", planets, cusps)),
+    ):
+        add(extended.name, lambda s=extended: run_section(s))
+
+    # ---- Costly sections that missed the cache go to the executor, overlapping the inline work ----
+    todo = sec.plan(wanted)
+    offload: List[Section] = []
+    if "dasha" in todo and moon_lon is not None:
+        offload += [
+            Section(f"dasha.{system}", dasha_section, (system, dt_local, tz_hours, moon_lon, layout),
+                    fallback={"_error": "section_timeout"})
+            for system in DASHA_SYSTEMS
+        ]
+    if "varsha" in todo:
+        # Optional solar return (Varshaphala) + its predictions
+        offload.append(Section("varsha", varsha_section, (dt_local, tz_hours, lat, lon, int(varsha_year), ctx),
+                               fallback=(None, None)))
+    if "acg" in todo:
+        offload.append(Section("acg", acg_section, (dt_local, tz_hours, ctx, layout), fallback=None))
+    batch = get_executor(app.config).start(offload)
 
     # Base payload
-    payload: Dict[str, Any] = {
+    yield "base", {
         "name": req.name or "Chart",
         "input": {
             "dob": req.dob, "tob": req.tob, "lat": req.lat, "lon": req.lon, "tz": req.tz
@@ -256,99 +683,65 @@ def compute():
         "asc": {"lon": asc_sidereal, "idx": asc_idx, "sign": SIGN_NAMES[asc_idx]},
         "rashis": SIGN_NAMES,
         "sign_symbols": SIGN_SYMBOLS,
-        "table": table,
-        "charts": {"rashi": rashi_houses, "chalit": chalit_houses, "vargas": varga_maps},
-        "shadbala": shadbala,
-        "dasha": dasha,
-        "kundli_predictions": kundli_predictions,
-        "varsha": varsha,
-        "varsha_predictions": varsha_predictions,
-        "acg": acg,
     }
 
-    # ---------- Extended calculations (best-effort; skip if missing) ----------
-    # Panchanga (tithi, nakshatra, yoga, karana, weekday)
-    try:
-        from astrology.panchanga import compute_panchanga
-        payload["panchanga"] = compute_panchanga(dt_local, tz_hours, req.lat, req.lon)
-    except Exception:
-        pass
-
-    # Ashtakavarga
-    try:
-        from astrology.ashtakavarga import compute_ashtakavarga
-        payload["ashtakavarga"] = compute_ashtakavarga(planets, asc_idx)
-    except Exception:
-        pass
-
-    # Yogas catalog
-    try:
-        from astrology.yogas import compute_yogas
-        payload["yogas"] = compute_yogas(planets, asc_idx, chalit_houses)
-    except Exception:
-        pass
-
-    # Avasthas
-    try:
-        from astrology.avasthas import compute_avasthas
-        payload["avasthas"] = compute_avasthas(planets, asc_idx, chalit_houses)
-    except Exception:
-        pass
-
-    # Aspects
-    try:
-        from astrology.aspects import compute_aspects
-        payload["aspects"] = compute_aspects(planets, asc_idx, chalit_houses)
-    except Exception:
-        pass
-
-    # Transits (natal transits on the same timestamp)
-    try:
-        from astrology.transits import compute_transits
-        payload["transits"] = compute_transits(dt_local, tz_hours, req.lat, req.lon, planets)
-    except Exception:
-        pass
-
-    # Arudha / special lagnas
-    try:
-        from astrology.arudha import compute_arudha
-        payload["arudha"] = compute_arudha(planets, asc_idx, chalit_houses)
-    except Exception:
-        pass
-
-    # Upagrahas / special points
-    try:
-        from astrology.upagrahas import compute_upagrahas
-        payload["upagrahas"] = compute_upagrahas(dt_local, tz_hours, req.lat, req.lon)
-    except Exception:
-        pass
+    # A thunk that reads offloaded sections is taken once they have finished, so the
+    # slowest one never holds back the rest
+    behind = {
+        "dasha": dasha_names, "kundli_predictions": dasha_names,
+        "varsha": ("varsha",), "varsha_predictions": ("varsha",), "acg": ("acg",),
+    }
+    remaining = list(wanted)
+    while remaining:
+        ready = [name for name in remaining if batch.ready(*behind.get(name, ()))]
+        if not ready:
+            batch.wait_any()
+            continue
+        for name in ready:
+            remaining.remove(name)
+            value = sec[name]
+            if value is not OMIT:
+                yield name, value
+
+    if req.ayanamsas:
+        yield "by_ayanamsa", {
+            a: {
+                "ayanamsa_deg": c.ayanamsa_deg,
+                "asc": {"lon": c.asc_sidereal, "idx": c.asc_idx, "sign": SIGN_NAMES[c.asc_idx]},
+                "planets": c.planets,
+                "nakshatras": c.nakshatras,
+                "charts": {
+                    "rashi": c.rashi_houses,
+                    "chalit": c.chalit_houses,
+                    "vargas": sec["vargas"] if c is ctx else compute_vargas(c.planets, wanted_vargas),
+                },
+            }
+            for a, c in ctxs.items() if a in req.ayanamsas
+        }
 
-    # Bhava bala
     try:
-        from astrology.bhava_bala import compute_bhava_bala_enhanced, compute_bhava_bala
-        legacy = compute_bhava_bala(planets, chalit_houses)
-        payload["bhava_bala"] = compute_bhava_bala_enhanced(legacy, return_scale="both")
+        from .common import set_chart_inputs
+        # seed id→inputs mapping (so small endpoints can use ?chart_id=...)
+        set_chart_inputs(cid, dob, tob, tz, lat, lon, ayanamsa, "P")
     except Exception:
         pass
 
-    # KP significators
-    try:
-        from astrology.kp import compute_kp_significators
-        payload["kp"] = compute_kp_significators(planets, cusps)
-    except Exception:
-        pass
+    # Write-through: seed the parts endpoints' cache entries (and graph nodes) from
+    # what was computed here, so the SPA's follow-up calls with chart_id are hits.
+    if app.config.get("COMPUTE_FANOUT", True):
+        try:
+            from .common import write_behind
+            from .parts import fanout_entries
+            write_behind(fanout_entries(
+                dob, tob, tz, lat, lon, ayanamsa, "P", ctx, sec.settled(), vargas=wanted_vargas, varsha_year=int(varsha_year),
+                layout=layout,
+            ))
+        except Exception:
+            app.logger.exception("compute fan-out failed")
 
     # Include a deterministic chart_id for SPA reuse
-    try:
-        from .common import chart_id_for, set_chart_inputs
-        cid = chart_id_for(req.dob, req.tob, req.tz, req.lat, req.lon,
-                           app.config.get("SIDEREAL_AYANAMSA","lahiri"), "P")
-        payload["chart_id"] = cid
-        # seed id→inputs mapping (so small endpoints can use ?chart_id=...)
-        set_chart_inputs(cid, req.dob, req.tob, req.tz, req.lat, req.lon,
-                         app.config.get("SIDEREAL_AYANAMSA","lahiri"), "P")
-    except Exception:
-        pass
-
-    app.logger.info("compute done reqid=%s", getattr(g, "reqid", "-"))
-    return jsonify(payload)
+    yield "done", {
+        "chart_id": cid,
+        "cache": {n: sec.status[n] for n in wanted if n in sec.status},
+        "fallbacks": sorted(sec.fallbacks() & set(wanted)),
+    }
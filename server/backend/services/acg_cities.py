@@ -111,13 +111,16 @@ def compute_acg_cities(
     top_k: int = 3,
     max_km: float = 400.0,
     relocation: bool = False,
+    acg: Dict[str, Any] | None = None,
 ) -> List[Dict[str, Any]]:
     """
     Pure service: given a datetime & tz offset, compute ACG lines once,
     then score 100 cities for nearest planet/angle lines.
+    `acg` may pass lines already computed for the same instant.
     Assumes Swiss Ephemeris has been initialized by the caller.
     """
-    acg = compute_astrocartography(dt_local, tz_hours)  # {"lines": {...}, "advice": {...}}
+    if acg is None:
+        acg = compute_astrocartography(dt_local, tz_hours)  # {"lines": {...}, "advice": {...}}
     lines = (acg or {}).get("lines", {})
     advice_by_planet = (acg or {}).get("advice", {})
 
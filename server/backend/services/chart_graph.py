@@ -0,0 +1,339 @@
+# backend/services/chart_graph.py
+"""
+Declarative dependency graph for the per-chart values behind the parts endpoints.
+
+Every node names its upstream nodes. ChartGraph.resolve(...) computes only what
+is missing: a node is looked up in the request memo, then in the shared cache
+("node|<name>|<chart_id>|v=<version>"), and only then computed from its dependencies.
+Several endpoint calls for one chart therefore share one ephemeris evaluation.
+With `cache_compute` (common.cache_get_or_set), concurrent misses for the same
+node compute it once, across threads and workers.
+
+Parametrized nodes are addressed as "family[param]", e.g. "vargas[D9]" or
+"dasha[Yogini]"; the param is passed to the node function. "dasha_columnar[...]"
+and "acg_columnar" are the same values in the engines' columnar layout
+(?format=columnar).
+
+Nodes registered with tropical=True do not depend on the ayanamsa. They are
+cached under `base_key` and shared by the graphs that variant(...) derives
+for other ayanamsas, so "?ayanamsas=" costs one tropical pass per chart.
+
+Nodes registered with sky=True do not depend on the birth place: they are the
+sky state at the UTC instant (planets, RA/Dec and GMST for the ACG lines).
+Given a `sky_key` (the UTC instant) they are cached under it instead of the
+chart, so twins, same-minute births and relocated charts share them. Cusps,
+ascendant and everything built on them stay keyed by the chart.
+
+Node keys end in "|v=<version>": the engine version (engine_versions) of the
+astrology modules a node declares (engines=...) and those of its upstream
+nodes, so a deploy that changes one engine misses only the nodes built on it.
+
+Assumes Swiss Ephemeris has been initialized by the caller.
+"""
+
+from __future__ import annotations
+from dataclasses import dataclass, replace
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from backend.services.engine_versions import engines_version
+
+# name -> (deps, fn, parametrized)
+_NODES: Dict[str, Tuple[Tuple[str, ...], Callable[..., Any], bool]] = {}
+_TROPICAL: set = set()
+_SKY: set = set()
+_ENGINES: Dict[str, Tuple[str, ...]] = {}  # name -> astrology modules its fn calls
+
+
+def node(name: str, *deps: str, param: bool = False, tropical: bool = False, sky: bool = False,
+         engines: Tuple[str, ...] = ()):
+    """Register a graph node. fn(inputs, [param,] **deps) -> value."""
+    def deco(fn):
+        _NODES[name] = (deps, fn, param)
+        _ENGINES[name] = tuple(engines)
+        if tropical:
+            _TROPICAL.add(name)
+        if sky:
+            _SKY.add(name)
+        return fn
+    return deco
+
+
+def _upstream_engines(family: str) -> set:
+    out = set(_ENGINES.get(family, ()))
+    for d in _NODES.get(family, ((),))[0]:
+        out |= _upstream_engines(d)
+    return out
+
+
+@lru_cache(maxsize=None)
+def node_version(family: str) -> str:
+    """Engine version of a node: its engines plus those of everything upstream."""
+    return engines_version(*_upstream_engines(family))
+
+
+def sky_node_key(name: str, sky_key: str, ayan: Optional[str] = None) -> str:
+    """Cache key of a sky node: "node|<name>|sky|<instant>[|<ayanamsa>]|v=<version>"."""
+    family = _split(name)[0]
+    tail = "" if family in _TROPICAL else f"|{ayan}"
+    return f"node|{name}|sky|{sky_key}{tail}|v={node_version(family)}"
+
+
+def _split(name: str) -> Tuple[str, Optional[str]]:
+    if name.endswith("]") and "[" in name:
+        family, param = name[:-1].split("[", 1)
+        return family, param
+    return name, None
+
+
+def _tz_hours(s: str) -> float:
+    s = (s or "").strip()
+    if not s:
+        return 0.0
+    sign = -1 if s.startswith("-") else 1
+    s = s.lstrip("+-")
+    if ":" in s:
+        hh, mm = s.split(":", 1)
+        return sign * (int(hh) + int(mm) / 60.0)
+    return sign * float(s)
+
+
+@dataclass(frozen=True)
+class ChartInputs:
+    dob: str
+    tob: str
+    tz: str
+    lat: float
+    lon: float
+    ayan: str = "lahiri"
+    hs: str = "P"
+
+    @property
+    def dt_local(self) -> datetime:
+        return datetime.fromisoformat(f"{self.dob}T{self.tob}")
+
+    @property
+    def tz_hours(self) -> float:
+        return _tz_hours(self.tz)
+
+
+class ChartGraph:
+    """Resolves graph nodes for one chart, memoized per request and in the cache."""
+
+    def __init__(
+        self,
+        inputs: ChartInputs,
+        key: str,
+        *,
+        base_key: Optional[str] = None,
+        sky_key: Optional[str] = None,
+        cache_get: Optional[Callable[[str], Any]] = None,
+        cache_set: Optional[Callable[..., None]] = None,
+        cache_compute: Optional[Callable[..., Any]] = None,
+        ttl: int = 600,
+        _shared: Optional[Dict[str, Any]] = None,
+    ):
+        self.inputs = inputs
+        self.key = key
+        self.base_key = base_key or key
+        self.sky_key = sky_key  # UTC instant; None keys sky nodes by the chart
+        self._cache_get = cache_get
+        self._cache_set = cache_set
+        self._cache_compute = cache_compute  # (key, fn, timeout) -> value, computing once per key
+        self._ttl = ttl
+        self._values: Dict[str, Any] = {}
+        self._shared: Dict[str, Any] = {} if _shared is None else _shared  # tropical nodes
+
+    def variant(self, ayan: str, key: str) -> "ChartGraph":
+        """Same chart under another ayanamsa; shares the tropical nodes already resolved."""
+        return ChartGraph(
+            replace(self.inputs, ayan=ayan), key, base_key=self.base_key, sky_key=self.sky_key,
+            cache_get=self._cache_get, cache_set=self._cache_set,
+            cache_compute=self._cache_compute, ttl=self._ttl,
+            _shared=self._shared,
+        )
+
+    def cache_key(self, name: str) -> str:
+        family = _split(name)[0]
+        if family in _SKY and self.sky_key:
+            return sky_node_key(name, self.sky_key, self.inputs.ayan)
+        chart = self.base_key if family in _TROPICAL else self.key
+        return f"node|{name}|{chart}|v={node_version(family)}"
+
+    def get(self, name: str) -> Any:
+        memo = self._shared if _split(name)[0] in _TROPICAL else self._values
+        if name in memo:
+            return memo[name]
+
+        ck = self.cache_key(name)
+        if self._cache_get is not None:
+            hit = self._cache_get(ck)
+            if hit is not None:
+                memo[name] = hit
+                return hit
+
+        family, param = _split(name)
+        try:
+            deps, fn, parametrized = _NODES[family]
+        except KeyError:
+            raise KeyError(f"unknown chart graph node: {name}")
+        if parametrized != (param is not None):
+            raise KeyError(f"chart graph node {family!r} parameter mismatch: {name}")
+
+        kwargs = {d: self.get(d) for d in deps}
+
+        def _compute():
+            return fn(self.inputs, param, **kwargs) if parametrized else fn(self.inputs, **kwargs)
+
+        if self._cache_compute is not None:
+            value = self._cache_compute(ck, _compute, self._ttl)
+        else:
+            value = _compute()
+            if self._cache_set is not None and value is not None:
+                self._cache_set(ck, value, timeout=self._ttl)
+        memo[name] = value
+        return value
+
+    def resolve(self, *names: str) -> Dict[str, Any]:
+        """Return {name: value} for the requested nodes, computing only what is missing."""
+        return {n: self.get(n) for n in names}
+
+    __getitem__ = get
+
+
+# ---------- nodes ----------
+
+@node("jd", tropical=True, sky=True, engines=("swe_utils",))
+def _jd(inp: ChartInputs) -> float:
+    from astrology.swe_utils import to_julian_day
+    return to_julian_day(inp.dt_local, inp.tz_hours)
+
+
+@node("tropical", "jd", tropical=True, sky=True, engines=("planets",))
+def _tropical(inp: ChartInputs, jd: float):
+    from astrology.planets import compute_tropical
+    return compute_tropical(jd)
+
+
+@node("houses_tropical", "jd", tropical=True, engines=("houses",))
+def _houses_tropical(inp: ChartInputs, jd: float):
+    from astrology.houses import compute_cusps_tropical
+    return compute_cusps_tropical(jd, inp.lat, inp.lon, inp.hs)
+
+
+@node("planets", "jd", "tropical", sky=True, engines=("planets",))
+def _planets(inp: ChartInputs, jd: float, tropical) -> Dict[str, dict]:
+    from astrology.planets import sidereal_planets
+    return sidereal_planets(tropical, jd, inp.ayan)
+
+
+@node("houses", "jd", "houses_tropical", engines=("houses",))
+def _houses(inp: ChartInputs, jd: float, houses_tropical):
+    from astrology.houses import sidereal_asc
+    cusps, asc_tropical = houses_tropical
+    return cusps, sidereal_asc(asc_tropical, jd, inp.ayan)
+
+
+@node("cusps", "houses")
+def _cusps(inp: ChartInputs, houses):
+    return houses[0]
+
+
+@node("asc_lon", "houses")
+def _asc_lon(inp: ChartInputs, houses) -> float:
+    return houses[1]
+
+
+@node("asc_idx", "asc_lon", engines=("swe_utils",))
+def _asc_idx(inp: ChartInputs, asc_lon: float) -> int:
+    from astrology.swe_utils import sign_index
+    return sign_index(asc_lon)
+
+
+@node("rashi", "planets", "asc_idx", engines=("charts",))
+def _rashi(inp: ChartInputs, planets, asc_idx):
+    from astrology.charts import rashi_from_longitudes
+    return rashi_from_longitudes(planets, asc_idx)
+
+
+@node("chalit", "planets", "cusps", engines=("charts",))
+def _chalit(inp: ChartInputs, planets, cusps):
+    from astrology.charts import chalit_from_longitudes
+    return chalit_from_longitudes(planets, cusps)
+
+
+@node("chart", "planets", "asc_idx", "chalit", engines=("chart",))
+def _chart(inp: ChartInputs, planets, asc_idx, chalit):
+    from astrology.chart import Chart
+    return Chart.from_legacy(planets, asc_idx, chalit)
+
+
+@node("nakshatras", "planets", sky=True, engines=("nakshatra",))
+def _nakshatras(inp: ChartInputs, planets):
+    from astrology.nakshatra import nakshatra_for_lon
+    out = {}
+    for name, data in planets.items():
+        idx, nname, lord, pada = nakshatra_for_lon(data["lon"])
+        out[name] = {"idx": idx, "name": nname, "lord": lord, "pada": pada}
+    return out
+
+
+@node("context", "jd", "planets", "cusps", "asc_lon", engines=("context",))
+def _context(inp: ChartInputs, jd, planets, cusps, asc_lon):
+    from astrology.context import ChartContext
+    return ChartContext.from_positions(
+        inp.dt_local, inp.tz_hours, inp.lat, inp.lon, inp.ayan, inp.hs,
+        jd=jd, planets=planets, cusps=cusps, asc_sidereal=asc_lon,
+    )
+
+
+@node("vargas", "planets", param=True, sky=True, engines=("vargas",))
+def _varga(inp: ChartInputs, dx: str, planets):
+    from astrology.vargas import compute_vargas
+    return compute_vargas(planets, [dx]).get(dx)
+
+
+def _dasha_in(inp: ChartInputs, system: str, planets, layout: str):
+    from astrology import dasha as d
+    fns = {
+        "Vimshottari": d.compute_vimsottari,
+        "Yogini": d.compute_yogini,
+        "Ashtottari": d.compute_ashtottari,
+        "Kalachakra": d.compute_kalachakra,
+    }
+    moon_lon = planets.get("Moon", {}).get("lon")
+    if moon_lon is None:
+        raise ValueError("Moon longitude unavailable for dasha")
+    return fns[system](inp.dt_local, inp.tz_hours, moon_lon, layout=layout)
+
+
+@node("dasha", "planets", param=True, engines=("dasha",))
+def _dasha(inp: ChartInputs, system: str, planets):
+    return _dasha_in(inp, system, planets, "records")
+
+
+@node("dasha_columnar", "planets", param=True, engines=("dasha",))
+def _dasha_columnar(inp: ChartInputs, system: str, planets):
+    return _dasha_in(inp, system, planets, "columnar")
+
+
+@node("acg_sky", "jd", tropical=True, sky=True, engines=("astrocartography",))
+def _acg_sky(inp: ChartInputs, jd: float):
+    from astrology.astrocartography import acg_sky
+    return acg_sky(jd)
+
+
+@node("acg", "acg_sky", tropical=True, sky=True, engines=("astrocartography",))
+def _acg(inp: ChartInputs, acg_sky):
+    from astrology.astrocartography import compute_astrocartography
+    return compute_astrocartography(inp.dt_local, inp.tz_hours, sky=acg_sky)
+
+
+@node("acg_columnar", "acg_sky", tropical=True, sky=True, engines=("astrocartography",))
+def _acg_columnar(inp: ChartInputs, acg_sky):
+    from astrology.astrocartography import compute_astrocartography
+    return compute_astrocartography(inp.dt_local, inp.tz_hours, sky=acg_sky, layout="columnar")
+
+
+DASHA_SYSTEMS = ("Vimshottari", "Yogini", "Ashtottari", "Kalachakra")
@@ -0,0 +1,163 @@
+# backend/services/engine_versions.py
+"""
+Engine-version fingerprints for cache keys.
+
+Every cached value is produced by a few astrology modules (its engines).
+engine_version(name) is a short hash over those modules and every astrology
+module they import, directly or not (found by parsing the sources; nothing
+is imported). Each module contributes its declared version when it has one,
+
+    ENGINE_VERSION = "2"   # bump when results change
+
+and the hash of its source otherwise. Cache keys end in "|v=<version>", so a
+deploy that touches astrology/dasha.py misses only the dasha-derived keys;
+the rest of the warm cache (L2 included) keeps serving.
+
+ENGINES maps the parts endpoint namespaces and /compute section names to
+their engines; a name missing from it is versioned by the whole package.
+Graph nodes declare theirs in chart_graph (node(..., engines=...)) and add
+those of their upstream nodes.
+"""
+
+from __future__ import annotations
+import ast
+import hashlib
+import importlib.util
+from functools import lru_cache
+from pathlib import Path
+from typing import Dict, FrozenSet, Optional, Tuple
+
+PACKAGE = "astrology"
+VERSION_ATTR = "ENGINE_VERSION"
+
+# Every chart-derived value reads the ephemeris positions, houses and the Chart built on them.
+CHART = ("context",)
+
+# parts endpoint namespace / /compute section -> engines (module names in the astrology package)
+ENGINES: Dict[str, Tuple[str, ...]] = {
+    "asc": ("houses",),
+    "houses": ("houses",),
+    "planets": ("planets", "nakshatra"),
+    "rashi": ("charts", "houses"),
+    "chalit": ("charts", "houses"),
+    "charts": (*CHART, "vargas"),
+    "vargas": ("planets", "vargas"),
+    "table": (*CHART, "formatting"),
+    "ptable": (*CHART, "formatting"),
+    "shadbala": (*CHART, "shadbala"),
+    "dasha": ("planets", "dasha"),
+    "kundli_predictions": (*CHART, "predictions", "vargas", "dasha", "shadbala"),
+    "varsha": (*CHART, "varshaphala", "predictions"),
+    "varsha_predictions": (*CHART, "varshaphala", "predictions"),
+    "varsha_details": (*CHART, "varshaphala", "yogas", "aspects"),
+    "acg": ("swe_utils", "astrocartography"),
+    "acg_cities": ("swe_utils", "astrocartography"),
+    "panchanga": (*CHART, "panchanga"),
+    "ashtakavarga": (*CHART, "ashtakavarga"),
+    "yogas": (*CHART, "yogas"),
+    "avasthas": (*CHART, "avasthas"),
+    "aspects": (*CHART, "aspects"),
+    "transits": (*CHART, "transits"),
+    "arudha": (*CHART, "arudha"),
+    "upagrahas": (*CHART, "upagrahas"),
+    "bhava_bala": (*CHART, "bhava_bala"),
+    "bhavabala": (*CHART, "bhava_bala"),
+    "kp": (*CHART, "kp"),
+    "grahas": (*CHART, "lords"),
+}
+
+
+@lru_cache(maxsize=None)
+def _package_dir() -> Optional[Path]:
+    spec = importlib.util.find_spec(PACKAGE)
+    locations = list(spec.submodule_search_locations or []) if spec else []
+    return Path(locations[0]) if locations else None
+
+
+def _source(module: str) -> Optional[bytes]:
+    root = _package_dir()
+    path = root / f"{module}.py" if root else None
+    return path.read_bytes() if path and path.is_file() else None
+
+
+def _declared_version(tree: ast.Module) -> Optional[str]:
+    for stmt in tree.body:
+        if isinstance(stmt, ast.Assign) and isinstance(stmt.value, ast.Constant):
+            if any(isinstance(t, ast.Name) and t.id == VERSION_ATTR for t in stmt.targets):
+                return str(stmt.value.value)
+    return None
+
+
+def _imported(tree: ast.Module) -> FrozenSet[str]:
+    """Package modules imported anywhere in the module (function-level imports included)."""
+    out = set()
+    prefix = PACKAGE + "."
+    for n in ast.walk(tree):
+        if isinstance(n, ast.Import):
+            out.update(a.name[len(prefix):] for a in n.names if a.name.startswith(prefix))
+        elif isinstance(n, ast.ImportFrom):
+            base = n.module or ""
+            if n.level == 1 or base == PACKAGE or base.startswith(prefix):
+                sub = base[len(prefix):] if base.startswith(prefix) else ("" if base == PACKAGE else base)
+                if sub:
+                    out.add(sub.split(".")[0])
+                else:  # from . import dasha / from astrology import dasha
+                    out.update(a.name for a in n.names)
+    return frozenset(m for m in out if _source(m) is not None)
+
+
+@lru_cache(maxsize=None)
+def _module_info(module: str) -> Tuple[str, FrozenSet[str]]:
+    """(own version, imported package modules); "missing" for a module that does not exist."""
+    src = _source(module)
+    if src is None:
+        return "missing", frozenset()
+    try:
+        tree = ast.parse(src)
+    except SyntaxError:  # still versioned by its bytes
+        return hashlib.sha256(src).hexdigest()[:16], frozenset()
+    declared = _declared_version(tree)
+    own = f"={declared}" if declared is not None else hashlib.sha256(src).hexdigest()[:16]
+    return own, _imported(tree)
+
+
+def engine_closure(*modules: str) -> Tuple[str, ...]:
+    """The modules plus every package module they import, sorted."""
+    seen, todo = set(), list(modules)
+    while todo:
+        m = todo.pop()
+        if m not in seen:
+            seen.add(m)
+            todo.extend(_module_info(m)[1])
+    return tuple(sorted(seen))
+
+
+@lru_cache(maxsize=None)
+def _engines_version(modules: Tuple[str, ...]) -> str:
+    h = hashlib.sha256()
+    for m in engine_closure(*modules):
+        h.update(f"{m}:{_module_info(m)[0]};".encode())
+    return h.hexdigest()[:10]
+
+
+def engines_version(*modules: str) -> str:
+    """Version of a value computed by these modules (order and duplicates do not matter)."""
+    return _engines_version(tuple(sorted(set(modules))))
+
+
+@lru_cache(maxsize=None)
+def _package_modules() -> Tuple[str, ...]:
+    root = _package_dir()
+    return tuple(sorted(p.stem for p in root.glob("*.py") if p.stem != "__init__")) if root else ()
+
+
+@lru_cache(maxsize=None)
+def engine_version(name: str) -> str:
+    """Version of a namespace / section: its ENGINES, or the whole package when unlisted."""
+    modules = ENGINES.get(name)
+    return engines_version(*(modules if modules is not None else _package_modules()))
+
+
+def engine_versions() -> Dict[str, str]:
+    """{name: version} for everything in ENGINES (for /cache/stats)."""
+    return {name: engine_version(name) for name in sorted(ENGINES)}
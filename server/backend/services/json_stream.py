@@ -0,0 +1,146 @@
+# backend/services/json_stream.py
+"""
+JSON encoding for API responses.
+
+dumps(obj) -> bytes is the fast path: orjson when installed (a full /compute
+payload encodes in ~2 ms where jsonify takes ~12), else json. Both write
+UTF-8 and sort keys like Flask's default provider, and hand anything they
+cannot encode (datetime, Decimal, dataclass, ...) to Flask's `default`, so
+the documents match what jsonify produced.
+
+create_app installs FastJSONProvider as app.json, so jsonify and the batch
+and stream endpoints take the fast path too. jsonify and json_response
+answer in MessagePack / CBOR when the Accept header asks for them
+(response_formats.py).
+
+iter_json(obj) yields the same document in chunks of about `chunk_size`,
+encoding one piece at a time: containers are walked down to `split_depth`
+and whatever lies below is encoded in one call. json_response(...) buffers
+up to `stream_min_bytes` and sends a plain response when the document fits,
+else streams it, so a /compute payload with ACG lines and full dasha
+timelines never exists as one string. See benchmarks/bench_json.py.
+"""
+
+from __future__ import annotations
+import itertools
+import json
+from typing import Any, Callable, Iterator, Optional
+
+from flask import Response
+from flask.json.provider import DefaultJSONProvider
+
+from backend.services.response_formats import binary_response, negotiable, negotiate
+
+try:
+    import orjson  # optional
+except ImportError:  # pragma: no cover - depends on the environment
+    orjson = None
+
+CHUNK_SIZE = 16 * 1024
+STREAM_MIN_BYTES = 256 * 1024
+
+_default = DefaultJSONProvider.default  # Flask's: dates as HTTP dates, Decimal/UUID as str, dataclasses as dicts
+if orjson is not None:
+    _OPTS = orjson.OPT_NON_STR_KEYS | orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+
+def dumps(obj: Any, *, sort_keys: bool = True, default: Optional[Callable[[Any], Any]] = None) -> bytes:
+    """Compact UTF-8 JSON."""
+    if orjson is not None:
+        try:
+            return orjson.dumps(obj, default=default or _default,
+                                option=_OPTS | orjson.OPT_SORT_KEYS if sort_keys else _OPTS)
+        except TypeError:  # e.g. an int too large for orjson, mixed-type keys: the stdlib copes
+            pass
+    return json.dumps(obj, default=default or _default, sort_keys=sort_keys, ensure_ascii=False,
+                      separators=(",", ":")).encode()
+
+
+def _key(k: Any) -> str:
+    return k if isinstance(k, str) else json.dumps(k)  # 1 -> "1", True -> "true", None -> "null"
+
+
+def _pieces(obj: Any, depth: int, sort_keys: bool, default) -> Iterator[bytes]:
+    if depth <= 0 or not isinstance(obj, (dict, list, tuple)) or not obj:
+        yield dumps(obj, sort_keys=sort_keys, default=default)
+        return
+    if isinstance(obj, dict):
+        items = [(_key(k), v) for k, v in obj.items()]
+        if sort_keys:
+            items.sort(key=lambda kv: kv[0])  # by the JSON key, as orjson does ("10" before "2")
+        sep = b"{"
+        for k, v in items:
+            yield sep + json.dumps(k, ensure_ascii=False).encode() + b":"
+            yield from _pieces(v, depth - 1, sort_keys, default)
+            sep = b","
+        yield b"}"
+    else:
+        sep = b"["
+        for v in obj:
+            yield sep
+            yield from _pieces(v, depth - 1, sort_keys, default)
+            sep = b","
+        yield b"]"
+
+
+def iter_json(obj: Any, chunk_size: int = CHUNK_SIZE, *, split_depth: int = 3, sort_keys: bool = True,
+              default: Optional[Callable[[Any], Any]] = None) -> Iterator[bytes]:
+    """The document dumps(obj) would produce, in chunks of about chunk_size bytes."""
+    buf = bytearray()
+    for piece in _pieces(obj, split_depth, sort_keys, default):
+        buf += piece  # copied right away: a small orjson result holds ~1 KiB
+        if len(buf) >= chunk_size:
+            chunk = bytes(buf)
+            buf.clear()
+            yield chunk
+    if buf:
+        yield bytes(buf)
+
+
+def json_response(obj: Any, status: int = 200, *, stream_min_bytes: int = STREAM_MIN_BYTES,
+                  chunk_size: int = CHUNK_SIZE) -> Response:
+    """
+    application/json response for obj: whole when it encodes to less than
+    stream_min_bytes (0 = never stream), streamed chunk by chunk otherwise.
+    A client that prefers MessagePack / CBOR (Accept) gets that instead.
+    """
+    binary = negotiate()
+    if binary is not None:
+        return binary_response(obj, binary, status)
+    chunks = iter_json(obj, chunk_size)
+    head, size = [], 0
+    for chunk in chunks:
+        head.append(chunk)
+        size += len(chunk)
+        if 0 < stream_min_bytes <= size:
+            resp = Response(itertools.chain(head, chunks, (b"\n",)), status=status, mimetype="application/json")
+            break
+    else:
+        head.append(b"\n")
+        resp = Response(b"".join(head), status=status, mimetype="application/json")
+    if negotiable():
+        resp.vary.add("Accept")
+    return resp
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider with dumps() on the fast path; pretty-printing (debug) stays with the stdlib."""
+
+    def dumps(self, obj: Any, **kwargs: Any) -> str:
+        if set(kwargs) <= {"default", "sort_keys"}:
+            return dumps(obj, sort_keys=kwargs.get("sort_keys", self.sort_keys),
+                         default=kwargs.get("default")).decode()
+        return super().dumps(obj, **kwargs)
+
+    def response(self, *args: Any, **kwargs: Any) -> Response:
+        binary = negotiate()
+        if binary is not None:
+            resp = binary_response(self._prepare_response_obj(args, kwargs), binary)
+        elif self.compact is False or (self.compact is None and self._app.debug):
+            resp = super().response(*args, **kwargs)
+        else:
+            body = dumps(self._prepare_response_obj(args, kwargs), sort_keys=self.sort_keys) + b"\n"
+            resp = self._app.response_class(body, mimetype=self.mimetype)
+        if negotiable():
+            resp.vary.add("Accept")
+        return resp
@@ -0,0 +1,81 @@
+# backend/services/response_formats.py
+"""
+Binary response encodings chosen by the Accept header.
+
+  application/msgpack   (also application/x-msgpack, application/vnd.msgpack)
+                        the optional `msgpack` package
+  application/cbor      the optional `cbor2` package
+
+JSON stays the default: no Accept, */*, a tie, or a binary type whose
+package is not installed all get JSON. Negotiation happens when the
+response is built (app.json.response, i.e. every jsonify, and
+json_stream.json_response for /compute), so all formats encode the same
+cached section objects and nothing is cached per format. Responses that
+could be negotiated carry `Vary: Accept`.
+
+The document is the JSON one with the types each format has: integer map
+keys stay integers (msgpack.unpackb needs strict_map_key=False), and values
+JSON cannot hold natively go through Flask's `default` (dates become HTTP
+date strings, Decimal a string, ...). benchmarks/bench_formats.py reports
+size and encode/decode cost per format.
+"""
+
+from __future__ import annotations
+from typing import Any, Callable, Dict, Optional
+
+from flask import Response, has_request_context, request
+from flask.json.provider import DefaultJSONProvider
+
+try:
+    import msgpack  # optional
+except ImportError:  # pragma: no cover - depends on the environment
+    msgpack = None
+
+try:
+    import cbor2  # optional
+except ImportError:  # pragma: no cover - depends on the environment
+    cbor2 = None
+
+JSON = "application/json"
+_default = DefaultJSONProvider.default
+
+
+def _msgpack(obj: Any) -> bytes:
+    return msgpack.packb(obj, default=_default, use_bin_type=True)
+
+
+def _cbor(obj: Any) -> bytes:
+    return cbor2.dumps(obj, default=lambda encoder, value: encoder.encode(_default(value)))
+
+
+def encoders() -> Dict[str, Callable[[Any], bytes]]:
+    """{mimetype: encode} of the binary formats available here."""
+    out: Dict[str, Callable[[Any], bytes]] = {}
+    if msgpack is not None:
+        out.update(dict.fromkeys(("application/msgpack", "application/x-msgpack", "application/vnd.msgpack"), _msgpack))
+    if cbor2 is not None:
+        out["application/cbor"] = _cbor
+    return out
+
+
+_ENCODERS = encoders()
+_OFFERED = [JSON, *_ENCODERS]  # JSON first: it wins every tie
+
+
+def negotiable() -> bool:
+    """True when some binary format is installed, so JSON responses vary by Accept too."""
+    return bool(_ENCODERS)
+
+
+def negotiate() -> Optional[str]:
+    """The binary mimetype the current request prefers over JSON, or None for JSON."""
+    if not _ENCODERS or not has_request_context() or "Accept" not in request.headers:
+        return None
+    best = request.accept_mimetypes.best_match(_OFFERED, default=JSON)
+    return None if best == JSON else best
+
+
+def binary_response(obj: Any, mimetype: str, status: int = 200) -> Response:
+    resp = Response(_ENCODERS[mimetype](obj), status=status, mimetype=mimetype)
+    resp.vary.add("Accept")
+    return resp
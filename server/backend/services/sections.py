@@ -0,0 +1,514 @@
+# backend/services/sections.py
+"""
+Parallel execution of the independent /compute sections.
+
+A Section is a top-level (picklable) function plus its arguments. The
+SectionExecutor dispatches a batch of sections at once (start) and merges
+the results by name when they are first needed (results):
+
+  - "process": persistent ProcessPoolExecutor; each worker initializes
+    Swiss Ephemeris once (initializer) and then serves many requests.
+  - "thread":  ThreadPoolExecutor in the web worker (swe_utils is thread-safe).
+  - "inline":  serial, in the calling thread (debugging, tiny deployments).
+    A pool of one worker cannot overlap anything, so it also runs inline.
+
+Every section has its own timeout, counted from dispatch. A section that
+raises or times out yields its `fallback` (or is left out when fallback is
+OMIT), so one slow module never fails the whole request. A timed-out
+process task cannot be interrupted; it finishes in the background and its
+result is dropped.
+
+/compute itself is assembled from Thunks: every response section is a
+memoized zero-argument callable that runs only when the payload (or a
+dependent section) reads it, so sections left out by include/exclude never
+run. Only the costly sections (SECTION_COST "medium"/"high") are sent to
+the executor; cheap ones run inline, where they cost less than the IPC.
+
+Each section is cached on its own under section_key(...): chart_id plus
+only the request options it depends on (SECTION_OPTIONS). A request that
+changes varsha_year or vargas recomputes just the sections that read them,
+and a deploy that changes an engine (engine_versions) just the sections
+computed by it.
+Thunks.plan(...) resolves cache hits up front so that hits are never sent
+to the executor.
+
+Config (config.py / env):
+  COMPUTE_EXECUTOR          process | thread | inline     (default process)
+  COMPUTE_WORKERS           pool size                     (default min(4, cpu))
+  COMPUTE_SECTION_TIMEOUT   seconds per section           (default 10)
+  COMPUTE_SECTION_TIMEOUTS  per-section overrides, "acg=5,varsha=8"
+  COMPUTE_CACHE_TTL         seconds a cached section lives (default 600; 0 disables)
+"""
+
+from __future__ import annotations
+import atexit
+import logging
+import multiprocessing
+import os
+import threading
+import time
+from concurrent.futures import (
+    FIRST_COMPLETED, Future, ProcessPoolExecutor, ThreadPoolExecutor, TimeoutError as FutureTimeout, wait,
+)
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple
+
+from backend.services.engine_versions import engine_version
+
+log = logging.getLogger(__name__)
+
+OMIT = object()  # fallback marker: leave the section out of the payload
+
+
+@dataclass(frozen=True)
+class Section:
+    name: str
+    fn: Callable[..., Any]
+    args: Tuple[Any, ...] = ()
+    fallback: Any = OMIT
+    timeout: Optional[float] = None  # None -> executor default
+
+
+def parse_timeouts(raw: str | Dict[str, float] | None) -> Dict[str, float]:
+    """"acg=5,varsha=8" (or a dict) -> {"acg": 5.0, "varsha": 8.0}."""
+    if not raw:
+        return {}
+    if isinstance(raw, dict):
+        return {str(k): float(v) for k, v in raw.items()}
+    out: Dict[str, float] = {}
+    for part in str(raw).split(","):
+        if "=" in part:
+            k, v = part.split("=", 1)
+            out[k.strip()] = float(v)
+    return out
+
+
+# ---------- worker side ----------
+
+def _worker_init(ephe_path: Optional[str], ayanamsa: str) -> None:
+    from astrology import swe_utils as su
+    su.init(ephe_path=ephe_path, ayanamsa=ayanamsa)
+
+
+def _call(fn: Callable[..., Any], args: Tuple[Any, ...]) -> Any:
+    return fn(*args)
+
+
+def run_section(s: Section) -> Any:
+    """Run one section in this thread; fallback (possibly OMIT) if it raises."""
+    try:
+        return s.fn(*s.args)
+    except Exception as e:
+        log.debug("section %s failed: %s", s.name, e)
+        return s.fallback
+
+
+class SectionBatch:
+    """
+    Sections in flight; each is waited for (up to its timeout) once, when first
+    asked for: results("acg") does not wait on the dashas. ready(...) and
+    wait_any() let a caller take sections in the order they finish.
+    """
+
+    def __init__(self, executor: "SectionExecutor", sections, futures=None, started: float = 0.0):
+        self._executor = executor
+        self._sections = {s.name: s for s in sections}
+        self._futures = dict(zip(self._sections, futures)) if futures is not None else None  # None -> inline
+        self._started = started
+        self._out: Dict[str, Any] = {}  # collected so far, OMIT included
+        self.failed: set = set()  # names that yielded their fallback
+        self.elapsed: Dict[str, float] = {}  # seconds per section (pooled: dispatch until collected)
+
+    def _deadline(self, s: Section) -> float:
+        return self._started + self._executor.timeout_for(s)
+
+    def _collect_one(self, name: str) -> None:
+        s = self._sections[name]
+        if self._futures is None:
+            t0 = time.monotonic()
+            value = run_section(s)
+            self.elapsed[name] = time.monotonic() - t0
+        else:
+            remaining = max(0.0, self._deadline(s) - time.monotonic())
+            value = self._executor._collect(s, self._futures[name], remaining)
+            self.elapsed[name] = time.monotonic() - self._started
+        if value is s.fallback:
+            self.failed.add(name)
+        self._out[name] = value
+
+    def results(self, *names: str) -> Dict[str, Any]:
+        """Collected results of `names` (default: every section), OMIT-fallback failures left out."""
+        for name in names or self._sections:
+            if name in self._sections and name not in self._out:
+                self._collect_one(name)
+        return {k: v for k, v in self._out.items() if v is not OMIT}
+
+    def ready(self, *names: str) -> bool:
+        """True when results(*names) would not block: finished, timed out, collected or not in the batch."""
+        if self._futures is None:
+            return True
+        now = time.monotonic()
+        return all(
+            n not in self._sections or n in self._out or self._futures[n].done()
+            or now >= self._deadline(self._sections[n])
+            for n in names
+        )
+
+    def wait_any(self) -> None:
+        """Block until one more section finishes or reaches its timeout (no-op when nothing is pending)."""
+        if self._futures is None:
+            return
+        pending = [n for n in self._sections if n not in self._out and not self._futures[n].done()]
+        if pending:
+            deadline = min(self._deadline(self._sections[n]) for n in pending)
+            wait([self._futures[n] for n in pending], timeout=max(0.0, deadline - time.monotonic()),
+                 return_when=FIRST_COMPLETED)
+
+
+# ---------- executor ----------
+
+class SectionExecutor:
+    def __init__(
+        self,
+        kind: str = "process",
+        workers: Optional[int] = None,
+        *,
+        default_timeout: float = 10.0,
+        timeouts: Optional[Dict[str, float]] = None,
+        ephe_path: Optional[str] = None,
+        ayanamsa: str = "lahiri",
+    ):
+        if kind not in ("process", "thread", "inline"):
+            raise ValueError(f"unknown section executor: {kind!r}")
+        self.kind = kind
+        self.workers = workers or min(4, os.cpu_count() or 1)
+        self.default_timeout = default_timeout
+        self.timeouts = dict(timeouts or {})
+        self._init_args = (ephe_path, ayanamsa)
+        self._pool = None
+        self._pid = None
+        self._lock = threading.Lock()
+
+    def _get_pool(self):
+        # a pool inherited through fork (gunicorn) is unusable: rebuild per process
+        with self._lock:
+            if self._pool is None or self._pid != os.getpid():
+                if self.kind == "process":
+                    self._pool = ProcessPoolExecutor(
+                        max_workers=self.workers,
+                        mp_context=multiprocessing.get_context("spawn"),
+                        initializer=_worker_init,
+                        initargs=self._init_args,
+                    )
+                else:
+                    self._pool = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="section")
+                self._pid = os.getpid()
+            return self._pool
+
+    def _reset_pool(self) -> None:
+        with self._lock:
+            if self._pool is not None:
+                self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def shutdown(self) -> None:
+        self._reset_pool()
+
+    def timeout_for(self, section: Section) -> float:
+        if section.timeout is not None:
+            return section.timeout
+        return self.timeouts.get(section.name, self.default_timeout)
+
+    def start(self, sections: Iterable[Section]) -> SectionBatch:
+        """Dispatch all sections now; the caller keeps working and reads batch.results() later."""
+        sections = list(sections)
+        if self.kind == "inline" or self.workers <= 1 or not sections:
+            return SectionBatch(self, sections)
+        try:
+            pool = self._get_pool()
+            started = time.monotonic()
+            futures = [pool.submit(_call, s.fn, s.args) for s in sections]
+        except (BrokenProcessPool, RuntimeError) as e:
+            log.warning("section pool unavailable (%s); running inline", e)
+            self._reset_pool()
+            return SectionBatch(self, sections)
+        return SectionBatch(self, sections, futures, started)
+
+    def run(self, sections: Iterable[Section]) -> Dict[str, Any]:
+        """Run all sections; {name: result or fallback}, OMIT-fallback failures left out."""
+        return self.start(sections).results()
+
+    def _collect(self, s: Section, fut: Future, timeout: float) -> Any:
+        try:
+            return fut.result(timeout=timeout)
+        except FutureTimeout:
+            fut.cancel()
+            log.warning("section %s timed out after %.1fs", s.name, self.timeout_for(s))
+        except BrokenProcessPool as e:
+            log.warning("section %s lost its worker: %s", s.name, e)
+            self._reset_pool()
+        except Exception as e:
+            log.debug("section %s failed: %s", s.name, e)
+        return s.fallback
+
+
+_executors: Dict[tuple, SectionExecutor] = {}
+_executors_lock = threading.Lock()
+
+
+def get_executor(config) -> SectionExecutor:
+    """Process-wide executor for this app config (pools are persistent)."""
+    key = (
+        config.get("COMPUTE_EXECUTOR", "process"),
+        config.get("COMPUTE_WORKERS"),
+        float(config.get("COMPUTE_SECTION_TIMEOUT", 10.0)),
+        tuple(sorted(parse_timeouts(config.get("COMPUTE_SECTION_TIMEOUTS")).items())),
+        config.get("EPHE_PATH") or None,
+        config.get("SIDEREAL_AYANAMSA", "lahiri"),
+    )
+    with _executors_lock:
+        ex = _executors.get(key)
+        if ex is None:
+            kind, workers, timeout, timeouts, ephe, ayan = key
+            ex = SectionExecutor(
+                kind, int(workers) if workers else None,
+                default_timeout=timeout, timeouts=dict(timeouts), ephe_path=ephe, ayanamsa=ayan,
+            )
+            _executors[key] = ex
+        return ex
+
+
+@atexit.register
+def _shutdown_all() -> None:
+    for ex in list(_executors.values()):
+        ex.shutdown()
+
+
+# ---------- /compute section selection ----------
+
+# Response sections in payload order, with their cost class (see the OpenAPI
+# ComputeRequest.include docs):
+#   low    - under a millisecond, small payload
+#   medium - a few milliseconds or a sizeable payload
+#   high   - 10 ms or more (solar-return search, ACG line sampling) and/or a large payload
+# name, input, asc, rashis, sign_symbols and chart_id are always returned.
+SECTION_COST: Dict[str, str] = {
+    "table": "low",
+    "charts": "low",
+    "shadbala": "low",
+    "dasha": "medium",
+    "kundli_predictions": "medium",  # needs dasha + shadbala + vargas
+    "varsha": "high",
+    "varsha_predictions": "high",    # needs varsha
+    "acg": "high",
+    "panchanga": "low",
+    "ashtakavarga": "low",
+    "yogas": "low",
+    "avasthas": "low",
+    "aspects": "low",
+    "transits": "low",
+    "arudha": "low",
+    "upagrahas": "low",
+    "bhava_bala": "low",
+    "kp": "low",
+}
+
+
+def parse_section_names(raw) -> list:
+    """"table,charts" or ["table", "charts"] -> validated names; ValueError on unknown."""
+    if isinstance(raw, str):
+        raw = raw.split(",")
+    names = [str(n).strip().lower() for n in raw]
+    names = [n for n in dict.fromkeys(names) if n]
+    unknown = [n for n in names if n not in SECTION_COST]
+    if unknown:
+        raise ValueError(f"unknown section(s) {', '.join(unknown)}; expected any of: {', '.join(SECTION_COST)}")
+    return names
+
+
+def select_sections(include=None, exclude=None) -> list:
+    """Sections to return, in payload order: all by default, narrowed by include, minus exclude."""
+    chosen = [n for n in SECTION_COST if include is None or n in include]
+    return [n for n in chosen if n not in set(exclude or ())]
+
+
+# Request options each section's value depends on (beyond the chart itself);
+# they become part of its cache key, so changing varsha_year only misses varsha*.
+SECTION_OPTIONS: Dict[str, Tuple[str, ...]] = {
+    "charts": ("vargas",),
+    "dasha": ("format",),
+    "kundli_predictions": ("vargas",),
+    "varsha": ("varsha_year",),
+    "varsha_predictions": ("varsha_year",),
+}
+
+
+def section_key(name: str, chart_id: str, options: Dict[str, Any]) -> str:
+    """Cache key of one /compute section: "compute|<name>|<chart_id>[|opt=value...]|v=<engine version>"."""
+    parts = [f"compute|{name}|{chart_id}"]
+    parts += [f"{opt}={options[opt]}" for opt in SECTION_OPTIONS.get(name, ())]
+    parts.append(f"v={engine_version(name)}")
+    return "|".join(parts)
+
+
+class Uncached:
+    """Thunk result that is served but not stored (e.g. a timeout fallback)."""
+    __slots__ = ("value",)
+
+    def __init__(self, value: Any):
+        self.value = value
+
+
+class Thunks:
+    """
+    Named, memoized zero-argument callables: a section runs when first read.
+
+    A thunk added with a cache `key` is looked up in the shared cache first and
+    stored there after computing (unless it yields None, OMIT or Uncached, or
+    one of its `deps` was Uncached: a value built from a fallback is one too)
+    with cache_set(key, value, timeout=, cost=seconds spent building it);
+    `status` records "hit"/"miss" per keyed name, or "omitted" for a miss that
+    yielded OMIT (never stored, so it would otherwise read as a miss forever).
+    """
+
+    def __init__(self, cache_get=None, cache_set=None, ttl: int = 600):
+        self._fns: Dict[str, Callable[[], Any]] = {}
+        self._keys: Dict[str, str] = {}
+        self._deps: Dict[str, Tuple[str, ...]] = {}
+        self._values: Dict[str, Any] = {}
+        self._cache_get = cache_get
+        self._cache_set = cache_set
+        self._ttl = ttl
+        self._uncached: set = set()
+        self._costs: Dict[str, Callable[[], float]] = {}
+        self.status: Dict[str, str] = {}
+
+    def add(
+        self, name: str, fn: Callable[[], Any], key: Optional[str] = None, deps: Tuple[str, ...] = (),
+        cost: Optional[Callable[[], float]] = None,
+    ) -> None:
+        """cost: seconds spent building the value, for thunks that only collect work done elsewhere."""
+        self._fns[name] = fn
+        self._deps[name] = tuple(deps)
+        if key is not None:
+            self._keys[name] = key
+        if cost is not None:
+            self._costs[name] = cost
+
+    def _lookup(self, name: str) -> bool:
+        key = self._keys.get(name)
+        if key is None or self._cache_get is None:
+            return False
+        if name not in self.status:
+            hit = self._cache_get(key)
+            self.status[name] = "miss" if hit is None else "hit"
+            if hit is not None:
+                self._values[name] = hit
+        return self.status[name] == "hit"
+
+    def plan(self, names: Iterable[str]) -> set:
+        """Names that will have to be computed to read `names` (cache hits and their deps skipped)."""
+        todo: set = set()
+        stack = list(names)
+        while stack:
+            name = stack.pop()
+            if name in todo or name in self._values or self._lookup(name):
+                continue
+            todo.add(name)
+            stack.extend(self._deps.get(name, ()))
+        return todo
+
+    def __getitem__(self, name: str) -> Any:
+        if name not in self._values and not self._lookup(name):
+            started = time.perf_counter()
+            value = self._fns[name]()
+            if value is OMIT and name in self.status:
+                self.status[name] = "omitted"
+            if isinstance(value, Uncached):
+                value = value.value
+                self._uncached.add(name)
+            elif self._uncached.intersection(self._deps[name]):
+                self._uncached.add(name)
+            elif name in self._keys and self._cache_set is not None and value is not None and value is not OMIT:
+                # build time (incl. deps read first) drives cost-aware eviction
+                cost = self._costs[name]() if name in self._costs else time.perf_counter() - started
+                self._cache_set(self._keys[name], value, timeout=self._ttl, cost=cost)
+            self._values[name] = value
+        return self._values[name]
+
+    def evaluated(self) -> set:
+        return set(self._values)
+
+    def fallbacks(self) -> set:
+        """Evaluated names whose value was Uncached (a fallback, or built from one)."""
+        return set(self._uncached)
+
+    def settled(self) -> Dict[str, Any]:
+        """Evaluated values fit to reuse elsewhere: no fallbacks, OMIT or None."""
+        return {
+            k: v for k, v in self._values.items()
+            if k not in self._uncached and v is not None and v is not OMIT
+        }
+
+
+# ---------- /compute sections (top-level so process workers can unpickle them) ----------
+
+DASHA_FUNCS = {
+    "Vimshottari": "compute_vimsottari",
+    "Yogini": "compute_yogini",
+    "Ashtottari": "compute_ashtottari",
+    "Kalachakra": "compute_kalachakra",
+}
+
+
+def dasha_section(system: str, dt_local, tz_hours: float, moon_lon: float, layout: str = "records"):
+    from astrology import dasha
+    try:
+        return getattr(dasha, DASHA_FUNCS[system])(dt_local, tz_hours, moon_lon, layout=layout)
+    except Exception as e:
+        if system == "Kalachakra":
+            # prevent 500s; surface the issue in a structured way
+            return {"_error": f"kalachakra_failed: {e}"}
+        return {"_error": str(e)}
+
+
+def varsha_section(dt_local, tz_hours: float, lat: float, lon: float, year: int, ctx):
+    """(varsha, varsha_predictions); (None, None) when the solar return fails."""
+    from astrology.varshaphala import compute_varshaphala
+    from astrology.predictions import generate_predictions
+    varsha, varsha_predictions = None, None
+    try:
+        varsha = compute_varshaphala(dt_local, tz_hours, lat, lon, year=year, ctx=ctx)
+        if isinstance(varsha, dict):
+            varsha_predictions = generate_predictions(
+                varsha["planets"],
+                varsha["asc_idx"],
+                varsha["chalit_houses"],
+                vargas={},  # (Tajika doesn’t require vargas; keep empty or compute if you wish)
+                dasha_info=None,  # Typically Varṣaphala uses Tajika dashās; keep off here
+                strengths=None
+            )
+    except Exception as e:
+        log.warning("varshaphala failed: %s", e)
+    return varsha, varsha_predictions
+
+
+def acg_section(dt_local, tz_hours: float, ctx, layout: str = "records"):
+    from astrology.astrocartography import compute_astrocartography
+    try:
+        return compute_astrocartography(dt_local, tz_hours, ctx=ctx, layout=layout)
+    except Exception:
+        return None
+
+
+def module_section(module: str, fn_name: str, *args):
+    """Best-effort optional module: ImportError/AttributeError fail the section (omitted)."""
+    import importlib
+    return getattr(importlib.import_module(module), fn_name)(*args)
+
+
+def bhava_bala_section(chart, chalit):
+    from astrology.bhava_bala import compute_bhava_bala_enhanced, compute_bhava_bala
+    legacy = compute_bhava_bala(chart, chalit)
+    return compute_bhava_bala_enhanced(legacy, return_scale="both")
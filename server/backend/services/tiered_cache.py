@@ -0,0 +1,537 @@
+# backend/services/tiered_cache.py
+"""
+Two-tier cache shared by all gunicorn workers on a host.
+
+  L1  bounded in-process LRU (per worker), checked first.
+  L2  SQLite file in WAL mode, shared by every worker that points at the
+      same path; L2 hits are promoted into L1.
+
+Values are pickled once on set and stored as bytes in both tiers, so a
+caller can never mutate a cached object in place (as with SimpleCache).
+Pickles of compress_min_bytes or more are compressed (cache_codec: zlib or
+zstd, optionally with a shared dictionary) and L1's byte budget counts the
+compressed size, so the same memory holds several times more charts; every
+hit pays one decompression. ns_stats() reports compression_ratio and
+avg_decode_us per namespace to weigh the two.
+Timeouts follow cachelib: seconds, 0 = never expires. An L1 entry never
+outlives its L2 row.
+
+L1 is bounded by entries (l1_size) and bytes (l1_bytes) and evicts by
+GreedyDual-Size-Frequency: priority = clock + hits * cost / size, where cost
+is the seconds it took to build the value. An ACG-cities payload that took
+100x longer than /asc outlives it unless /asc is read far more often. The
+cost comes from set(..., cost=), from get_or_compute's own timing, or else
+from the time between this thread's miss on the key and its set (the parts
+endpoints' get-compute-set pattern); writes with no measurement (write-behind
+fan-out) get their namespace's average. eviction="lru" keeps plain LRU.
+Counters per namespace ("asc", "acg_cities", "node:planets",
+"compute:varsha", ...) are in ns_stats().
+
+Stale-while-revalidate: an entry is fresh for its timeout and then kept for
+up to max_stale[namespace] more seconds ("acg_cities", else its group such as
+"compute", else "*"). get()/has() only ever return fresh values; get_stale()
+also returns stale ones, with their age, for callers that serve them while
+refreshing in the background (backend/api/common.cache_get). claim() gives
+that refresh one owner across workers.
+
+get_or_compute(key, fn) adds stampede protection: concurrent misses for one
+key run fn once. Threads of a worker serialize on a per-key lock; workers
+claim the key with a lease row in L2 and the losers poll L2 for the
+winner's value (or take over when the lease expires).
+
+Without an L2 path the cache is L1-only (dev, tests). Wired in through
+Flask-Caching: CACHE_TYPE = "backend.services.tiered_cache.TieredCache";
+see config.py for CACHE_L1_SIZE, CACHE_L2_PATH and CACHE_LOCK_TIMEOUT.
+"""
+
+from __future__ import annotations
+import heapq
+import itertools
+import os
+import pickle
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from backend.services.cache_codec import Codec
+
+try:
+    from flask_caching.backends.base import BaseCache
+except Exception:  # flask-caching is optional; the cache works standalone
+    from cachelib import BaseCache  # type: ignore
+
+_SCHEMA = (
+    "CREATE TABLE IF NOT EXISTS cache (key TEXT PRIMARY KEY, expires REAL NOT NULL, value BLOB NOT NULL,"
+    " cost REAL NOT NULL DEFAULT 0, fresh REAL NOT NULL DEFAULT 0, created REAL NOT NULL DEFAULT 0)",
+    "CREATE TABLE IF NOT EXISTS leases (key TEXT PRIMARY KEY, owner TEXT NOT NULL, expires REAL NOT NULL)",
+)
+_MIGRATIONS = (  # files written by older versions
+    "ALTER TABLE cache ADD COLUMN cost REAL NOT NULL DEFAULT 0",
+    "ALTER TABLE cache ADD COLUMN fresh REAL NOT NULL DEFAULT 0",
+    "ALTER TABLE cache ADD COLUMN created REAL NOT NULL DEFAULT 0",
+)
+
+_ENTRY_OVERHEAD = 64  # bytes of key/bookkeeping charged on top of the stored (pickled, compressed) value
+_DEFAULT_COST = 0.001  # seconds, for a namespace with no measurement yet
+_GROUPED = ("node", "compute", "flight")  # namespaces split by their second segment
+
+
+def key_namespace(key: str) -> str:
+    """"asc|<cid>" -> "asc"; "node|planets|..." -> "node:planets"; "compute|varsha|..." -> "compute:varsha"."""
+    head, _, rest = key.partition("|")
+    if head in _GROUPED and rest:
+        return f"{head}:{rest.partition('|')[0]}"
+    return head
+
+
+def parse_max_stale(raw: str | Dict[str, float] | None) -> Dict[str, float]:
+    """"acg_cities=86400,compute=3600,*=600" (or a dict) -> {"acg_cities": 86400.0, ...}."""
+    if isinstance(raw, dict):
+        return {str(k): float(v) for k, v in raw.items()}
+    out: Dict[str, float] = {}
+    for item in (raw or "").split(","):
+        if item.strip():
+            ns, _, seconds = item.partition("=")
+            out[ns.strip()] = float(seconds)
+    return out
+
+
+def _is_fresh(fresh: float, expires: float, now: float) -> bool:
+    until = fresh or expires  # rows from before stale retention carry fresh = 0
+    return not until or until > now
+
+
+class _Entry:
+    __slots__ = ("expires", "blob", "cost", "hits", "seq", "fresh", "created")
+
+    def __init__(self, expires: float, blob: bytes, cost: float, hits: int, seq: int, fresh: float, created: float):
+        self.expires, self.blob, self.cost, self.hits, self.seq = expires, blob, cost, hits, seq
+        self.fresh, self.created = fresh, created  # expires = fresh + the namespace's max staleness
+
+
+class TieredCache(BaseCache):
+    def __init__(
+        self,
+        default_timeout: int = 600,
+        l1_size: int = 1024,
+        l2_path: Optional[str] = None,
+        lock_timeout: float = 30.0,
+        poll_interval: float = 0.01,
+        prune_every: int = 500,
+        l1_bytes: int = 0,
+        eviction: str = "gdsf",
+        max_stale: str | Dict[str, float] | None = None,
+        codec: Optional[Codec] = None,
+    ):
+        super().__init__(default_timeout)
+        self.l1_size = int(l1_size)
+        self.l1_bytes = int(l1_bytes)  # 0 = bounded by entry count only
+        self.eviction = (eviction or "gdsf").lower()
+        if self.eviction not in ("gdsf", "lru"):
+            raise ValueError(f"unknown eviction policy: {eviction} (gdsf | lru)")
+        self.max_stale = parse_max_stale(max_stale)
+        self.codec = codec  # None stores plain pickles
+        self.l2_path = l2_path or None
+        self.lock_timeout = float(lock_timeout)
+        self.poll_interval = float(poll_interval)
+        self.prune_every = int(prune_every)
+        self._l1: Dict[str, _Entry] = {}
+        self._heap: List[Tuple[float, int, str]] = []  # (priority, seq, key); stale items skipped lazily
+        self._seq = itertools.count()
+        self._clock = 0.0  # GDSF inflation: priority of the last evicted entry
+        self._l1_used = 0  # bytes charged to L1
+        self._l1_lock = threading.Lock()
+        self._ns: Dict[str, Dict[str, float]] = {}
+        self._key_locks: Dict[str, list] = {}  # key -> [lock, waiters]
+        self._key_locks_lock = threading.Lock()
+        self._local = threading.local()
+        self._writes = 0
+        self.stats: Dict[str, int] = {"l1_hits": 0, "l2_hits": 0, "misses": 0, "computes": 0, "waits": 0}
+        if self.l2_path:
+            self._db()  # create the schema up front
+
+    @classmethod
+    def factory(cls, app, config, args, kwargs):
+        kwargs.update(
+            l1_size=config.get("CACHE_L1_SIZE", 1024),
+            l1_bytes=config.get("CACHE_L1_BYTES", 0),
+            eviction=config.get("CACHE_EVICTION", "gdsf"),
+            max_stale=config.get("CACHE_MAX_STALE"),
+            codec=Codec.from_config(
+                config.get("CACHE_COMPRESS", "none"),
+                level=config.get("CACHE_COMPRESS_LEVEL", 1),
+                min_bytes=config.get("CACHE_COMPRESS_MIN_BYTES", 1024),
+                dict_path=config.get("CACHE_COMPRESS_DICT") or None,
+            ),
+            l2_path=config.get("CACHE_L2_PATH") or None,
+            lock_timeout=config.get("CACHE_LOCK_TIMEOUT", 30.0),
+        )
+        return cls(*args, **kwargs)
+
+    # ---------- L2 ----------
+
+    def _db(self) -> sqlite3.Connection:
+        # one connection per thread, reopened after fork
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.l2_path, timeout=self.lock_timeout, isolation_level=None)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            for stmt in _SCHEMA:
+                conn.execute(stmt)
+            for stmt in _MIGRATIONS:
+                try:
+                    conn.execute(stmt)
+                except sqlite3.OperationalError:  # column already there
+                    pass
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _l2_get(self, key: str, now: float) -> Optional[Tuple[float, bytes, float, float, float]]:
+        """(expires, blob, cost, fresh, created) of a row that is fresh or still within its staleness."""
+        row = self._db().execute(
+            "SELECT expires, value, cost, fresh, created FROM cache WHERE key = ?", (key,)
+        ).fetchone()
+        if row is None or (row[0] and row[0] <= now):
+            return None
+        return row
+
+    def _l2_prune(self, now: float) -> None:
+        db = self._db()
+        db.execute("DELETE FROM cache WHERE expires > 0 AND expires <= ?", (now,))
+        db.execute("DELETE FROM leases WHERE expires <= ?", (now,))
+
+    # ---------- L1 ----------
+
+    def _priority(self, e: _Entry) -> float:
+        if self.eviction == "lru":
+            return float(e.seq)
+        return self._clock + e.hits * e.cost / (len(e.blob) + _ENTRY_OVERHEAD)
+
+    def _touch(self, key: str, e: _Entry) -> None:
+        e.seq = next(self._seq)
+        heapq.heappush(self._heap, (self._priority(e), e.seq, key))
+        if len(self._heap) > 2 * len(self._l1) + 64:
+            self._heap = [(p, q, k) for p, q, k in self._heap if k in self._l1 and self._l1[k].seq == q]
+            heapq.heapify(self._heap)
+
+    def _l1_drop(self, key: str) -> _Entry:
+        e = self._l1.pop(key)
+        self._l1_used -= len(e.blob) + _ENTRY_OVERHEAD
+        return e
+
+    def _l1_get(self, key: str, now: float) -> Optional[_Entry]:
+        with self._l1_lock:
+            e = self._l1.get(key)
+            if e is None:
+                return None
+            if e.expires and e.expires <= now:
+                self._l1_drop(key)
+                return None
+            e.hits += 1
+            self._touch(key, e)
+            return e
+
+    def _l1_put(
+        self, key: str, expires: float, blob: bytes, cost: float, fresh: float = 0.0, created: float = 0.0
+    ) -> None:
+        size = len(blob) + _ENTRY_OVERHEAD
+        if self.l1_size <= 0 or (self.l1_bytes and size > self.l1_bytes):
+            return
+        with self._l1_lock:
+            old = self._l1_drop(key) if key in self._l1 else None
+            e = _Entry(expires, blob, cost, old.hits if old else 1, 0, fresh, created)
+            self._l1[key] = e
+            self._l1_used += size
+            self._touch(key, e)
+            while len(self._l1) > self.l1_size or (self.l1_bytes and self._l1_used > self.l1_bytes):
+                prio, seq, victim = heapq.heappop(self._heap)
+                ve = self._l1.get(victim)
+                if ve is None or ve.seq != seq:
+                    continue  # superseded heap item
+                self._l1_drop(victim)
+                if self.eviction == "gdsf":
+                    self._clock = prio
+                self._ns_stats(victim)["evictions"] += 1
+
+    # ---------- cost accounting ----------
+
+    def _ns_stats(self, key: str) -> Dict[str, float]:
+        ns = key_namespace(key)
+        st = self._ns.get(ns)
+        if st is None:
+            st = self._ns[ns] = {
+                "hits": 0, "stale_hits": 0, "misses": 0, "sets": 0, "evictions": 0,
+                "measured": 0, "compute_s": 0.0, "bytes_set": 0, "raw_bytes_set": 0,
+                "compressed": 0, "encode_s": 0.0, "decodes": 0, "decode_s": 0.0,
+            }
+        return st
+
+    def _miss_marks(self) -> Dict[str, float]:
+        marks = getattr(self._local, "misses", None)
+        if marks is None or len(marks) > 256:  # misses never followed by a set
+            marks = self._local.misses = {}
+        return marks
+
+    def _cost_for(self, key: str, st: Dict[str, float]) -> float:
+        """Seconds since this thread missed `key`, else the namespace's average build time."""
+        started = self._miss_marks().pop(key, None)
+        if started is not None:
+            cost = time.perf_counter() - started
+            st["measured"] += 1
+            st["compute_s"] += cost
+            return cost
+        return st["compute_s"] / st["measured"] if st["measured"] else _DEFAULT_COST
+
+    def ns_stats(self) -> Dict[str, Dict[str, float]]:
+        """
+        Per-namespace counters, with avg_compute_ms / avg_bytes to weigh eviction cost
+        against size, and compression_ratio (pickled / stored bytes) / avg_decode_us
+        to weigh memory saved against the CPU each hit spends decompressing.
+        """
+        out = {}
+        with self._l1_lock:
+            resident: Dict[str, List[int]] = {}
+            for k, e in self._l1.items():
+                r = resident.setdefault(key_namespace(k), [0, 0])
+                r[0] += 1
+                r[1] += len(e.blob)
+        for ns, st in sorted(self._ns.items()):
+            row = dict(st)
+            row["avg_compute_ms"] = round(1000 * st["compute_s"] / st["measured"], 3) if st["measured"] else None
+            row["avg_bytes"] = int(st["bytes_set"] / st["sets"]) if st["sets"] else None
+            row["compression_ratio"] = round(st["raw_bytes_set"] / st["bytes_set"], 3) if st["bytes_set"] else None
+            row["avg_decode_us"] = round(1e6 * st["decode_s"] / st["decodes"], 1) if st["decodes"] else None
+            row["encode_s"], row["decode_s"] = round(st["encode_s"], 6), round(st["decode_s"], 6)
+            row["l1_entries"], row["l1_bytes"] = resident.get(ns, (0, 0))
+            row["compute_s"] = round(st["compute_s"], 6)
+            out[ns] = row
+        return out
+
+    # ---------- (de)serialization ----------
+
+    def _dumps(self, value: Any, st: Dict[str, float]) -> bytes:
+        blob = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        st["raw_bytes_set"] += len(blob)
+        if self.codec is not None and len(blob) >= self.codec.min_bytes:
+            started = time.perf_counter()
+            stored = self.codec.encode(blob)
+            st["encode_s"] += time.perf_counter() - started
+            if stored is not blob:
+                st["compressed"] += 1
+            blob = stored
+        return blob
+
+    def _loads(self, key: str, blob: bytes) -> Any:
+        """Unpickled value; raises for a blob this codec cannot read (callers treat it as a miss)."""
+        if Codec.is_compressed(blob):
+            if self.codec is None:
+                raise ValueError("compressed cache blob but compression is off")
+            started = time.perf_counter()
+            blob = self.codec.decode(blob)
+            st = self._ns_stats(key)
+            st["decodes"] += 1
+            st["decode_s"] += time.perf_counter() - started
+        return pickle.loads(blob)
+
+    # ---------- cachelib API ----------
+
+    def _expires(self, timeout: Optional[int], now: float) -> float:
+        timeout = self._normalize_timeout(timeout)
+        return now + timeout if timeout > 0 else 0.0
+
+    def _stale_for(self, key: str) -> float:
+        ns = key_namespace(key)
+        for name in (ns, ns.partition(":")[0], "*"):
+            if name in self.max_stale:
+                return self.max_stale[name]
+        return 0.0
+
+    def _lookup(self, key: str, now: float) -> Optional[Tuple[str, bytes, bool, float]]:
+        """(tier, blob, fresh?, created) from L1, else from L2 (promoted into L1)."""
+        e = self._l1_get(key, now)
+        if e is not None:
+            return "l1", e.blob, _is_fresh(e.fresh, e.expires, now), e.created
+        if self.l2_path:
+            row = self._l2_get(key, now)
+            if row is not None:
+                expires, blob, cost, fresh, created = row
+                self._l1_put(key, expires, blob, cost, fresh, created)
+                return "l2", blob, _is_fresh(fresh, expires, now), created
+        return None
+
+    def _get_blob(self, key: str, stale_ok: bool = False) -> Optional[Tuple[bytes, bool, float]]:
+        """(blob, fresh?, created); stale entries only with stale_ok, else they count as misses."""
+        now = time.time()
+        hit = self._lookup(key, now)
+        st = self._ns_stats(key)
+        if hit is not None and (hit[2] or stale_ok):
+            tier, blob, fresh, created = hit
+            self.stats[f"{tier}_hits"] += 1
+            st["hits" if fresh else "stale_hits"] += 1
+            return blob, fresh, created
+        self.stats["misses"] += 1
+        st["misses"] += 1
+        self._miss_marks()[key] = time.perf_counter()
+        return None
+
+    def get(self, key: str) -> Any:
+        hit = self._get_blob(key)
+        if hit is None:
+            return None
+        try:
+            return self._loads(key, hit[0])
+        except Exception:
+            return None
+
+    def get_stale(self, key: str) -> Optional[Tuple[Any, float, bool]]:
+        """(value, age in seconds, stale?) for a fresh entry or one within its max staleness."""
+        hit = self._get_blob(key, stale_ok=True)
+        if hit is None:
+            return None
+        blob, fresh, created = hit
+        try:
+            value = self._loads(key, blob)
+        except Exception:
+            return None
+        return value, max(0.0, time.time() - created) if created else 0.0, not fresh
+
+    def set(self, key: str, value: Any, timeout: Optional[int] = None, cost: Optional[float] = None) -> bool:
+        """cost: seconds it took to build `value` (measured or estimated when None)."""
+        now = time.time()
+        fresh = self._expires(timeout, now)
+        stale_for = self._stale_for(key) if fresh else 0.0
+        expires = fresh + stale_for if stale_for > 0 else fresh  # kept this long for get_stale()
+        st = self._ns_stats(key)
+        blob = self._dumps(value, st)
+        if cost is None:
+            cost = self._cost_for(key, st)
+        else:
+            self._miss_marks().pop(key, None)
+            st["measured"] += 1
+            st["compute_s"] += cost
+        st["sets"] += 1
+        st["bytes_set"] += len(blob)
+        self._l1_put(key, expires, blob, cost, fresh, now)
+        if self.l2_path:
+            self._db().execute(
+                "INSERT OR REPLACE INTO cache (key, expires, value, cost, fresh, created) VALUES (?, ?, ?, ?, ?, ?)",
+                (key, expires, blob, cost, fresh, now),
+            )
+            self._writes += 1
+            if self.prune_every and self._writes % self.prune_every == 0:
+                self._l2_prune(now)
+        return True
+
+    def add(self, key: str, value: Any, timeout: Optional[int] = None) -> bool:
+        if self.has(key):
+            return False
+        return self.set(key, value, timeout)
+
+    def has(self, key: str) -> bool:
+        hit = self._lookup(key, time.time())
+        return hit is not None and hit[2]
+
+    def delete(self, key: str) -> bool:
+        with self._l1_lock:
+            existed = key in self._l1
+            if existed:
+                self._l1_drop(key)
+        if self.l2_path:
+            existed = self._db().execute("DELETE FROM cache WHERE key = ?", (key,)).rowcount > 0 or existed
+        return existed
+
+    def clear(self) -> bool:
+        with self._l1_lock:
+            self._l1.clear()
+            self._heap.clear()
+            self._l1_used = 0
+        if self.l2_path:
+            self._db().execute("DELETE FROM cache")
+        return True
+
+    # ---------- stampede protection ----------
+
+    @contextmanager
+    def _key_lock(self, key: str):
+        with self._key_locks_lock:
+            entry = self._key_locks.setdefault(key, [threading.Lock(), 0])
+            entry[1] += 1
+        try:
+            with entry[0]:
+                yield
+        finally:
+            with self._key_locks_lock:
+                entry[1] -= 1
+                if not entry[1]:
+                    self._key_locks.pop(key, None)
+
+    def _lease(self, key: str, owner: str) -> bool:
+        """Claim `key` across workers; False while another worker holds a live lease."""
+        now = time.time()
+        db = self._db()
+        db.execute("DELETE FROM leases WHERE key = ? AND expires <= ?", (key, now))
+        cur = db.execute(
+            "INSERT OR IGNORE INTO leases (key, owner, expires) VALUES (?, ?, ?)",
+            (key, owner, now + self.lock_timeout),
+        )
+        return cur.rowcount == 1
+
+    def _release(self, key: str, owner: str) -> None:
+        self._db().execute("DELETE FROM leases WHERE key = ? AND owner = ?", (key, owner))
+
+    def _leased(self, key: str) -> bool:
+        row = self._db().execute("SELECT expires FROM leases WHERE key = ?", (key,)).fetchone()
+        return row is not None and row[0] > time.time()
+
+    def claim(self, key: str) -> Optional[str]:
+        """
+        Claim `key` for one caller across workers (up to lock_timeout): owner token, or
+        None if taken. Without L2 every claim succeeds; callers dedupe within the worker.
+        """
+        owner = uuid.uuid4().hex
+        if self.l2_path and not self._lease(key, owner):
+            return None
+        return owner
+
+    def release(self, key: str, owner: str) -> None:
+        if self.l2_path:
+            self._release(key, owner)
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any], timeout: Optional[int] = None) -> Any:
+        """Cached value for key, else compute() once across threads and workers (None is not stored)."""
+        value = self.get(key)
+        if value is not None:
+            return value
+        with self._key_lock(key):
+            value = self.get(key)
+            if value is not None:
+                return value
+            owner = None
+            if self.l2_path:
+                owner = uuid.uuid4().hex
+                while not self._lease(key, owner):
+                    # another worker is computing it: wait for its value or its lease to lapse
+                    self.stats["waits"] += 1
+                    while True:
+                        now = time.time()
+                        hit = self._l2_get(key, now)
+                        if hit is not None and _is_fresh(hit[3], hit[0], now):
+                            self._l1_put(key, *hit)
+                            return self._loads(key, hit[1])
+                        if not self._leased(key):
+                            break
+                        time.sleep(self.poll_interval)
+            try:
+                self.stats["computes"] += 1
+                started = time.perf_counter()
+                value = compute()
+                if value is not None:
+                    self.set(key, value, timeout, cost=time.perf_counter() - started)
+                return value
+            finally:
+                if owner is not None:
+                    self._release(key, owner)
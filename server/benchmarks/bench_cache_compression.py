@@ -0,0 +1,108 @@
+# benchmarks/bench_cache_compression.py
+"""
+Cache value compression (backend/services/cache_codec.py): fills a cache
+through /compute for random charts, then per namespace reports how much the
+stored bytes shrink and what each hit pays to decompress, with and without a
+shared dictionary trained on the first half of the charts (measured on the
+second half). --write-dict saves that dictionary for CACHE_COMPRESS_DICT.
+
+    cd server && python -m benchmarks.bench_cache_compression [n_charts] [--write-dict path]
+"""
+
+from __future__ import annotations
+import contextlib
+import io
+import json
+import logging
+import os
+import random
+import sys
+import time
+from collections import defaultdict
+from typing import Dict, List
+
+os.environ.setdefault("COMPUTE_EXECUTOR", "inline")
+os.environ["CACHE_COMPRESS"] = "none"  # collect plain pickles; the codecs are applied below
+os.environ["CACHE_L1_SIZE"] = "1000000"
+os.environ["CACHE_L1_BYTES"] = "0"
+
+from backend.services.cache_codec import Codec, train_dictionary, zstandard
+from backend.services.tiered_cache import key_namespace
+
+
+def collect(n: int, seed: int = 11) -> List[Dict[str, bytes]]:
+    """Pickled cache entries written by /compute (and its fan-out), one {key: blob} per chart."""
+    from app import create_app
+    from backend.api.common import write_behind_flush
+    logging.disable(logging.INFO)
+    app = create_app()
+    client = app.test_client()
+    cache = next(iter(app.extensions["cache"].values()))
+    rng = random.Random(seed)
+    out = []
+    for _ in range(n):
+        cache.clear()
+        body = {
+            "dob": f"{rng.randint(1940, 2020)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+            "tob": f"{rng.randint(0, 23):02d}:{rng.randint(0, 59):02d}",
+            "tz": rng.choice(["+05:30", "+00:00", "-05:00", "+01:00", "+09:00"]),
+            "lat": round(rng.uniform(-50, 60), 4), "lon": round(rng.uniform(-120, 140), 4),
+        }
+        with contextlib.redirect_stdout(io.StringIO()):
+            client.post("/api/v1/compute", data=json.dumps(body), content_type="application/json")
+            write_behind_flush()
+        out.append({k: e.blob for k, e in cache._l1.items()})
+    return out
+
+
+def _decode_us(codec: Codec, blobs: List[bytes]) -> float:
+    stored = [codec.encode(b) for b in blobs]
+    t0 = time.perf_counter()
+    for s in stored:
+        codec.decode(s)
+    return (time.perf_counter() - t0) / len(stored) * 1e6
+
+
+def main() -> None:
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    n = int(args[0]) if args else 40
+    dict_path = sys.argv[sys.argv.index("--write-dict") + 1] if "--write-dict" in sys.argv else None
+    charts = collect(n)
+    train, test = charts[: n // 2], charts[n // 2:]
+    samples = [b for c in train for b in c.values()]
+    codecs = {"zlib": Codec("zlib")}
+    codecs["zlib+dict"] = Codec("zlib", dictionary=train_dictionary(samples))
+    if zstandard is not None:
+        codecs["zstd"] = Codec("zstd", level=3)
+        codecs["zstd+dict"] = Codec("zstd", level=3, dictionary=train_dictionary(samples, 64 * 1024, "zstd"))
+
+    by_ns: Dict[str, List[bytes]] = defaultdict(list)
+    for chart in test:
+        for key, blob in chart.items():
+            by_ns[key_namespace(key)].append(blob)
+    raw_total = sum(len(b) for bs in by_ns.values() for b in bs)
+    print(f"{len(test)} charts measured ({len(train)} trained the dictionaries); "
+          f"{raw_total / len(test) / 1024:.1f} KiB of pickles per chart")
+    print(f"  {'namespace':28s} {'avg B':>7s}  " + "  ".join(f"{c:>18s}" for c in codecs) + "   (ratio / decode us)")
+    stored_total = dict.fromkeys(codecs, 0)
+    for ns, blobs in sorted(by_ns.items(), key=lambda kv: -sum(map(len, kv[1]))):
+        raw = sum(map(len, blobs))
+        cells = []
+        for name, codec in codecs.items():
+            stored = sum(len(codec.encode(b)) for b in blobs)
+            stored_total[name] += stored
+            cells.append(f"{raw / stored:7.2f}x {_decode_us(codec, blobs):7.1f}us")
+        print(f"  {ns:28s} {raw // len(blobs):7d}  " + "  ".join(f"{c:>18s}" for c in cells))
+    print("resident charts per GiB of L1 (stored bytes + 64 B per entry):")
+    entries = sum(len(bs) for bs in by_ns.values()) / len(test)
+    per_chart = {"none": raw_total / len(test)} | {c: t / len(test) for c, t in stored_total.items()}
+    for name, size in per_chart.items():
+        print(f"  {name:10s} {2 ** 30 / (size + 64 * entries):9.0f}")
+    if dict_path:
+        with open(dict_path, "wb") as fh:
+            fh.write(codecs["zlib+dict"].dictionary)
+        print(f"wrote {dict_path} ({len(codecs['zlib+dict'].dictionary)} B; CACHE_COMPRESS_DICT={dict_path})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+# benchmarks/bench_cache_eviction.py
+"""
+L1 eviction policy (TieredCache, eviction="lru" vs "gdsf") under a fixed byte
+budget: replays a Zipf-distributed stream of chart requests whose entries
+carry the build time and size measured per namespace (/api/v1/cache/stats,
+"namespaces") and reports hit ratio and the CPU seconds spent rebuilding.
+
+    cd server && python -m benchmarks.bench_cache_eviction [n_requests] [l1_kib]
+"""
+
+from __future__ import annotations
+import random
+import sys
+
+from backend.services.tiered_cache import TieredCache
+
+# namespace -> (build ms, payload bytes, share of requests that read it); avg_compute_ms / avg_bytes on a 1-CPU host
+PROFILE = {
+    "asc": (3.9, 127, 0.9),
+    "houses": (0.2, 238, 0.6),
+    "planets": (2.7, 479, 0.9),
+    "shadbala": (5.9, 3114, 0.4),
+    "dasha": (11.5, 13763, 0.5),
+    "varsha": (14.8, 3897, 0.2),
+    "node:acg": (4.9, 170067, 0.3),
+    "acg_cities": (951.3, 8465, 0.1),
+}
+
+
+def replay(policy: str, n: int, l1_bytes: int, charts: int = 2000, seed: int = 7) -> dict:
+    rng = random.Random(seed)
+    weights = [1.0 / (i + 1) for i in range(charts)]  # Zipf(1): a few charts are shared widely
+    cache = TieredCache(l1_size=100_000, l1_bytes=l1_bytes, eviction=policy)
+    blobs = {ns: b"x" * size for ns, (_, size, _) in PROFILE.items()}
+    reads = hits = 0
+    rebuild_s = 0.0
+    for cid in rng.choices(range(charts), weights, k=n):
+        for ns, (ms, _, share) in PROFILE.items():
+            if rng.random() >= share:
+                continue
+            key = f"{ns}|{cid}"
+            reads += 1
+            if cache.get(key) is not None:
+                hits += 1
+                continue
+            rebuild_s += ms / 1000.0
+            cache.set(key, blobs[ns], cost=ms / 1000.0)
+    return {"hit_ratio": hits / reads, "rebuild_s": rebuild_s}
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    budget = (int(sys.argv[2]) if len(sys.argv) > 2 else 4096) * 1024
+    print(f"{n} chart requests, L1 budget {budget // 1024} KiB")
+    for policy in ("lru", "gdsf"):
+        r = replay(policy, n, budget)
+        print(f"  {policy:5s} hit ratio {r['hit_ratio']:.3f}   rebuild CPU {r['rebuild_s']:8.1f} s")
+
+
+if __name__ == "__main__":
+    main()
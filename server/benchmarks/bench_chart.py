@@ -0,0 +1,65 @@
+# benchmarks/bench_chart.py
+"""
+Strength/yoga modules fed the legacy planets dict vs a shared Chart.
+
+    cd server && python -m benchmarks.bench_chart [n_calls]
+"""
+
+from __future__ import annotations
+import sys
+import time
+import tracemalloc
+from datetime import datetime
+
+from astrology import swe_utils as su
+from astrology.context import ChartContext
+from astrology.shadbala import compute_shadbala
+from astrology.yogas import detect_yogas
+from astrology.aspects import compute_aspects
+from astrology.arudha import compute_arudha
+from astrology.bhava_bala import compute_bhava_bala
+
+
+def _best(fn, n: int, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        for _ in range(n):
+            fn()
+        best = min(best, time.perf_counter() - t0)
+    return best / n
+
+
+def _peak(fn) -> int:
+    """Peak traced bytes during one call."""
+    fn()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main(n: int = 500) -> None:
+    su.init(ayanamsa="lahiri")
+    ctx = ChartContext.build(datetime(1984, 9, 24, 17, 30), 5.5, 26.76, 83.37)
+    planets, asc_idx, chalit, chart = ctx.planets, ctx.asc_idx, ctx.chalit_houses, ctx.chart
+
+    cases = {
+        "shadbala": lambda p: compute_shadbala(p, asc_idx, chalit, local_hour=17),
+        "yogas": lambda p: detect_yogas(p, asc_idx),
+        "aspects": lambda p: compute_aspects(p, asc_idx, chalit),
+        "arudha": lambda p: compute_arudha(p, asc_idx, chalit),
+        "bhava_bala": lambda p: compute_bhava_bala(p, chalit),
+    }
+    print(f"n_calls={n}")
+    for name, fn in cases.items():
+        t_dict = _best(lambda: fn(planets), n)
+        t_chart = _best(lambda: fn(chart), n)
+        print(f"  {name:10s} dict {t_dict * 1e6:7.1f} us   chart {t_chart * 1e6:7.1f} us   x{t_dict / t_chart:.1f}")
+    everything = lambda p: [fn(p) for fn in cases.values()]
+    print(f"  all five   dict peak {_peak(lambda: everything(planets))} B   chart peak {_peak(lambda: everything(chart))} B")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 500)
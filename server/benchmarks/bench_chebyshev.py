@@ -0,0 +1,58 @@
+# benchmarks/bench_chebyshev.py
+"""
+Swiss Ephemeris provider vs Chebyshev provider on a time scan.
+
+    cd server && python -m benchmarks.bench_chebyshev [n_times]
+
+Uses $CHEB_EPHE_PATH when set, otherwise builds a 2024-2026 store in a temp dir.
+"""
+
+from __future__ import annotations
+import os
+import sys
+import tempfile
+import time
+import datetime as dt
+
+import numpy as np
+
+from predictions.core.ephemeris import SwissEphemerisProvider
+from predictions.core.chebyshev import ChebyshevEphemerisProvider, build_coefficients
+
+PLANETS = ("SUN", "MOON", "MARS", "JUPITER", "SATURN", "RAHU")
+
+
+def _best(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(n: int = 5000) -> None:
+    path = os.getenv("CHEB_EPHE_PATH")
+    if not path:
+        path = os.path.join(tempfile.mkdtemp(), "cheb.npy")
+        build_coefficients(path, 2024, 2026)
+    swiss = SwissEphemerisProvider(ayanamsa="lahiri")
+    cheb = ChebyshevEphemerisProvider(path)
+
+    start = dt.datetime(2024, 1, 1, tzinfo=dt.timezone.utc)
+    whens = [start + dt.timedelta(minutes=10 * k) for k in range(n)]
+    jds = np.array([w.timestamp() for w in whens]) / 86400.0 + 2440587.5
+
+    t_swe = _best(lambda: [swiss.planet_longitudes(whens, p, None, "lahiri") for p in PLANETS])
+    t_cheb = _best(lambda: [cheb.planet_longitudes(whens, p, None, "lahiri") for p in PLANETS])
+    t_jd = _best(lambda: [cheb.longitudes_jd(jds, p, "lahiri") for p in PLANETS])
+
+    k = n * len(PLANETS)
+    print(f"n_times={n} bodies={len(PLANETS)}")
+    print(f"  swiss planet_longitudes : {t_swe * 1e3:8.1f} ms  ({t_swe / k * 1e6:6.2f} us/eval)")
+    print(f"  cheb  planet_longitudes : {t_cheb * 1e3:8.1f} ms  ({t_cheb / k * 1e6:6.2f} us/eval)  x{t_swe / t_cheb:.1f}")
+    print(f"  cheb  longitudes_jd     : {t_jd * 1e3:8.1f} ms  ({t_jd / k * 1e6:6.2f} us/eval)  x{t_swe / t_jd:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 5000)
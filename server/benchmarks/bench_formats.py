@@ -0,0 +1,57 @@
+# benchmarks/bench_formats.py
+"""
+Response encodings (backend/services/response_formats.py) on the demo chart:
+encoded size (raw and gzip -6, what a proxy would send), encode and decode
+time per format, for the whole /compute payload and its two largest sections.
+
+    cd server && python -m benchmarks.bench_formats [n_runs]
+"""
+
+from __future__ import annotations
+import gzip
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, Tuple
+
+from benchmarks.bench_json import demo_payload
+from backend.services import json_stream
+from backend.services.response_formats import cbor2, msgpack
+
+
+def formats() -> Dict[str, Tuple[Callable[[Any], bytes], Callable[[bytes], Any]]]:
+    """name -> (encode, decode); the ones whose packages are missing are left out."""
+    out = {"json (stdlib)": (lambda o: json.dumps(o, sort_keys=True).encode(), json.loads)}
+    if json_stream.orjson is not None:
+        out["json (orjson)"] = (json_stream.dumps, json_stream.orjson.loads)
+    if msgpack is not None:
+        out["msgpack"] = (lambda o: msgpack.packb(o, use_bin_type=True),
+                          lambda b: msgpack.unpackb(b, strict_map_key=False))
+    if cbor2 is not None:
+        out["cbor"] = (cbor2.dumps, cbor2.loads)
+    return out
+
+
+def _best(fn, n: int) -> float:
+    best = float("inf")
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    _, payload = demo_payload()
+    docs = {"/compute": payload, "acg": payload["acg"], "dasha": payload["dasha"]}
+    print(f"  {'document':10s} {'format':14s} {'bytes':>9s} {'gzip':>8s} {'encode ms':>10s} {'decode ms':>10s}")
+    for doc_name, doc in docs.items():
+        for name, (encode, decode) in formats().items():
+            blob = encode(doc)
+            print(f"  {doc_name:10s} {name:14s} {len(blob):9d} {len(gzip.compress(blob, 6)):8d} "
+                  f"{_best(lambda: encode(doc), n) * 1e3:10.2f} {_best(lambda: decode(blob), n) * 1e3:10.2f}")
+
+
+if __name__ == "__main__":
+    main()
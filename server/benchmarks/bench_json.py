@@ -0,0 +1,86 @@
+# benchmarks/bench_json.py
+"""
+Encoding the /compute response of the demo chart (the one in the compute()
+docstring, every section, one extra ayanamsa): Flask's stdlib jsonify vs the
+fast path (backend/services/json_stream.py, orjson when installed) vs the
+streamed response. Reports time per response and the peak memory traced
+while encoding (the payload itself is built beforehand and not counted).
+
+    cd server && python -m benchmarks.bench_json [n_runs]
+"""
+
+from __future__ import annotations
+import contextlib
+import io
+import logging
+import os
+import sys
+import time
+import tracemalloc
+
+os.environ.setdefault("COMPUTE_EXECUTOR", "inline")
+
+from flask.json.provider import DefaultJSONProvider
+
+from backend.services import json_stream
+
+DEMO = {
+    "dob": "1984-09-24", "tob": "17:30", "tz": "+05:30", "lat": 26.7606, "lon": 83.3732,
+    "varsha_year": 2027, "ayanamsas": ["raman"],
+}
+
+
+def demo_payload():
+    from app import create_app
+    from backend.api.v1 import ComputeRequest, _build_payload, _init_engines
+    logging.disable(logging.INFO)
+    app = create_app()
+    app.config["COMPUTE_FANOUT"] = False
+    with app.test_request_context(), contextlib.redirect_stdout(io.StringIO()):
+        _init_engines()
+        payload, _, _ = _build_payload(ComputeRequest.model_validate(DEMO))
+    return app, payload
+
+
+def _drain(resp) -> int:
+    return sum(len(chunk) for chunk in resp.response)
+
+
+def _best(fn, n: int) -> float:
+    best = float("inf")
+    for _ in range(n):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def _peak(fn) -> int:
+    fn()
+    tracemalloc.start()
+    fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def main() -> None:
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 30
+    app, payload = demo_payload()
+    stdlib = DefaultJSONProvider(app)
+    stdlib.compact = True  # what production (DEBUG off) sends
+    with app.app_context():
+        size = _drain(stdlib.response(payload))
+        cases = {
+            "jsonify (stdlib)": lambda: _drain(stdlib.response(payload)),
+            "fast path, whole": lambda: _drain(json_stream.json_response(payload, stream_min_bytes=0)),
+            "fast path, streamed": lambda: _drain(json_stream.json_response(payload, stream_min_bytes=1)),
+        }
+        print(f"demo chart /compute payload: {size / 1024:.0f} KiB as stdlib JSON; "
+              f"orjson {'installed' if json_stream.orjson is not None else 'missing (stdlib fallback)'}")
+        for name, fn in cases.items():
+            print(f"  {name:22s} {_best(fn, n) * 1e3:7.2f} ms   peak {_peak(fn) / 1024:7.0f} KiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+# benchmarks/bench_planets_batch.py
+"""
+Per-call compute_planets vs compute_planets_batch over a time scan.
+
+    cd server && python -m benchmarks.bench_planets_batch [n_times]
+"""
+
+from __future__ import annotations
+import sys
+import time
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from astrology import swe_utils as su
+from astrology.planets import compute_planets, compute_planets_batch
+
+
+def _best(fn, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - t0)
+    return best
+
+
+def main(n: int = 2000) -> None:
+    su.init(ayanamsa="lahiri")
+    start = datetime(2024, 1, 1)
+    times = [start + timedelta(hours=h) for h in range(n)]
+    jds = su.to_julian_day(start, 0.0) + np.arange(n) / 24.0
+
+    per_call = _best(lambda: [compute_planets(t, 0.0, 0.0, 0.0) for t in times])
+    batch = _best(lambda: compute_planets_batch(jds, ayanamsa="lahiri"))
+    sun_only = _best(lambda: compute_planets_batch(jds, ("Sun",), ayanamsa="lahiri"))
+
+    print(f"n_times={n}")
+    print(f"  compute_planets (per call) : {per_call * 1e3:8.1f} ms  ({per_call / n * 1e6:6.1f} us/time)")
+    print(f"  compute_planets_batch (all): {batch * 1e3:8.1f} ms  ({batch / n * 1e6:6.1f} us/time)  x{per_call / batch:.1f}")
+    print(f"  compute_planets_batch (Sun): {sun_only * 1e3:8.1f} ms  ({sun_only / n * 1e6:6.1f} us/time)  x{per_call / sun_only:.1f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 2000)
@@ -9,12 +9,50 @@ class Base:
     RATE_LIMIT_API = os.getenv("RATE_LIMIT_API", "60 per minute")
     RATE_LIMIT_COMPUTE = os.getenv("RATE_LIMIT_COMPUTE", "25 per minute")
     EPHE_PATH = os.getenv("EPHE_PATH", "")  # Swiss ephemeris dir; optional
+    # Shared cache (backend/services/tiered_cache.py): per-worker LRU in front of a SQLite
+    # file that all workers on the host share; empty CACHE_L2_PATH -> in-process only
+    CACHE_TYPE = os.getenv("CACHE_TYPE", "backend.services.tiered_cache.TieredCache")
+    CACHE_DEFAULT_TIMEOUT = 600
+    CACHE_L1_SIZE = int(os.getenv("CACHE_L1_SIZE", "1024"))
+    CACHE_L1_BYTES = int(os.getenv("CACHE_L1_BYTES", str(64 * 1024 * 1024)))  # per worker; 0 = entries only
+    CACHE_EVICTION = os.getenv("CACHE_EVICTION", "gdsf")  # gdsf (cost/size/frequency aware) | lru
+    # stale-while-revalidate: seconds an expired entry may still be served (then refreshed in the
+    # background), per namespace / group / "*"; 0 = never stale. Graph nodes and flights stay strict.
+    CACHE_MAX_STALE = os.getenv(
+        "CACHE_MAX_STALE", "*=3600,acg_cities=86400,varsha=86400,varsha_details=86400,node=0,flight=0,chart_inputs=0"
+    )
+    CACHE_REVALIDATE_WORKERS = int(os.getenv("CACHE_REVALIDATE_WORKERS", "1"))
+    # compression of cached values (backend/services/cache_codec.py); L1_BYTES counts compressed bytes
+    CACHE_COMPRESS = os.getenv("CACHE_COMPRESS", "zlib")  # zlib | zstd (needs zstandard) | none
+    CACHE_COMPRESS_LEVEL = int(os.getenv("CACHE_COMPRESS_LEVEL", "1"))
+    CACHE_COMPRESS_MIN_BYTES = int(os.getenv("CACHE_COMPRESS_MIN_BYTES", "1024"))  # smaller pickles stay raw
+    CACHE_COMPRESS_DICT = os.getenv("CACHE_COMPRESS_DICT", "")  # shared dictionary file (bench_cache_compression)
+    CACHE_L2_PATH = os.getenv("CACHE_L2_PATH", "")
+    CACHE_LOCK_TIMEOUT = float(os.getenv("CACHE_LOCK_TIMEOUT", "30"))  # stampede lease, seconds
+    CHART_LATLON_DECIMALS = int(os.getenv("CHART_LATLON_DECIMALS", "4"))  # ~11 m; chart fingerprint precision
+    # /compute section executor (backend/services/sections.py)
+    COMPUTE_EXECUTOR = os.getenv("COMPUTE_EXECUTOR", "process")  # process | thread | inline
+    COMPUTE_WORKERS = int(os.getenv("COMPUTE_WORKERS", "0")) or None  # None -> min(4, cpu)
+    COMPUTE_SECTION_TIMEOUT = float(os.getenv("COMPUTE_SECTION_TIMEOUT", "10"))
+    COMPUTE_SECTION_TIMEOUTS = os.getenv("COMPUTE_SECTION_TIMEOUTS", "")  # e.g. "acg=5,varsha=8"
+    COMPUTE_CACHE_TTL = int(os.getenv("COMPUTE_CACHE_TTL", "600"))  # per-section cache; 0 disables
+    COMPUTE_FANOUT = os.getenv("COMPUTE_FANOUT", "1") != "0"  # seed parts-endpoint cache from /compute
+    COMPUTE_COALESCE_TTL = int(os.getenv("COMPUTE_COALESCE_TTL", "30"))  # share identical /compute results; 0 off
+    # /compute responses encoding to this many bytes or more are streamed in chunks (json_stream.py); 0 never
+    COMPUTE_STREAM_MIN_BYTES = int(os.getenv("COMPUTE_STREAM_MIN_BYTES", str(256 * 1024)))
+    # POST /compute/batch: body limit for this route only (MAX_CONTENT_LENGTH stays per chart)
+    COMPUTE_BATCH_MAX_BYTES = int(os.getenv("COMPUTE_BATCH_MAX_BYTES", str(8 * 1024 * 1024)))
+    COMPUTE_BATCH_MAX_ITEMS = int(os.getenv("COMPUTE_BATCH_MAX_ITEMS", "5000"))
+    COMPUTE_BATCH_WORKERS = int(os.getenv("COMPUTE_BATCH_WORKERS", "0")) or None  # None -> min(4, cpu)
+    RATE_LIMIT_BATCH = os.getenv("RATE_LIMIT_BATCH", "5 per minute")
 
 class Dev(Base):
     DEBUG = True
 
 class Prod(Base):
     DEBUG = False
+    # gunicorn runs several workers: share chart_id mappings and results between them
+    CACHE_L2_PATH = os.getenv("CACHE_L2_PATH", "/tmp/sage-astro-cache.sqlite3")
 
 def load():
     env = os.getenv("FLASK_ENV", "development").lower()
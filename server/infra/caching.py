@@ -1,20 +1,116 @@
 # infra/caching.py
+"""
+In-process memoization for pure functions.
+
+    @memoize(maxsize=4096, ttl=None, quantize=9)
+    def varga_sign_index(lon_deg, n): ...
+
+Entries expire one at a time (ttl seconds after they were stored) and the
+least recently used ones are evicted once `maxsize` entries or `max_cost`
+total cost (cost(value), default 1 per entry) is exceeded. Safe to call from
+several threads; concurrent misses for one key may each compute (the
+functions are pure, the last result wins).
+
+quantize=d rounds every float argument to d decimals before the lookup and
+passes the rounded values to the function, so results stay deterministic
+for a given key. Use it where a last-ulp difference cannot matter.
+
+Cached values are shared between callers: do not mutate them.
+Stats per function via fn.cache_info(); all of them via memo_stats().
+"""
+
+from __future__ import annotations
+import threading
 import time
-from functools import lru_cache, wraps
+from collections import OrderedDict
+from functools import wraps
+from typing import Any, Callable, Dict, Optional
 
-def ttl_cache(ttl_seconds: int, maxsize: int = 256):
+_REGISTRY: Dict[str, Callable[..., Any]] = {}
+
+
+def _quantized(value: Any, scale: float) -> Any:
+    # snap to a 10**-d grid; int rounding is much cheaper than round(x, d) and folds -0.0 into 0.0
+    return round(value * scale) / scale if type(value) is float else value
+
+
+def memoize(
+    maxsize: int = 1024,
+    ttl: Optional[float] = None,
+    *,
+    max_cost: Optional[float] = None,
+    cost: Optional[Callable[[Any], float]] = None,
+    quantize: Optional[int] = None,
+):
+    """Memoize a pure function with per-entry TTL, LRU size/cost bounds and stats."""
     def deco(fn):
-        @lru_cache(maxsize=maxsize)
-        def cached(key, *args, **kwargs):
-            return time.time(), fn(*args, **kwargs)
+        data: "OrderedDict[Any, tuple]" = OrderedDict()  # key -> (expires, value, cost)
+        lock = threading.Lock()
+        stats = {"hits": 0, "misses": 0, "evictions": 0, "expired": 0, "uncacheable": 0}
+        total = [0.0]
+        scale = 10.0 ** quantize if quantize is not None else None
+
+        def _drop(key) -> None:
+            total[0] -= data.pop(key)[2]
+
         @wraps(fn)
         def wrapper(*args, **kwargs):
-            key = (args, tuple(sorted(kwargs.items())))
-            ts, val = cached(key, *args, **kwargs)
-            if time.time() - ts > ttl_seconds:
-                cached.cache_clear()
-                ts, val = cached(key, *args, **kwargs)
-            return val
-        wrapper.cache_clear = lambda: cached.cache_clear()
+            if scale is not None:
+                args = tuple([round(a * scale) / scale if type(a) is float else a for a in args])
+                if kwargs:
+                    kwargs = {k: _quantized(v, scale) for k, v in kwargs.items()}
+            key = (args, tuple(sorted(kwargs.items()))) if kwargs else args
+            try:
+                with lock:
+                    entry = data.get(key)
+                    if entry is not None:
+                        if not entry[0] or entry[0] > time.monotonic():
+                            data.move_to_end(key)
+                            stats["hits"] += 1
+                            return entry[1]
+                        _drop(key)
+                        stats["expired"] += 1
+                    stats["misses"] += 1
+            except TypeError:  # unhashable argument
+                stats["uncacheable"] += 1
+                return fn(*args, **kwargs)
+
+            value = fn(*args, **kwargs)
+            c = float(cost(value)) if cost is not None else 1.0
+            if max_cost is not None and c > max_cost:
+                return value
+            expires = time.monotonic() + ttl if ttl else 0.0
+            with lock:
+                if key in data:
+                    _drop(key)
+                data[key] = (expires, value, c)
+                total[0] += c
+                while data and (len(data) > maxsize or (max_cost is not None and total[0] > max_cost)):
+                    _drop(next(iter(data)))
+                    stats["evictions"] += 1
+            return value
+
+        def cache_info() -> Dict[str, Any]:
+            with lock:
+                return dict(stats, size=len(data), cost=total[0], maxsize=maxsize, max_cost=max_cost)
+
+        def cache_clear() -> None:
+            with lock:
+                data.clear()
+                total[0] = 0.0
+
+        wrapper.cache_info = cache_info
+        wrapper.cache_clear = cache_clear
+        _REGISTRY[f"{fn.__module__}.{fn.__qualname__}"] = wrapper
         return wrapper
     return deco
+
+
+def memo_stats() -> Dict[str, Dict[str, Any]]:
+    """cache_info() of every memoized function, by dotted name."""
+    return {name: fn.cache_info() for name, fn in sorted(_REGISTRY.items())}
+
+
+def ttl_cache(ttl_seconds: int, maxsize: int = 256):
+    """Former API, kept for callers: memoize(maxsize, ttl=ttl_seconds)."""
+    return memoize(maxsize=maxsize, ttl=ttl_seconds)
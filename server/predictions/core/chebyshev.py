@@ -0,0 +1,197 @@
+# core/chebyshev.py
+"""
+Chebyshev-polynomial ephemeris store.
+
+Tropical longitudes of Sun..Pluto and the mean node, plus the ayanamsa of
+each supported sidereal mode, are fitted per fixed-length time segment from
+Swiss Ephemeris and saved as one float64 .npy matrix (one row of DEGREE+1
+coefficients per segment, prefixed by its start JD and span) with a JSON
+sidecar describing which rows belong to which series.
+The matrix is memory-mapped on load and evaluated with vectorized NumPy;
+sidereal longitude = tropical - ayanamsa, speed from the series derivative.
+
+Build once (1800-2200: a few minutes, ~34 MB):
+
+    cd server/predictions && python -m core.chebyshev build /path/ephem_cheb.npy
+
+then point CHEB_EPHE_PATH at the file to make get_ephemeris() use it.
+"""
+
+from __future__ import annotations
+import argparse, json, os, datetime as dt
+from typing import Dict, Optional, Sequence, Tuple
+
+import numpy as np
+
+from .ephemeris import BaseEphemeris, EphemResult, GeoPoint, SUPPORTED_PLANETS
+
+DEGREE = 11
+# base segment length in days; 8 days keeps every body within ~1e-8 deg, the Moon needs 4
+SPAN_DAYS = {"MOON": 4.0}
+DEFAULT_SPAN = 8.0
+FIT_TOL = 1e-7     # deg, checked between the fit nodes
+MIN_SPAN = 1 / 32  # days
+
+AYANAMSAS = ("lahiri", "raman", "krishnamurti", "fagan")
+
+
+def _fit_nodes() -> np.ndarray:
+    # Chebyshev nodes of the first kind, ascending in [-1, 1]
+    n = DEGREE + 1
+    return np.cos(np.pi * (np.arange(n)[::-1] + 0.5) / n)
+
+
+def _sample(fn, starts: np.ndarray, spans: np.ndarray, x: np.ndarray) -> np.ndarray:
+    t = starts[:, None] + (x + 1.0) * (spans[:, None] / 2.0)
+    return np.array([fn(tt) for tt in t.ravel().tolist()], dtype=float).reshape(t.shape)
+
+
+def _fit_segments(fn, jd0: float, jd1: float, span: float) -> np.ndarray:
+    """
+    Fit fn (scalar jd -> degrees) on consecutive segments covering [jd0, jd1).
+    Segments whose error at the mid-node points exceeds FIT_TOL are halved
+    (down to MIN_SPAN): light deflection near solar conjunctions is too sharp
+    for a fixed span. Returns rows [start, span, c0..cDEGREE] sorted by start.
+    """
+    x = _fit_nodes()
+    xm = (x[:-1] + x[1:]) / 2.0
+    # interpolation at the nodes: y = V c  ->  c = y V^-T
+    vinv_t = np.linalg.inv(np.polynomial.chebyshev.chebvander(x, DEGREE)).T
+    vm_t = np.polynomial.chebyshev.chebvander(xm, DEGREE).T
+
+    starts = jd0 + span * np.arange(int(np.ceil((jd1 - jd0) / span)))
+    spans = np.full(starts.shape, span)
+    rows = []
+    while starts.size:
+        coef = np.unwrap(_sample(fn, starts, spans, x), period=360.0, axis=1) @ vinv_t
+        err = np.abs((coef @ vm_t - _sample(fn, starts, spans, xm) + 180.0) % 360.0 - 180.0).max(axis=1)
+        ok = (err <= FIT_TOL) | (spans <= MIN_SPAN)
+        rows.append(np.column_stack([starts[ok], spans[ok], coef[ok]]))
+        half = spans[~ok] / 2.0
+        starts = np.concatenate([starts[~ok], starts[~ok] + half])
+        spans = np.concatenate([half, half])
+    out = np.concatenate(rows)
+    return out[np.argsort(out[:, 0], kind="stable")]
+
+
+def build_coefficients(path: str, start_year: int = 1800, end_year: int = 2200) -> None:
+    """Generate the coefficient store from Swiss Ephemeris into path (+ path.json)."""
+    import swisseph as swe
+
+    jd0 = swe.julday(start_year, 1, 1, 0.0)
+    jd1 = swe.julday(end_year, 1, 1, 0.0)
+
+    series: Dict[str, Tuple[float, object]] = {}
+    for name, p_id in SUPPORTED_PLANETS.items():
+        if name == "KETU":
+            continue  # derived from RAHU
+        code = swe.MEAN_NODE if name == "RAHU" else p_id
+        series[name] = (SPAN_DAYS.get(name, DEFAULT_SPAN), lambda t, c=code: swe.calc_ut(t, c, swe.FLG_SWIEPH)[0][0])
+    modes = {
+        "lahiri": swe.SIDM_LAHIRI,
+        "raman": swe.SIDM_RAMAN,
+        "krishnamurti": swe.SIDM_KRISHNAMURTI,
+        "fagan": swe.SIDM_FAGAN_BRADLEY,
+    }
+
+    blocks, layout, offset = [], {}, 0
+
+    def add(key, fn, span):
+        nonlocal offset
+        rows = _fit_segments(fn, jd0, jd1, span)
+        blocks.append(rows)
+        layout[key] = {"offset": offset, "count": len(rows)}
+        offset += len(rows)
+
+    for key, (span, fn) in series.items():
+        add(key, fn, span)
+    for name in AYANAMSAS:
+        swe.set_sid_mode(modes[name])
+        add(f"AYAN_{name}", lambda t: swe.get_ayanamsa_ex_ut(t, swe.FLG_SWIEPH)[1], DEFAULT_SPAN)
+    swe.set_sid_mode(swe.SIDM_LAHIRI)  # building switches the global mode; leave the app default
+
+    with open(path, "wb") as fh:  # np.save(path) would append ".npy" and break the sidecar name
+        np.save(fh, np.concatenate(blocks))
+    with open(path + ".json", "w") as fh:
+        json.dump({"jd0": jd0, "jd1": jd1, "degree": DEGREE, "series": layout}, fh)
+
+
+def _eval_series(coef: np.ndarray, x: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """Evaluate per-row Chebyshev series and d/dx at x in [-1, 1]: coef (n, K), x (n,)."""
+    c = np.ascontiguousarray(coef.T)  # (K, n): one contiguous vector per order
+    two_x = 2.0 * x
+    t_prev, t = np.ones_like(x), x
+    u_prev, u = np.ones_like(x), two_x  # Chebyshev U, since T_j' = j * U_{j-1}
+    val = c[0] + c[1] * x
+    der = c[1].copy()
+    for j in range(2, c.shape[0]):
+        t_prev, t = t, two_x * t - t_prev
+        val += c[j] * t
+        der += j * c[j] * u
+        u_prev, u = u, two_x * u - u_prev
+    return val, der
+
+
+class ChebyshevEphemerisProvider(BaseEphemeris):
+    """
+    BaseEphemeris over a prebuilt coefficient store (see build_coefficients).
+    Only longitude and its speed are stored: lat/dist come back as 0.0.
+    """
+
+    def __init__(self, path: str, ayanamsa: str = "lahiri"):
+        with open(path + ".json") as fh:
+            meta = json.load(fh)
+        self._coef = np.load(path, mmap_mode="r")
+        self._jd0 = float(meta["jd0"])
+        self._jd1 = float(meta["jd1"])
+        self._series = meta["series"]
+        # segment starts per series, in memory for searchsorted; coefficients stay mapped
+        self._starts = {
+            key: np.array(self._coef[s["offset"]: s["offset"] + s["count"], 0])
+            for key, s in self._series.items()
+        }
+        self.set_ayanamsa(ayanamsa)
+
+    def set_ayanamsa(self, ayanamsa: str) -> None:
+        self.ayanamsa = (ayanamsa or "lahiri").lower()
+
+    def _eval(self, key: str, jds: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+        seg = np.searchsorted(self._starts[key], jds, side="right") - 1
+        rows = np.asarray(self._coef[self._series[key]["offset"] + seg])
+        start, span = rows[:, 0], rows[:, 1]
+        x = 2.0 * (jds - start) / span - 1.0
+        val, der = _eval_series(rows[:, 2:], x)
+        return val, der * (2.0 / span)
+
+    def longitudes_jd(self, jd_ut, planet: str, ayanamsa: Optional[str] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """Sidereal (lon, speed_lon) arrays for an array of UT Julian days."""
+        jds = np.atleast_1d(np.asarray(jd_ut, dtype=float))
+        if jds.size and (jds.min() < self._jd0 or jds.max() >= self._jd1):
+            raise ValueError("time outside the Chebyshev ephemeris range")
+        name = planet.upper()
+        ayan = (ayanamsa or self.ayanamsa).lower()
+        if f"AYAN_{ayan}" not in self._series:
+            ayan = "lahiri"
+        lon, speed = self._eval("RAHU" if name == "KETU" else name, jds)
+        a_val, a_rate = self._eval(f"AYAN_{ayan}", jds)
+        lon = lon - a_val + (180.0 if name == "KETU" else 0.0)
+        return np.mod(lon, 360.0), speed - a_rate
+
+    def planet_longitudes(self, whens: Sequence[dt.datetime], planet: str, geo: Optional[GeoPoint], ayanamsa: str) -> Tuple[np.ndarray, np.ndarray]:
+        jds = np.array([w.timestamp() for w in whens], dtype=float) / 86400.0 + 2440587.5
+        return self.longitudes_jd(jds, planet, ayanamsa)
+
+    def planet_longitude(self, when: dt.datetime, planet: str, geo: Optional[GeoPoint], ayanamsa: str) -> EphemResult:
+        lon, speed = self.planet_longitudes([when], planet, geo, ayanamsa)
+        return EphemResult(float(lon[0]), 0.0, 0.0, float(speed[0]), "high")
+
+
+if __name__ == "__main__":
+    ap = argparse.ArgumentParser(description="Build the Chebyshev ephemeris coefficient store.")
+    ap.add_argument("cmd", choices=["build"])
+    ap.add_argument("path")
+    ap.add_argument("--start", type=int, default=1800)
+    ap.add_argument("--end", type=int, default=2200)
+    args = ap.parse_args()
+    build_coefficients(args.path, args.start, args.end)
+    print(f"wrote {args.path} ({os.path.getsize(args.path) / 1e6:.1f} MB)")
@@ -2,7 +2,9 @@
 from __future__ import annotations
 import math, os, datetime as dt
 from dataclasses import dataclass
-from typing import Optional, Literal
+from typing import Optional, Literal, Sequence, Tuple
+
+import numpy as np
 
 try:
     import swisseph as swe  # pyswisseph
@@ -33,6 +35,11 @@ class BaseEphemeris:
     def set_ayanamsa(self, ayanamsa: str) -> None:
         pass
 
+    def planet_longitudes(self, whens: Sequence[dt.datetime], planet: str, geo: Optional[GeoPoint], ayanamsa: str) -> Tuple[np.ndarray, np.ndarray]:
+        """Batch form of planet_longitude for time scans: (lon, speed_lon) arrays, one entry per instant."""
+        res = [self.planet_longitude(w, planet, geo, ayanamsa) for w in whens]
+        return np.array([r.lon for r in res], dtype=float), np.array([r.speed_lon for r in res], dtype=float)
+
 SUPPORTED_PLANETS = {
     "SUN": 0, "MOON": 1, "MARS": 4, "MERCURY": 2, "JUPITER": 5,
     "VENUS": 3, "SATURN": 6, "URANUS": 7, "NEPTUNE": 8, "PLUTO": 9, "RAHU": "RAHU", "KETU": "KETU"
@@ -73,6 +80,17 @@ class SwissEphemerisProvider(BaseEphemeris):
         lon, lat, dist, speed_lon = self._calc_body(jd_ut, p_id, flag)
         return EphemResult(lon%360, lat, dist, speed_lon, "high")
 
+    def planet_longitudes(self, whens: Sequence[dt.datetime], planet: str, geo: Optional[GeoPoint], ayanamsa: str) -> Tuple[np.ndarray, np.ndarray]:
+        # Julian days straight from POSIX time (same instant as planet_longitude), no per-call julday
+        jds = np.array([w.timestamp() for w in whens], dtype=float) / 86400.0 + 2440587.5
+        name = planet.upper()
+        p_id = swe.MEAN_NODE if name in ("RAHU", "KETU") else SUPPORTED_PLANETS[name]
+        flag = swe.FLG_SWIEPH | swe.FLG_SPEED | swe.FLG_SIDEREAL
+        calc = swe.calc_ut
+        pos = np.array([calc(jd, p_id, flag)[0][:4] for jd in jds.tolist()], dtype=float).reshape(len(jds), 4)
+        lon = pos[:, 0] + (180.0 if name == "KETU" else 0.0)
+        return np.mod(lon, 360.0), pos[:, 3]
+
     @staticmethod
     def _calc_body(jd_ut, p_id, flag):
         pos, ret = swe.calc_ut(jd_ut, p_id, flag)
@@ -117,6 +135,13 @@ class ApproxEphemerisProvider(BaseEphemeris):
         return EphemResult(lon, 0.0, 1.0, rate, "coarse")
 
 def get_ephemeris(ayanamsa: str = "lahiri") -> BaseEphemeris:
+    cheb_path = os.getenv("CHEB_EPHE_PATH")
+    if cheb_path and os.path.exists(cheb_path):
+        try:
+            from .chebyshev import ChebyshevEphemerisProvider
+            return ChebyshevEphemerisProvider(cheb_path, ayanamsa=ayanamsa)
+        except Exception as e:
+            print(f"[warn] Chebyshev ephemeris load failed: {e}; using Swiss Ephemeris")
     eph_path = os.getenv("SE_EPHE_PATH") or os.getenv("SWISSEPH_PATH")
     if _HAS_SWE:
         try:
@@ -25,18 +25,17 @@ def exact_solar_return(
         d = (lon - natal_sun_lon + 180.0) % 360.0 - 180.0
         return d
 
-    # bracket sign change by stepping
+    # bracket sign change by stepping (all step samples in one ephemeris batch)
     step = dt.timedelta(hours=6)
-    a, b = t1, t1 + step
-    fa = f(a)
-    while b <= t2:
-        fb = f(b)
+    times = [t1 + k * step for k in range(int((t2 - t1) // step) + 1)]
+    lons, _ = eph.planet_longitudes(times, "SUN", geo, ayanamsa)
+    fs = (lons - natal_sun_lon + 180.0) % 360.0 - 180.0
+    for a, b, fa, fb in zip(times, times[1:], fs.tolist(), fs[1:].tolist()):
         if fa == 0:
             return a
         if (fa <= 0 < fb) or (fa >= 0 > fb):
             # refine
             return _binary_refine(f, a, b, tol_sec=5)
-        a, b, fa = b, b + step, fb
     # If no sign change (rare if ephemeris fallback), do a secant-ish refine around mid
     return _binary_refine(f, t1, t2, tol_sec=5)
 
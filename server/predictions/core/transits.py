@@ -50,6 +50,11 @@ def _refine_time(f: Callable[[dt.datetime], float], t1: dt.datetime, t2: dt.date
     mid = lo + (hi - lo)/2
     return mid, abs(f(mid))
 
+def _sample_times(start: dt.datetime, end: dt.datetime, step_minutes: int) -> List[dt.datetime]:
+    step = dt.timedelta(minutes=step_minutes)
+    n = int((end - start) // step) + 1 if end >= start else 0
+    return [start + k * step for k in range(n)]
+
 def moving_longitude(eph: BaseEphemeris, mover: str, when: dt.datetime, geo: Optional[GeoPoint], ayanamsa: str) -> float:
     return eph.planet_longitude(when, mover, geo, ayanamsa).lon
 
@@ -81,13 +86,15 @@ def find_transit_aspects(
     """
     events: List[TransitEvent] = []
     aspects = ASPECT_DEGS.items()
-    t = start
-    # Precompute target longs
+    movers = list(movers)
+    times = _sample_times(start, end, step_minutes)
+    # Precompute target longs, and every mover's longitude over the whole scan in one batch
     target_lon = {tgt: _wrap(natal_points[tgt]) for tgt in targets}
+    mover_lon = {mover: eph.planet_longitudes(times, mover, geo, ayanamsa)[0] for mover in movers}
     prev_vals: Dict[Tuple[str,str,str], Tuple[dt.datetime, float]] = {}
-    while t <= end:
+    for i, t in enumerate(times):
         for mover in movers:
-            mv = moving_longitude(eph, mover, t, geo, ayanamsa)
+            mv = float(mover_lon[mover][i])
             for tgt, lon_t in target_lon.items():
                 for name, deg in aspects:
                     key = (mover, tgt, name)
@@ -103,7 +110,6 @@ def find_transit_aspects(
                             if abs(err) <= orb_deg:
                                 events.append(TransitEvent(when, mover, tgt, name, abs(err), {"orb": orb_deg}))
                     prev_vals[key] = (t, val)
-        t = t + dt.timedelta(minutes=step_minutes)
     # sort chronologically
     events.sort(key=lambda e: e.when)
     return events
@@ -123,10 +129,12 @@ def find_ingresses(
     events: List[TransitEvent] = []
     last_sign: Dict[str, int] = {}
     def sign_idx(lon: float) -> int: return int(_wrap(lon)//30)
-    t = start
-    while t <= end:
+    movers = list(movers)
+    times = _sample_times(start, end, step_minutes)
+    mover_lon = {mover: eph.planet_longitudes(times, mover, geo, ayanamsa)[0] for mover in movers}
+    for i, t in enumerate(times):
         for mover in movers:
-            lon = moving_longitude(eph, mover, t, geo, ayanamsa)
+            lon = float(mover_lon[mover][i])
             s = sign_idx(lon)
             if mover in last_sign and s != last_sign[mover]:
                 # refine ingress time by binary search on sign boundary
@@ -137,6 +145,5 @@ def find_ingresses(
                 when, err = _refine_time(lambda tm: 0.5 if sign_idx(moving_longitude(eph, mover, tm, geo, ayanamsa))==s else -0.5, t_prev, t, 10)
                 events.append(TransitEvent(when, mover, f"SIGN_{s}", "ingress", err, {"sign": s}))
             last_sign[mover] = s
-        t += dt.timedelta(minutes=step_minutes)
     events.sort(key=lambda e: e.when)
     return events
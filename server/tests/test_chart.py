@@ -0,0 +1,32 @@
+# tests/test_chart.py
+import datetime as dt
+from astrology import swe_utils as su
+from astrology.chart import Chart, BODY_INDEX
+from astrology.context import ChartContext
+from astrology.nakshatra import nakshatra_for_lon
+from astrology.shadbala import compute_shadbala
+from astrology.yogas import detect_yogas
+from astrology.aspects import compute_aspects
+from astrology.arudha import compute_arudha
+from astrology.bhava_bala import compute_bhava_bala
+
+def test_chart_round_trip_and_module_parity():
+    su.init(ayanamsa="lahiri")
+    ctx = ChartContext.build(dt.datetime(1984, 9, 24, 17, 30), 5.5, 26.76, 83.37)
+    p, a, c = ctx.planets, ctx.asc_idx, ctx.chalit_houses
+    ch = Chart.from_legacy(p, a, c)
+    assert ch.to_legacy() == p and ch.names == list(p)
+
+    for name, data in p.items():
+        i = BODY_INDEX[name]
+        idx, _, _, pada = nakshatra_for_lon(data["lon"])
+        assert (ch.nak[i], ch.pada[i]) == (idx, pada)
+        in_chalit = [h for h, bucket in enumerate(c, start=1) if name in bucket]
+        assert ch.chalit_house[i] == (in_chalit[0] if in_chalit else 0)
+
+    # same JSON whether modules get the legacy dict or the Chart
+    assert compute_shadbala(ch, a, c, local_hour=17) == compute_shadbala(p, a, c, local_hour=17)
+    assert detect_yogas(ch, a) == detect_yogas(p, a)
+    assert compute_aspects(ch, a, c) == compute_aspects(p, a, c)
+    assert compute_arudha(ch, a, c) == compute_arudha(p, a, c)
+    assert compute_bhava_bala(ch, c) == compute_bhava_bala(p, c)
@@ -0,0 +1,18 @@
+# tests/test_chart_context.py
+import datetime as dt
+from astrology import swe_utils as su
+from astrology.context import ChartContext
+from astrology.panchanga import compute_panchanga
+from astrology.varshaphala import compute_varshaphala
+
+BIRTH = dt.datetime(1984, 9, 24, 17, 30)
+TZ, LAT, LON = 5.5, 26.76, 83.37
+
+def test_context_matches_legacy_paths():
+    su.init(ayanamsa="lahiri")
+    ctx = ChartContext.build(BIRTH, TZ, LAT, LON)
+    assert compute_panchanga(BIRTH, TZ, LAT, LON, ctx=ctx) == compute_panchanga(BIRTH, TZ, LAT, LON)
+    with_ctx = compute_varshaphala(BIRTH, TZ, LAT, LON, year=2027, ctx=ctx)
+    without = compute_varshaphala(BIRTH, TZ, LAT, LON, year=2027)
+    assert with_ctx == without
+    assert len(ctx.chalit_houses) == 12 and ctx.nakshatras["Moon"]["pada"] in (1, 2, 3, 4)
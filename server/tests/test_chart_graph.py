@@ -0,0 +1,22 @@
+# tests/test_chart_graph.py
+from astrology import swe_utils as su
+from backend.services import chart_graph as cg
+from backend.services.chart_graph import ChartGraph, ChartInputs
+
+INP = ChartInputs("1984-09-24", "17:30", "+05:30", 26.76, 83.37)
+
+def test_nodes_resolve_once_and_share_cache(monkeypatch):
+    su.init(ayanamsa="lahiri")
+    calls = []
+    deps, fn, param = cg._NODES["planets"]
+    monkeypatch.setitem(cg._NODES, "planets", (deps, lambda inp, **kw: calls.append(1) or fn(inp, **kw), param))
+
+    store = {}
+    get = store.get
+    put = lambda k, v, timeout=None: store.__setitem__(k, v)
+
+    n = ChartGraph(INP, "k", cache_get=get, cache_set=put).resolve("rashi", "chalit", "vargas[D9]")
+    assert len(n["chalit"]) == 12 and n["vargas[D9]"]["houses"]
+    # a second request (new graph, same cache) reuses the stored nodes
+    ChartGraph(INP, "k", cache_get=get, cache_set=put).resolve("planets", "dasha[Yogini]")
+    assert len(calls) == 1
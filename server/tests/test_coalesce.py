@@ -0,0 +1,58 @@
+# tests/test_coalesce.py
+import json
+import threading
+import time
+from app import create_app
+from backend.api import v1
+
+PAYLOAD = {"dob": "1984-09-24", "tob": "17:30", "tz": "+05:30", "lat": 26.76, "lon": 83.37,
+           "include": ["table"]}
+
+def test_identical_computes_coalesce(monkeypatch):
+    build = v1._build_payload
+    calls = []
+
+    def slow_build(req, *args):
+        calls.append(1)
+        time.sleep(0.3)
+        return build(req, *args)
+
+    monkeypatch.setattr(v1, "_build_payload", slow_build)
+    app = create_app()
+    before = app.test_client().get("/api/v1/cache/stats").get_json()["coalesce"].get("compute", {})
+    results = []
+
+    def post():
+        r = app.test_client().post("/api/v1/compute", data=json.dumps(PAYLOAD), content_type="application/json")
+        results.append((r.status_code, r.headers.get("X-Coalesced"), r.get_json()["table"]))
+
+    threads = [threading.Thread(target=post) for _ in range(5)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert len(calls) == 1
+    assert sorted(h or "" for _, h, _ in results) == ["", "1", "1", "1", "1"]
+    assert all(code == 200 and table == results[0][2] for code, _, table in results)
+    after = app.test_client().get("/api/v1/cache/stats").get_json()["coalesce"]["compute"]
+    assert after["coalesced"] - before.get("coalesced", 0) == 4
+
+def test_payload_with_fallbacks_not_kept_for_later_requests(monkeypatch):
+    build = v1._build_payload
+
+    def degraded(req, *args):
+        payload, status, _ = build(req, *args)
+        return payload, status, ["dasha"]  # as if the dashas had timed out
+
+    monkeypatch.setattr(v1, "_build_payload", degraded)
+    app = create_app()
+    c = app.test_client()
+    before = c.get("/api/v1/cache/stats").get_json()["coalesce"].get("compute", {})
+    first = c.post("/api/v1/compute", data=json.dumps(PAYLOAD | {"lat": 26.77}), content_type="application/json")
+    monkeypatch.setattr(v1, "_build_payload", build)
+    again = c.post("/api/v1/compute", data=json.dumps(PAYLOAD | {"lat": 26.77}), content_type="application/json")
+    assert first.status_code == again.status_code == 200
+    assert again.headers["X-Compute-Cache"] == "table=hit"  # from the section cache, not the flight entry
+    after = c.get("/api/v1/cache/stats").get_json()["coalesce"]["compute"]
+    assert after["hits"] == before.get("hits", 0) and after["computed"] - before.get("computed", 0) == 2
@@ -0,0 +1,39 @@
+# tests/test_columnar.py
+from datetime import datetime
+from app import create_app
+from astrology.astrocartography import compute_astrocartography
+from astrology.dasha import compute_yogini
+
+CHART = {"dob": "1984-09-24", "tob": "17:30", "tz": "+05:30", "lat": 26.76, "lon": 83.37}
+
+def test_engines_emit_the_same_values_as_arrays():
+    dt = datetime(1984, 9, 24, 17, 30)
+    rec, col = compute_astrocartography(dt, 5.5), compute_astrocartography(dt, 5.5, layout="columnar")
+    for planet, lines in rec["lines"].items():
+        assert col["lines"][planet]["MC"] == lines["MC"]
+        for angle in ("ASC", "DSC"):
+            assert col["lines"][planet][angle] == {"lat": [p["lat"] for p in lines[angle]],
+                                                   "lon": [p["lon"] for p in lines[angle]]}
+    rec, col = compute_yogini(dt, 5.5, 123.4), compute_yogini(dt, 5.5, 123.4, layout="columnar")
+    md = rec["timeline"]["MD"]
+    assert col["timeline"]["MD"]["lord"] == [p["lord"] for p in md]
+    assert col["timeline"]["MD"]["start"] == [round(datetime.fromisoformat(p["start"]).timestamp()) for p in md]
+    assert col["active"]["MD"]["end"] == round(datetime.fromisoformat(rec["active"]["MD"]["end"]).timestamp())
+
+def test_compute_and_parts_select_columnar():
+    c = create_app().test_client()
+    sel = {"include": ["dasha", "acg", "kundli_predictions"]}
+    rec = c.post("/api/v1/compute", json=CHART | sel).get_json()
+    col = c.post("/api/v1/compute?format=columnar", json=CHART | sel).get_json()
+    assert set(col["acg"]["lines"]["Sun"]["ASC"]) == {"lat", "lon"} and col["acg"]["meta"]["layout"] == "columnar"
+    assert isinstance(col["dasha"]["Vimshottari"]["timeline"]["MD"]["start"][0], int)
+    assert col["kundli_predictions"] == rec["kundli_predictions"]
+    again = c.post("/api/v1/compute", json=CHART | sel).get_json()  # cached per format
+    assert again["dasha"] == rec["dasha"] and again["acg"] == rec["acg"]
+
+    cid = rec["chart_id"]
+    assert c.get(f"/api/v1/dasha?chart_id={cid}&format=columnar").get_json()["dasha"] == col["dasha"]
+    assert c.get(f"/api/v1/acg?chart_id={cid}&format=columnar").get_json()["acg"] == col["acg"]
+    assert c.get(f"/api/v1/acg?chart_id={cid}").get_json()["acg"] == rec["acg"]
+    assert c.get(f"/api/v1/acg?chart_id={cid}&format=soa").status_code == 400
+    assert c.post("/api/v1/compute?format=soa", json=CHART).status_code == 400
@@ -0,0 +1,82 @@
+# tests/test_compute_batch.py
+import json
+from app import create_app
+
+CHART = {"dob": "1984-09-24", "tob": "17:30", "tz": "+05:30", "lat": 26.76, "lon": 83.37}
+
+def _lines(resp):
+    return [json.loads(line) for line in resp.get_data(as_text=True).splitlines()]
+
+def test_ndjson_batch_streams_items_and_isolates_errors():
+    c = create_app().test_client()
+    body = "\n".join([
+        json.dumps(CHART),
+        "{not json",
+        json.dumps(CHART | {"lat": 123}),
+        json.dumps(CHART | {"tz": "+5:30"}),  # same chart, other spelling
+        "",
+    ])
+    r = c.post("/api/v1/compute/batch?include=table,dasha", data=body, content_type="application/x-ndjson")
+    assert r.status_code == 200 and r.mimetype == "application/x-ndjson"
+    *items, done = _lines(r)
+    assert done == {"done": True, "items": 4, "failed": 2}
+    by_index = {i["index"]: i for i in items}
+    assert sorted(by_index) == [0, 1, 2, 3]
+    assert by_index[1]["error"]["type"] == "bad_request"
+    assert by_index[2]["error"]["type"] == "validation"
+    ok = by_index[0]["result"]
+    assert set(ok) >= {"table", "dasha", "chart_id"} and "varsha" not in ok
+    assert by_index[3]["chart_id"] == by_index[0]["chart_id"] and by_index[3]["result"]["table"] == ok["table"]
+
+def test_json_batch_allows_bodies_beyond_max_content_length():
+    app = create_app()
+    c = app.test_client()
+    items = [CHART | {"name": "x" * 40000}, CHART | {"include": ["table"]}]
+    assert len(json.dumps(items)) > app.config["MAX_CONTENT_LENGTH"]
+    *out, done = _lines(c.post("/api/v1/compute/batch", json={"items": items, "include": ["charts"]}))
+    assert done["failed"] == 0
+    results = {i["index"]: i["result"] for i in out}
+    assert "charts" in results[0] and "table" not in results[0]
+    assert "table" in results[1] and "charts" not in results[1]  # an item's own include wins
+
+    app.config["COMPUTE_BATCH_MAX_ITEMS"] = 1
+    assert c.post("/api/v1/compute/batch", json=items).status_code == 413
+    assert c.post("/api/v1/compute/batch", json={"charts": items}).status_code == 400
+
+def test_same_instant_shares_the_tropical_pass(monkeypatch):
+    import astrology.context as context
+    calls = []
+    real = context.compute_tropical
+    monkeypatch.setattr(context, "compute_tropical", lambda jd: calls.append(jd) or real(jd))
+    c = create_app().test_client()
+    places = [(26.76, 83.37), (51.5, -0.12), (40.7, -74.0)]  # same UTC instant, three cities
+    items = [CHART | {"lat": lat, "lon": lon} for lat, lon in places]
+    *out, done = _lines(c.post("/api/v1/compute/batch", json={"items": items, "include": ["table"]}))
+    assert done["failed"] == 0 and len({i["chart_id"] for i in out}) == 3
+    assert len(calls) == 1
+
+def test_batch_pool_shared_per_worker_count():
+    from concurrent.futures import ThreadPoolExecutor
+    from backend.api import v1
+    with ThreadPoolExecutor(8) as ex:  # concurrent first batches build one pool
+        pools = set(ex.map(lambda _: v1._batch_executor(3), range(8)))
+    assert len(pools) == 1
+    assert v1._batch_executor(5) is not pools.pop()  # a new COMPUTE_BATCH_WORKERS gets its own pool
+    assert v1._batch_executor(5)._max_workers == 5
+
+def test_batch_treats_stale_entries_as_misses():
+    import time
+    app = create_app()
+    app.config["COMPUTE_COALESCE_TTL"] = 0
+    c = app.test_client()
+    chart = CHART | {"include": ["table"], "lat": 26.78}
+    first = c.post("/api/v1/compute", json=chart)
+    cache = next(iter(app.extensions["cache"].values()))
+    key = next(k for k in cache._l1 if k.startswith(f"compute|table|{first.get_json()['chart_id']}|"))
+    cache.set(key, cache.get(key), timeout=1)
+    time.sleep(1.05)
+    *_, done = _lines(c.post("/api/v1/compute/batch", json=[chart]))
+    assert done["failed"] == 0
+    assert cache.get(key) is not None  # recomputed and stored again, not served stale
+    again = c.post("/api/v1/compute", json=chart)
+    assert again.headers["X-Compute-Cache"] == "table=hit" and "Warning" not in again.headers
@@ -0,0 +1,33 @@
+# tests/test_compute_fanout.py
+import json
+from app import create_app
+from backend.api.common import write_behind_flush
+from backend.services.engine_versions import engine_version
+
+PAYLOAD = {"dob": "1984-09-24", "tob": "17:30", "tz": "+05:30", "lat": 26.76, "lon": 83.37, "varsha_year": 2030}
+PARTS = [
+    "/asc", "/houses", "/planets", "/charts/rashi", "/charts/chalit", "/vargas?vargas=D9,D10",
+    "/table/planets", "/shadbala", "/dasha", "/varsha?varsha_year=2030", "/acg",
+    "/panchanga", "/ashtakavarga", "/avasthas", "/aspects", "/arudha", "/kp", "/grahas",
+]
+
+def _get(c, path, **q):
+    sep = "&" if "?" in path else "?"
+    return c.get("/api/v1" + path + sep + "&".join(f"{k}={v}" for k, v in q.items()))
+
+def test_compute_seeds_parts_cache():
+    app = create_app()
+    c = app.test_client()
+    cid = c.post("/api/v1/compute", data=json.dumps(PAYLOAD), content_type="application/json").get_json()["chart_id"]
+    write_behind_flush()
+
+    cache = app.extensions["cache"]
+    cache = next(iter(cache.values())) if isinstance(cache, dict) else cache
+    assert cache.get(f"shadbala|{cid}|v={engine_version('shadbala')}") is not None
+
+    fresh = create_app().test_client()
+    inputs = {k: PAYLOAD[k] for k in ("dob", "tob", "lat", "lon")} | {"tz": "%2B05:30"}
+    for path in PARTS:
+        seeded = _get(c, path, chart_id=cid)
+        assert seeded.status_code == 200, path
+        assert seeded.get_json() == _get(fresh, path, **inputs).get_json(), path
@@ -0,0 +1,70 @@
+# tests/test_compute_sections.py
+import json
+from app import create_app
+from backend.services import sections
+
+PAYLOAD = {"dob": "1984-09-24", "tob": "17:30", "tz": "+05:30", "lat": 26.76, "lon": 83.37}
+
+def _post(c, **extra):
+    return c.post("/api/v1/compute", data=json.dumps({**PAYLOAD, **extra}), content_type="application/json")
+
+def test_include_skips_unrequested_sections(monkeypatch):
+    app = create_app()
+    app.config["COMPUTE_EXECUTOR"] = "inline"
+    def _no_varsha(*a, **k):
+        raise AssertionError("varsha computed for a preview")
+    monkeypatch.setattr(sections, "varsha_section", _no_varsha)
+    r = _post(app.test_client(), include=["table", "charts"])
+    assert r.status_code == 200
+    j = r.get_json()
+    assert "table" in j and "charts" in j
+    for k in ("varsha", "acg", "dasha", "shadbala"):
+        assert k not in j
+
+def test_exclude_and_unknown_section():
+    c = create_app().test_client()
+    j = _post(c, exclude="acg,varsha_predictions").get_json()
+    assert "acg" not in j and "varsha_predictions" not in j and "varsha" in j
+    assert _post(c, include=["nope"]).status_code == 400
+
+def _cache_status(r):
+    return dict(p.split("=") for p in r.headers["X-Compute-Cache"].split(", "))
+
+def test_sections_cached_separately():
+    c = create_app().test_client()
+    sel = ["table", "dasha", "varsha", "varsha_predictions"]
+    first = _post(c, include=sel, varsha_year=2030)
+    assert set(_cache_status(first).values()) == {"miss"}
+    again = _post(c, include=sel, varsha_year=2030)
+    assert set(_cache_status(again).values()) == {"hit"}
+    assert again.get_json() == first.get_json()
+    other = _cache_status(_post(c, include=sel, varsha_year=2031))
+    assert other == {"table": "hit", "dasha": "hit", "varsha": "miss", "varsha_predictions": "miss"}
+
+def test_omitted_sections_not_reported_as_misses():
+    c = create_app().test_client()
+    sel = ["table", "yogas", "transits"]  # no astrology.transits module, no compute_yogas: both OMIT
+    first = _cache_status(_post(c, include=sel, varsha_year=2032))
+    assert first == {"table": "miss", "yogas": "omitted", "transits": "omitted"}
+    again = _cache_status(_post(c, include=sel, varsha_year=2033))
+    assert again == {"table": "hit", "yogas": "omitted", "transits": "omitted"}
+
+def test_sections_built_from_timeouts_not_cached(monkeypatch):
+    import time
+    app = create_app()
+    app.config.update(COMPUTE_EXECUTOR="thread", COMPUTE_WORKERS=4, COMPUTE_SECTION_TIMEOUT=0.05,
+                      COMPUTE_COALESCE_TTL=0)
+    real = sections.dasha_section
+    def _slow(*a):
+        time.sleep(0.3)
+        return real(*a)
+    monkeypatch.setattr(sections, "dasha_section", _slow)
+    c = app.test_client()
+    sel = ["dasha", "kundli_predictions"]
+    first = _post(c, include=sel)
+    assert first.get_json()["dasha"]["Vimshottari"] == {"_error": "section_timeout"}
+    monkeypatch.setattr(sections, "dasha_section", real)
+    time.sleep(0.3)  # let the slow calls free the pool
+    again = _post(c, include=sel)
+    assert _cache_status(again) == {"dasha": "miss", "kundli_predictions": "miss"}  # neither was stored
+    assert "_error" not in again.get_json()["dasha"]["Vimshottari"]
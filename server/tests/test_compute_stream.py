@@ -0,0 +1,65 @@
+# tests/test_compute_stream.py
+import json
+import time
+from urllib.parse import urlencode
+from app import create_app
+from backend.services import sections
+
+CHART = {"dob": "1984-09-24", "tob": "17:30", "tz": "+05:30", "lat": 26.76, "lon": 83.37}
+
+def _events(chunks):
+    """[(event, data, seconds since start)] from an SSE body, as the chunks arrive."""
+    out, t0 = [], time.monotonic()
+    for chunk in chunks:
+        for block in chunk.decode().split("\n\n"):
+            fields = dict(line.split(": ", 1) for line in block.splitlines() if ": " in line)
+            if "event" in fields:
+                out.append((fields["event"], json.loads(fields["data"]), time.monotonic() - t0))
+    return out
+
+def test_stream_matches_compute():
+    c = create_app().test_client()
+    query = CHART | {"vargas": "D9,D7", "varsha_year": 2030, "ayanamsas": "raman"}
+    r = c.get("/api/v1/compute/stream?" + urlencode(query))
+    assert r.status_code == 200 and r.mimetype == "text/event-stream"
+    events = _events([r.get_data()])
+    assert events[0][0] == "base" and events[-1][0] == "done"
+    streamed = dict(events[0][1])
+    streamed.update((d["name"], d["value"]) for e, d, _ in events if e == "section")
+    streamed["chart_id"] = events[-1][1]["chart_id"]
+    whole = c.post("/api/v1/compute", json=CHART | {"vargas": ["D9", "D7"], "varsha_year": 2030,
+                                                    "ayanamsas": ["raman"]}).get_json()
+    assert json.loads(json.dumps(streamed)) == whole
+    assert c.get("/api/v1/compute/stream?dob=1984-09-24&lat=1&lon=2").status_code == 400
+
+def test_slow_section_does_not_hold_back_fast_ones(monkeypatch):
+    real = sections.varsha_section
+    monkeypatch.setattr(sections, "varsha_section", lambda *a: time.sleep(1.0) or real(*a))
+    app = create_app()
+    app.config.update(COMPUTE_EXECUTOR="thread", COMPUTE_WORKERS=2, COMPUTE_CACHE_TTL=0)
+    r = app.test_client().get("/api/v1/compute/stream?" + urlencode(CHART), buffered=False)
+    events = _events(r.response)
+    names = [d["name"] for e, d, _ in events if e == "section"]
+    at = {d["name"]: t for e, d, t in events if e == "section"}
+    assert names.index("table") < names.index("varsha") and names[-2:] == ["varsha", "varsha_predictions"]
+    assert at["table"] < 0.5 <= at["varsha"]
+    assert events[-1][0] == "done" and events[-1][1]["chart_id"]
+
+def test_stale_section_flagged_and_refreshed():
+    from backend.api.common import SWR_STATS, revalidate_flush
+    app = create_app()
+    c = app.test_client()
+    url = "/api/v1/compute/stream?" + urlencode(CHART | {"include": "table", "lat": 26.79})
+    first = _events([c.get(url).get_data()])[-1][1]
+    assert "stale" not in first
+    cache = next(iter(app.extensions["cache"].values()))
+    key = next(k for k in cache._l1 if k.startswith(f"compute|table|{first['chart_id']}|"))
+    cache.set(key, cache.get(key), timeout=1)
+    time.sleep(1.05)
+    refreshed = SWR_STATS["refreshed"]
+    r = c.get(url)
+    done = _events([r.get_data()])[-1][1]
+    assert done["stale"] is True and done["age"] >= 1 and done["cache"] == {"table": "hit"}
+    revalidate_flush()
+    assert SWR_STATS["refreshed"] == refreshed + 1 and cache.get(key) is not None
+    assert "stale" not in _events([c.get(url).get_data()])[-1][1]
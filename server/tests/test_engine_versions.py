@@ -0,0 +1,53 @@
+# tests/test_engine_versions.py
+import pytest
+from backend.services import engine_versions as ev
+from backend.services.chart_graph import node_version
+from backend.services.sections import section_key
+
+OPTS = {"vargas": "D9", "varsha_year": 2030, "format": "records"}
+
+
+def _clear():
+    for fn in (ev._module_info, ev._engines_version, ev.engine_version, node_version):
+        fn.cache_clear()
+
+
+@pytest.fixture
+def edit(monkeypatch):
+    """edit(module, extra) -> as if `extra` were appended to astrology/<module>.py."""
+    real = ev._source
+
+    def apply(module, extra: bytes):
+        monkeypatch.setattr(ev, "_source", lambda m: real(m) + extra if m == module else real(m))
+        _clear()
+    yield apply
+    monkeypatch.undo()
+    _clear()
+
+
+def test_closure_follows_package_imports():
+    closure = ev.engine_closure("predictions")
+    assert {"predictions", "yogas", "chart", "nakshatra", "swe_utils"} <= set(closure)
+    assert "dasha" not in closure
+
+
+def test_engine_change_invalidates_only_its_sections(edit):
+    names = ("dasha", "shadbala", "acg", "table", "kundli_predictions")
+    before = {n: section_key(n, "cid", OPTS) for n in names}
+    nodes = {n: node_version(n) for n in ("dasha", "planets", "acg")}
+    edit("dasha", b"\n# touched\n")
+    after = {n: section_key(n, "cid", OPTS) for n in names}
+    assert after["dasha"] != before["dasha"]
+    assert after["kundli_predictions"] != before["kundli_predictions"]  # reads the dasha section
+    assert all(after[n] == before[n] for n in ("shadbala", "acg", "table"))
+    assert node_version("dasha") != nodes["dasha"]
+    assert node_version("planets") == nodes["planets"] and node_version("acg") == nodes["acg"]
+
+
+def test_declared_version_ignores_edits(edit):
+    edit("kp", b'\nENGINE_VERSION = "3"\n')
+    declared = ev.engine_version("kp")
+    edit("kp", b'\nENGINE_VERSION = "3"\n# refactor, same results\n')
+    assert ev.engine_version("kp") == declared
+    edit("kp", b'\nENGINE_VERSION = "4"\n')
+    assert ev.engine_version("kp") != declared
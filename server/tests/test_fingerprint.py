@@ -0,0 +1,34 @@
+# tests/test_fingerprint.py
+import json
+import pytest
+from app import create_app
+from backend.api.common import chart_fingerprint, chart_id_for, utc_instant
+
+def test_equivalent_spellings_share_chart_id():
+    base = chart_id_for("1984-09-24", "17:30", "+05:30", 26.76, 83.37)
+    assert chart_id_for("1984-09-24", "17:30:00", "+5:30", 26.7600001, 83.37) == base
+    assert chart_id_for("1984-09-24", "17:30", "+0530", 26.76, 83.37, "LAHIRI", "p") == base
+    assert chart_id_for("1984-09-24", "17:31", "+05:30", 26.76, 83.37) != base
+
+def test_fingerprint_is_utc_based():
+    assert utc_instant("1984-09-24", "17:30", "+05:30") == "1984-09-24T12:00:00Z"
+    assert utc_instant("1984-09-24", "00:30", "+05:30") == "1984-09-23T19:00:00Z"
+    assert chart_fingerprint("1984-09-24", "17:30", "+05:30", 26.76, 83.37).startswith("1984-09-24T12:00:00Z|+05:30|")
+
+@pytest.mark.parametrize("bad", [
+    {"tob": "25:00"}, {"tz": "+15:00"}, {"tz": "+05:75"}, {"tz": "0599"}, {"tz": "+05:-30"}, {"dob": "1984-13-01"},
+])
+def test_malformed_inputs_rejected(bad):
+    with pytest.raises(ValueError):
+        chart_id_for(**({"dob": "1984-09-24", "tob": "17:30", "tz": "+05:30", "lat": 26.76, "lon": 83.37} | bad))
+
+def test_compute_hits_cache_for_equivalent_input():
+    c = create_app().test_client()
+    post = lambda p: c.post("/api/v1/compute", data=json.dumps(p | {"include": ["table", "shadbala"]}),
+                            content_type="application/json")
+    a = post({"dob": "1984-09-24", "tob": "17:30", "tz": "+05:30", "lat": 26.76, "lon": 83.37})
+    b = post({"dob": "1984-09-24", "tob": "17:30:00", "tz": "+5:30", "lat": 26.7600001, "lon": 83.37})
+    assert a.status_code == b.status_code == 200
+    assert a.get_json()["chart_id"] == b.get_json()["chart_id"]
+    assert a.get_json()["table"] == b.get_json()["table"]
+    assert "miss" not in b.headers.get("X-Compute-Cache", "")
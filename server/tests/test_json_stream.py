@@ -0,0 +1,45 @@
+# tests/test_json_stream.py
+import datetime as dt
+import json
+from flask.json.provider import DefaultJSONProvider
+from app import create_app
+from backend.services import json_stream
+
+DOC = {
+    "b": [{"lat": i / 3, "lon": -i} for i in range(500)],
+    "a": {1: "un", 10: "dix", 2: "deux"},
+    "sym": "♈ ♉",
+    "nested": {"x": {"y": {"z": [1.5, None, True, {"deep": []}]}}},
+    "when": dt.date(2030, 1, 2),
+    "empty": {},
+}
+
+def _stdlib(app, obj):
+    return json.loads(DefaultJSONProvider(app).dumps(obj))
+
+def test_chunks_match_one_shot_and_flask(monkeypatch):
+    app = create_app()
+    whole = json_stream.dumps(DOC)
+    assert b"".join(json_stream.iter_json(DOC, chunk_size=512)) == whole
+    assert json.loads(whole) == _stdlib(app, DOC)
+    monkeypatch.setattr(json_stream, "orjson", None)  # stdlib fallback
+    assert json.loads(b"".join(json_stream.iter_json(DOC, chunk_size=512))) == _stdlib(app, DOC)
+    assert json.loads(json_stream.dumps(DOC)) == _stdlib(app, DOC)
+
+def test_large_documents_stream():
+    with create_app().app_context():
+        small = json_stream.json_response({"a": 1}, stream_min_bytes=1024)
+        big = json_stream.json_response(DOC, stream_min_bytes=1024, chunk_size=256)
+    assert "Content-Length" in small.headers and small.get_data() == b'{"a":1}\n'
+    assert "Content-Length" not in big.headers and json.loads(big.get_data()) == json.loads(json_stream.dumps(DOC))
+
+def test_compute_streamed_or_not_is_the_same_document():
+    app = create_app()
+    c = app.test_client()
+    body = {"dob": "1984-09-24", "tob": "17:30", "tz": "+05:30", "lat": 26.76, "lon": 83.37}
+    app.config["COMPUTE_STREAM_MIN_BYTES"] = 0
+    whole = c.post("/api/v1/compute", json=body)
+    app.config["COMPUTE_STREAM_MIN_BYTES"] = 4096
+    streamed = c.post("/api/v1/compute", json=body)
+    assert "Content-Length" not in streamed.headers and "Content-Length" in whole.headers
+    assert streamed.get_json() == whole.get_json()
@@ -0,0 +1,49 @@
+# tests/test_memoize.py
+from infra import caching
+from infra.caching import memoize, memo_stats
+
+def _counted(**opts):
+    calls = []
+    @memoize(**opts)
+    def f(x, y=0):
+        calls.append((x, y))
+        return [x, y]
+    return f, calls
+
+def test_per_entry_expiry(monkeypatch):
+    now = [100.0]
+    monkeypatch.setattr(caching.time, "monotonic", lambda: now[0])
+    f, calls = _counted(ttl=10)
+    f(1)
+    now[0] = 105.0
+    f(2)
+    now[0] = 112.0
+    f(1), f(2)  # only the first entry has expired
+    assert calls == [(1, 0), (2, 0), (1, 0)]
+    assert f.cache_info()["expired"] == 1
+
+def test_lru_size_and_cost_bounds():
+    f, calls = _counted(maxsize=2)
+    f(1), f(2), f(1), f(3), f(1), f(2)
+    assert calls == [(1, 0), (2, 0), (3, 0), (2, 0)]
+    info = f.cache_info()
+    assert info["size"] == 2 and info["evictions"] == 2 and info["hits"] == 2
+
+    g, gcalls = _counted(max_cost=10, cost=lambda v: v[0])
+    g(4), g(5), g(3), g(11)  # 4+5+3 > 10 evicts 4; 11 is never stored
+    assert g.cache_info()["cost"] == 8.0
+    g(5), g(11), g(4)
+    assert gcalls == [(4, 0), (5, 0), (3, 0), (11, 0), (11, 0), (4, 0)]
+
+def test_quantize_kwargs_and_unhashable():
+    f, calls = _counted(quantize=6)
+    assert f(1.0000001, y=2.0) == [1.0, 2.0]
+    f(0.9999999, y=2.0000000001)
+    f(1.0, 2.0)  # positional and keyword spellings are different keys
+    assert calls == [(1.0, 2.0), (1.0, 2.0)]
+    assert f([1]) == [[1], 0] and f.cache_info()["uncacheable"] == 1
+
+def test_engine_functions_registered():
+    from astrology import dasha, houses, kp  # noqa: F401
+    names = memo_stats()
+    assert "astrology.dasha._build_md_list" in names and "astrology.houses._compute_cusps" in names
@@ -0,0 +1,25 @@
+# tests/test_multi_ayanamsa.py
+import json
+from app import create_app
+
+BIRTH = {"dob":"1984-09-24","tob":"17:30","tz":"+05:30","lat":26.76,"lon":83.37}
+
+def test_compute_by_ayanamsa():
+    c = create_app().test_client()
+    body = dict(BIRTH, ayanamsas=["lahiri", "krishnamurti", "raman"])
+    j = c.post("/api/v1/compute", data=json.dumps(body), content_type="application/json").get_json()
+    assert set(j["by_ayanamsa"]) == {"lahiri", "krishnamurti", "raman"}
+    lahiri = j["by_ayanamsa"]["lahiri"]
+    assert lahiri["asc"]["idx"] == j["asc"]["idx"]
+    assert lahiri["charts"]["rashi"] == j["charts"]["rashi"]
+    # KP ayanamsa sits a few arc-minutes from Lahiri
+    d = lahiri["planets"]["Sun"]["lon"] - j["by_ayanamsa"]["krishnamurti"]["planets"]["Sun"]["lon"]
+    assert 0.05 < abs(d) < 0.2
+
+def test_parts_ayanamsas_query():
+    c = create_app().test_client()
+    q = "&".join(f"{k}={v}" for k, v in BIRTH.items()).replace("+", "%2B")
+    j = c.get(f"/api/v1/planets?{q}&ayanamsas=raman").get_json()
+    assert set(j["by_ayanamsa"]) == {"raman"}
+    assert j["by_ayanamsa"]["raman"]["nakshatras"]["Moon"]["pada"] in (1, 2, 3, 4)
+    assert c.get(f"/api/v1/asc?{q}&ayanamsas=nope").status_code == 400
@@ -0,0 +1,17 @@
+# tests/test_planets_batch.py
+import datetime as dt
+import numpy as np
+from astrology import swe_utils as su
+from astrology.planets import compute_planets, compute_planets_batch
+
+def test_batch_matches_per_call():
+    su.init(ayanamsa="lahiri")
+    times = [dt.datetime(1984, 9, 24, 17, 30) + dt.timedelta(days=7 * k) for k in range(5)]
+    jds = [su.to_julian_day(t, 5.5) for t in times]
+    names = ["Sun", "Moon", "Mercury", "Rahu", "Ketu"]
+    lon, speed = compute_planets_batch(jds, names, ayanamsa="lahiri")
+    assert lon.shape == speed.shape == (5, 5)
+    for i, t in enumerate(times):
+        p = compute_planets(t, 5.5, 0.0, 0.0)
+        assert np.allclose(lon[i], [p[n]["lon"] for n in names], atol=1e-9)
+        assert [bool(s < 0) for s in speed[i]] == [p[n]["retro"] for n in names]
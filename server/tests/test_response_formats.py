@@ -0,0 +1,40 @@
+# tests/test_response_formats.py
+import json
+import pytest
+from app import create_app
+
+msgpack = pytest.importorskip("msgpack")
+
+CHART = {"dob": "1984-09-24", "tob": "17:30", "tz": "+05:30", "lat": 26.76, "lon": 83.37}
+
+def _same(decoded, as_json):
+    return json.loads(json.dumps(decoded)) == as_json  # int keys become strings, as in JSON
+
+def test_compute_and_parts_negotiate_msgpack():
+    c = create_app().test_client()
+    j = c.post("/api/v1/compute", json=CHART | {"include": ["table", "dasha", "acg"]})
+    assert j.mimetype == "application/json" and "Accept" in j.headers["Vary"]
+    m = c.post("/api/v1/compute", json=CHART | {"include": ["table", "dasha", "acg"]},
+               headers={"Accept": "application/msgpack"})
+    assert m.mimetype == "application/msgpack" and "Accept" in m.headers["Vary"]
+    assert set(m.headers["X-Compute-Cache"].split(", ")) >= {"table=hit", "dasha=hit"}  # same cached sections
+    assert _same(msgpack.unpackb(m.data, strict_map_key=False), j.get_json())
+
+    cid = j.get_json()["chart_id"]
+    part = c.get(f"/api/v1/dasha?chart_id={cid}", headers={"Accept": "application/x-msgpack"})
+    assert part.mimetype == "application/x-msgpack"
+    assert _same(msgpack.unpackb(part.data, strict_map_key=False), c.get(f"/api/v1/dasha?chart_id={cid}").get_json())
+
+def test_json_stays_the_default():
+    c = create_app().test_client()
+    for accept in (None, "*/*", "application/json, application/msgpack", "application/msgpack;q=0.2, */*",
+                   "text/html"):
+        r = c.get("/api/v1/health", headers={"Accept": accept} if accept else {})
+        assert r.mimetype == "application/json", accept
+
+def test_cbor():
+    cbor2 = pytest.importorskip("cbor2")
+    c = create_app().test_client()
+    r = c.get("/api/v1/health", headers={"Accept": "application/cbor"})
+    assert r.mimetype == "application/cbor"
+    assert cbor2.loads(r.data) == c.get("/api/v1/health").get_json()
@@ -0,0 +1,39 @@
+# tests/test_sections.py
+import datetime as dt
+import time
+from backend.services.sections import Section, SectionExecutor, dasha_section, module_section
+
+def _boom():
+    raise RuntimeError("boom")
+
+def test_timeouts_and_failures_fall_back():
+    ex = SectionExecutor("thread", 4, default_timeout=5.0, timeouts={"slow": 0.05})
+    out = ex.run([
+        Section("slow", time.sleep, (1.0,), fallback="late"),
+        Section("fast", module_section, ("math", "sqrt", 16.0)),
+        Section("bad", _boom),
+        Section("bad_with_fallback", _boom, fallback=None),
+    ])
+    ex.shutdown()
+    assert out == {"slow": "late", "fast": 4.0, "bad_with_fallback": None}
+
+def test_process_pool_matches_inline():
+    args = ("Vimshottari", dt.datetime(1984, 9, 24, 17, 30), 5.5, 123.4)
+    ex = SectionExecutor("process", 2)
+    try:
+        out = ex.run([Section("vim", dasha_section, args)])
+    finally:
+        ex.shutdown()
+    assert out["vim"] == SectionExecutor("inline").run([Section("vim", dasha_section, args)])["vim"]
+
+def test_batch_collects_each_section_when_asked():
+    ex = SectionExecutor("thread", 2, default_timeout=5.0)
+    batch = ex.start([Section("slow", time.sleep, (0.5,), fallback="late"), Section("fast", abs, (-3,))])
+    try:
+        t0 = time.monotonic()
+        assert batch.results("fast") == {"fast": 3}  # does not wait on "slow"
+        assert time.monotonic() - t0 < 0.4 and not batch.ready("slow") and batch.ready("fast", "other")
+        batch.wait_any()
+        assert batch.ready("slow") and batch.results() == {"fast": 3, "slow": None}
+    finally:
+        ex.shutdown()
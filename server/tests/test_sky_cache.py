@@ -0,0 +1,33 @@
+# tests/test_sky_cache.py
+from app import create_app
+from astrology import astrocartography
+
+# the same UTC instant (12:00Z) from two places and offsets
+DELHI = {"dob": "1984-09-24", "tob": "17:30", "tz": "%2B05:30", "lat": 26.76, "lon": 83.37}
+LONDON = {"dob": "1984-09-24", "tob": "12:00", "tz": "%2B00:00", "lat": 51.5, "lon": -0.12}
+
+def _get(c, path, q):
+    return c.get(f"/api/v1{path}?" + "&".join(f"{k}={v}" for k, v in q.items()))
+
+def test_sky_state_shared_across_places(monkeypatch):
+    calls = []
+    real = astrocartography.acg_sky
+    monkeypatch.setattr(astrocartography, "acg_sky", lambda jd: calls.append(jd) or real(jd))
+    c = create_app().test_client()
+
+    a, b = _get(c, "/acg", DELHI).get_json(), _get(c, "/acg", LONDON).get_json()
+    assert a["acg"] == b["acg"] and a["chart_id"] != b["chart_id"]
+    cities = _get(c, "/acg/cities", LONDON).get_json()
+    assert cities["chart_id"] == b["chart_id"] and cities["cities"]
+    assert len(calls) == 1
+
+    # sidereal planets are shared too; cusps stay per place
+    pa, pb = _get(c, "/planets", DELHI).get_json(), _get(c, "/planets", LONDON).get_json()
+    assert pa["planets"] == pb["planets"]
+    assert _get(c, "/houses", DELHI).get_json()["cusps"] != _get(c, "/houses", LONDON).get_json()["cusps"]
+
+def test_acg_cities_reports_requesting_chart():
+    c = create_app().test_client()
+    a = _get(c, "/acg/cities", DELHI).get_json()
+    b = _get(c, "/acg/cities", LONDON).get_json()
+    assert a["cities"] == b["cities"] and a["chart_id"] != b["chart_id"]
@@ -0,0 +1,61 @@
+# tests/test_stale_while_revalidate.py
+import time
+from app import create_app
+from backend.api.common import SWR_STATS, revalidate_flush
+from backend.services.engine_versions import engine_version
+
+Q = "dob=1984-09-24&tob=17:30&tz=%2B05:30&lat=26.76&lon=83.37&varsha_year=2030"
+
+def _expire_soon(cache, key):
+    cache.set(key, cache.get(key), timeout=1)
+    time.sleep(1.05)
+
+def test_expired_entry_served_stale_then_refreshed():
+    app = create_app()
+    c = app.test_client()
+    first = c.get(f"/api/v1/varsha?{Q}")
+    assert first.status_code == 200 and "Warning" not in first.headers
+    cache = next(iter(app.extensions["cache"].values()))
+    key = f"varsha|{first.get_json()['chart_id']}|2030|v={engine_version('varsha')}"
+    _expire_soon(cache, key)
+    assert cache.get(key) is None  # strict readers never see it
+
+    refreshed = SWR_STATS["refreshed"]
+    stale = c.get(f"/api/v1/varsha?{Q}")
+    assert stale.get_json() == first.get_json()
+    assert stale.headers["Warning"].startswith("110") and int(stale.headers["Age"]) >= 1
+    revalidate_flush()
+    assert SWR_STATS["refreshed"] == refreshed + 1
+    assert cache.get(key) is not None
+    again = c.get(f"/api/v1/varsha?{Q}")
+    assert "Warning" not in again.headers and again.get_json() == first.get_json()
+
+def test_max_staleness_per_namespace():
+    app = create_app()
+    cache = next(iter(app.extensions["cache"].values()))
+    cache.max_stale = {"asc": 0, "*": 3600}
+    c = app.test_client()
+    cid = c.get(f"/api/v1/asc?{Q}").get_json()["chart_id"]
+    _expire_soon(cache, f"asc|{cid}|v={engine_version('asc')}")
+    assert "Warning" not in c.get(f"/api/v1/asc?{Q}").headers  # not kept past its timeout: recomputed
+
+def test_concurrent_stale_hits_queue_one_refresh(monkeypatch):
+    import threading
+    from backend.api import common
+    queued = []
+    monkeypatch.setattr(common, "_revalidator", type("Pool", (), {"submit": lambda self, fn: queued.append(fn)})())
+    app = create_app()
+    barrier = threading.Barrier(8)
+
+    def stale_hit():
+        with app.test_request_context(f"/api/v1/varsha?{Q}&n=concurrent"):
+            barrier.wait()
+            common._schedule_revalidation()
+
+    threads = [threading.Thread(target=stale_hit) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(queued) == 1
+    common._revalidating.clear()
@@ -0,0 +1,46 @@
+# tests/test_swe_concurrency.py
+import time
+import datetime as dt
+from concurrent.futures import ThreadPoolExecutor
+import swisseph as swe
+from astrology import swe_utils as su
+from astrology.planets import compute_planets, PLANET_CODES
+
+MODES = {"lahiri": swe.SIDM_LAHIRI, "krishnamurti": swe.SIDM_KRISHNAMURTI, "fagan": swe.SIDM_FAGAN_BRADLEY}
+JOBS = [(dt.datetime(1950 + 3 * i, 1 + i % 12, 1 + i % 28, i % 24, 15), ayan)
+        for i in range(24) for ayan in MODES]
+
+def _run(job):
+    when, ayan = job
+    return {k: v["lon"] for k, v in compute_planets(when, 5.5, 0.0, 0.0, ayanamsa=ayan).items()}
+
+def test_mixed_ayanamsa_threads_match_swiss_sidereal_mode():
+    su.init(ayanamsa="lahiri")
+    # reference straight from Swiss Ephemeris sidereal mode, computed serially
+    ref = []
+    for when, ayan in JOBS:
+        swe.set_sid_mode(MODES[ayan])
+        jd = su.to_julian_day(when, 5.5)
+        ref.append({n: swe.calc_ut(jd, c, swe.FLG_SWIEPH | swe.FLG_SIDEREAL)[0][0] for n, c in PLANET_CODES.items()})
+    swe.set_sid_mode(swe.SIDM_LAHIRI)
+
+    def timed(fn):
+        # best of 3: a single few-millisecond run is at the mercy of the scheduler
+        best = None
+        for _ in range(3):
+            t0 = time.perf_counter()
+            out = fn()
+            dt_ = time.perf_counter() - t0
+            best = dt_ if best is None else min(best, dt_)
+        return out, best
+
+    serial, t_serial = timed(lambda: [_run(j) for j in JOBS * 4])
+    with ThreadPoolExecutor(max_workers=8) as ex:
+        parallel, t_parallel = timed(lambda: list(ex.map(_run, JOBS * 4)))
+
+    assert parallel == serial
+    for got, want in zip(parallel, ref * 4):
+        for name, lon in want.items():
+            assert abs((got[name] - lon + 180.0) % 360.0 - 180.0) < 1e-6
+    # no lock convoy: threads are at least as fast as serial (calc_ut itself holds the GIL)
+    assert t_parallel < t_serial * 1.5
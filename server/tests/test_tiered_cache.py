@@ -0,0 +1,93 @@
+# tests/test_tiered_cache.py
+import pickle
+import threading
+import time
+from backend.services.cache_codec import Codec, train_dictionary
+from backend.services.tiered_cache import TieredCache
+
+def test_workers_share_l2(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    a, b = TieredCache(l2_path=path, l1_size=2), TieredCache(l2_path=path)
+    a.set("chart_inputs|x", {"dob": "1984-09-24"})
+    assert b.get("chart_inputs|x") == {"dob": "1984-09-24"}
+    assert b.stats["l2_hits"] == 1 and b.get("chart_inputs|x") and b.stats["l1_hits"] == 1
+
+    # values are copies; L1 is bounded; expiry applies to both tiers
+    b.get("chart_inputs|x")["dob"] = "mutated"
+    assert b.get("chart_inputs|x")["dob"] == "1984-09-24"
+    for k in "pqr":
+        a.set(k, k)
+    assert len(a._l1) == 2 and a.get("p") == "p"
+    a.set("short", 1, timeout=1)
+    time.sleep(1.05)
+    assert a.get("short") is None and b.get("short") is None
+
+def test_concurrent_misses_compute_once(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    workers = [TieredCache(l2_path=path, poll_interval=0.005) for _ in range(2)]
+    calls, out = [], []
+
+    def compute():
+        calls.append(1)
+        time.sleep(0.2)
+        return {"acg": 42}
+
+    threads = [
+        threading.Thread(target=lambda c=c: out.append(c.get_or_compute("acg|x", compute)))
+        for c in workers for _ in range(4)
+    ]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert out == [{"acg": 42}] * 8
+
+def test_gdsf_keeps_costly_entries():
+    c = TieredCache(l1_bytes=3000)
+    c.set("acg_cities|a", b"x" * 800, cost=1.0)
+    for i in range(10):  # cheap, larger entries churn through
+        c.set(f"asc|{i}", b"y" * 900, cost=0.001)
+    assert c.get("acg_cities|a") is not None
+    lru = TieredCache(l1_bytes=3000, eviction="lru")
+    lru.set("acg_cities|a", b"x" * 800, cost=1.0)
+    for i in range(10):
+        lru.set(f"asc|{i}", b"y" * 900, cost=0.001)
+    assert lru.get("acg_cities|a") is None
+
+def test_namespace_stats_measure_miss_to_set():
+    c = TieredCache()
+    assert c.get("varsha|cid|2030") is None
+    time.sleep(0.02)
+    c.set("varsha|cid|2030", {"v": 1})
+    c.get("varsha|cid|2030")
+    c.set("node|planets|sky|t|lahiri", [1], cost=0.5)
+    ns = c.ns_stats()
+    assert ns["varsha"]["hits"] == 1 and ns["varsha"]["misses"] == 1
+    assert ns["varsha"]["avg_compute_ms"] >= 20
+    assert ns["node:planets"]["avg_compute_ms"] == 500 and ns["node:planets"]["l1_entries"] == 1
+
+DASHA = {"Vimshottari": [{"lord": "Mercury", "start": f"19{y}-09-24T12:00:00Z", "level": 1} for y in range(10, 99)]}
+
+def test_compressed_values_round_trip_across_tiers(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    a = TieredCache(l2_path=path, codec=Codec("zlib", min_bytes=512))
+    legacy = TieredCache(l2_path=path)  # rows written without compression still load
+    legacy.set("asc|old", {"asc": 1})
+    a.set("dasha|cid", DASHA)
+    a.set("asc|cid", {"asc": 2})  # under min_bytes: stored raw
+    assert TieredCache(l2_path=path, codec=Codec("zlib")).get("dasha|cid") == DASHA
+    assert a.get("asc|old") == {"asc": 1} and a.get("dasha|cid") == DASHA
+    ns = a.ns_stats()
+    assert ns["dasha"]["compressed"] == 1 and ns["dasha"]["compression_ratio"] > 3
+    assert ns["dasha"]["l1_bytes"] * 3 < ns["dasha"]["raw_bytes_set"]  # L1 is charged the compressed size
+    assert ns["dasha"]["avg_decode_us"] > 0 and ns["asc"]["compressed"] == 0
+    assert legacy.get("dasha|cid") is None  # no codec configured: a miss, not an error
+
+def test_dictionary_mismatch_is_a_miss(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    d = train_dictionary([pickle.dumps(DASHA)])
+    a = TieredCache(l2_path=path, codec=Codec("zlib", dictionary=d))
+    a.set("dasha|cid", DASHA)
+    assert TieredCache(l2_path=path, codec=Codec("zlib", dictionary=d)).get("dasha|cid") == DASHA
+    assert TieredCache(l2_path=path, codec=Codec("zlib", dictionary=d[::-1])).get("dasha|cid") is None